@@ -0,0 +1,476 @@
+# autotune.py
+#
+# Opt-in, headless auto-tuner: watches running processes, populated cgroups, load and CPU
+# pressure, matches them against user rules and applies the matching SCHEDULER_OPTIONS mode.
+# GUI-free.
+#
+#   python autotune.py --rules ~/.config/scxctl_configurator/autotune.json
+#
+# Rules file (first matching rule wins; a rule without "when" is the fallback; a
+# max_switches_per_hour of 0 pauses switching):
+#
+#   {
+#     "min_dwell_s": 60, "max_switches_per_hour": 6,
+#     "rules": [
+#       {"name": "audio", "when": {"process_any": ["bitwig-studio", "ardour"]},
+#        "scheduler": "flash", "mode": "Low Latency"},
+#       {"name": "gaming", "when": {"process_any": ["steam", "gamescope"]}, "scheduler": "flash", "mode": "Gaming"},
+#       {"name": "containers", "when": {"cgroup_any": ["system.slice/docker-*.scope"]},
+#        "scheduler": "flash", "mode": "Server"},
+#       {"name": "busy", "when": {"load_above": 8, "for_s": 300, "clear_below": 6}, "scheduler": "flash", "mode": "Server"},
+#       {"name": "default", "scheduler": "bpfland"}
+#     ]
+#   }
+#
+# cgroup_any patterns are paths below the cgroup2 mount and may use shell wildcards; a cgroup
+# matches while it holds at least one process.
+
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+import time
+from collections import deque
+
+from flag_schema import validate_args
+from scx_core import apply_scheduler, mode_flags
+from status_monitor import ENABLE_SEQ_PATH, read_enable_seq, wait_for_enable_seq
+from telemetry import PROC_PRESSURE_CPU, parse_pressure
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_MIN_DWELL = 60.0
+DEFAULT_MAX_SWITCHES_PER_HOUR = 6
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Without the process connector, every name is re-read once per this many scans
+RESYNC_SCANS = 30
+
+# Netlink process connector (linux/connector.h, linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_COMM = 0x00000200
+PROC_EVENT_EXIT = 0x80000000
+_NLMSG_HEADER = struct.Struct("=IHHII")
+_CN_MSG_HEADER = struct.Struct("=IIIIHH")
+# what, cpu, timestamp_ns, then the event-specific union
+_PROC_EVENT_HEADER = struct.Struct("=IIQ")
+_NLMSG_DONE = 3
+
+
+class Rule:
+    """One rule: a condition over the current observation and the mode to apply while it holds."""
+
+    __slots__ = ("name", "scheduler", "mode", "args", "process_any", "cgroup_any", "load_above", "clear_below",
+                 "pressure_above", "for_s", "active_since", "engaged")
+
+    def __init__(self, data):
+        when = data.get("when", {})
+        self.name = data.get("name") or data["scheduler"]
+        self.scheduler = data["scheduler"]
+        self.mode = data.get("mode")
+        self.args = mode_flags(self.scheduler, self.mode).split() if self.mode else data.get("args", "").split()
+        self.process_any = frozenset(when.get("process_any", ()))
+        self.cgroup_any = frozenset(when.get("cgroup_any", ()))
+        self.load_above = when.get("load_above")
+        # Hysteresis: once engaged, the rule holds until load drops below clear_below
+        self.clear_below = when.get("clear_below", self.load_above * 0.8 if self.load_above else None)
+        self.pressure_above = when.get("pressure_above")
+        self.for_s = when.get("for_s", 0)
+        self.active_since = None
+        self.engaged = False
+
+        if self.mode and not self.args:
+            raise ValueError(f"rule '{self.name}': unknown mode '{self.mode}' for {self.scheduler}")
+        errors = validate_args(self.scheduler, self.args)
+        if errors:
+            raise ValueError(f"rule '{self.name}': {'; '.join(errors)}")
+
+    @property
+    def watched_names(self):
+        return self.process_any
+
+    @property
+    def watched_cgroups(self):
+        return self.cgroup_any
+
+    def condition(self, observation):
+        """Raw condition, before the for_s sustain window."""
+        if self.process_any and not (self.process_any & observation["processes"]):
+            return False
+        if self.cgroup_any and not (self.cgroup_any & observation.get("cgroups", frozenset())):
+            return False
+        if self.load_above is not None:
+            threshold = self.clear_below if self.engaged else self.load_above
+            if observation["load"] <= threshold:
+                return False
+        if self.pressure_above is not None and observation["pressure"] <= self.pressure_above:
+            return False
+        return True
+
+    def matches(self, observation, now):
+        if not self.condition(observation):
+            self.active_since = None
+            self.engaged = False
+            return False
+        if self.active_since is None:
+            self.active_since = now
+        if now - self.active_since >= self.for_s:
+            self.engaged = True
+        return self.engaged
+
+
+class ProcConnector:
+    """
+    fork/exec/comm/exit notifications from the kernel's netlink process connector, so the
+    watcher only has to read /proc for processes that exec'd. Needs CAP_NET_ADMIN.
+    """
+
+    def __init__(self, sock):
+        self.sock = sock
+
+    @classmethod
+    def open(cls):
+        """Subscribes to process events; None when the connector is unavailable or not permitted."""
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        except (OSError, AttributeError):
+            return None
+        try:
+            sock.bind((0, CN_IDX_PROC))
+            payload = _CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, 4, 0) + struct.pack("=I", PROC_CN_MCAST_LISTEN)
+            sock.send(_NLMSG_HEADER.pack(_NLMSG_HEADER.size + len(payload), _NLMSG_DONE, 0, 0, os.getpid()) + payload)
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def read_events(self):
+        """
+        Drains the pending events as (kind, pid, detail) for whole processes (threads are skipped):
+        ("fork", child, parent), ("exec", pid, None), ("comm", pid, name), ("exit", pid, None).
+        Returns None when the socket overflowed and events were lost.
+        """
+        events = []
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                return events
+            except OSError:
+                # ENOBUFS: the kernel dropped events we did not read in time
+                return None
+            offset = 0
+            while offset + _NLMSG_HEADER.size <= len(data):
+                length = _NLMSG_HEADER.unpack_from(data, offset)[0]
+                if length < _NLMSG_HEADER.size:
+                    break
+                event = self._decode(data, offset + _NLMSG_HEADER.size + _CN_MSG_HEADER.size)
+                if event is not None:
+                    events.append(event)
+                offset += (length + 3) & ~3
+
+    @staticmethod
+    def _decode(data, offset):
+        if offset + _PROC_EVENT_HEADER.size + 8 > len(data):
+            return None
+        what = _PROC_EVENT_HEADER.unpack_from(data, offset)[0]
+        offset += _PROC_EVENT_HEADER.size
+        if what == PROC_EVENT_FORK:
+            _parent_pid, parent_tgid, child_pid, child_tgid = struct.unpack_from("=iiii", data, offset)
+            return ("fork", child_tgid, parent_tgid) if child_pid == child_tgid else None
+        pid, tgid = struct.unpack_from("=ii", data, offset)
+        if pid != tgid:
+            return None
+        if what == PROC_EVENT_EXEC:
+            return "exec", pid, None
+        if what == PROC_EVENT_COMM:
+            name = data[offset + 8:offset + 24].split(b"\0", 1)[0]
+            return "comm", pid, name.decode("utf-8", "replace")
+        if what == PROC_EVENT_EXIT:
+            return "exit", pid, None
+        return None
+
+    def close(self):
+        self.sock.close()
+
+
+class ProcessWatcher:
+    """
+    Tracks which watched process names are running without re-reading all of /proc every scan.
+    Each known PID is remembered with its start time and name. With a ProcConnector the kernel
+    reports fork/exec/exit and only exec'd processes are read. Without one, /proc is listed each
+    scan and only new PIDs are read, plus those already carrying a watched name (a changed start
+    time means the PID was reused); an unwatched process exec'ing into a watched name is caught
+    by a full re-read every resync_scans scans.
+    """
+
+    def __init__(self, names, proc_root="/proc", connector=None, resync_scans=RESYNC_SCANS):
+        self.names = frozenset(names)
+        self.proc_root = proc_root
+        self.connector = connector
+        self.resync_scans = max(resync_scans, 1)
+        # pid -> (starttime, comm); starttime is None for entries learned from connector events
+        self.processes = {}
+        self.scans = 0
+
+    def scan(self):
+        """Returns the set of watched names currently running."""
+        if not self.names:
+            return frozenset()
+        events = self.connector.read_events() if self.connector is not None and self.scans else None
+        if events is not None:
+            self._apply_events(events)
+        else:
+            # First scan, connector overflow, or no connector
+            if self.connector is not None:
+                # What is already queued predates the listing below
+                self.connector.read_events()
+            self._rescan(full=self.connector is not None or self.scans % self.resync_scans == 0)
+        self.scans += 1
+        return frozenset(comm for _starttime, comm in self.processes.values() if comm in self.names)
+
+    def _apply_events(self, events):
+        for kind, pid, detail in events:
+            if kind == "exit":
+                self.processes.pop(pid, None)
+            elif kind == "fork":
+                parent = self.processes.get(detail)
+                if parent is not None:
+                    self.processes[pid] = (None, parent[1])
+            elif kind == "comm":
+                self.processes[pid] = (None, detail)
+            else:
+                entry = self.read_stat(pid)
+                if entry is None:
+                    self.processes.pop(pid, None)
+                else:
+                    self.processes[pid] = entry
+
+    def _rescan(self, full):
+        try:
+            pids = [int(name) for name in os.listdir(self.proc_root) if name.isdigit()]
+        except OSError:
+            self.processes = {}
+            return
+        known = self.processes
+        current = {}
+        for pid in pids:
+            entry = known.get(pid)
+            if full or entry is None or entry[1] in self.names:
+                entry = self.read_stat(pid)
+                if entry is None:
+                    continue
+            current[pid] = entry
+        self.processes = current
+
+    def read_stat(self, pid):
+        """(starttime, comm) from /proc/<pid>/stat, or None once the process is gone."""
+        try:
+            with open(os.path.join(self.proc_root, str(pid), "stat"), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # comm may itself contain spaces and parentheses; it ends at the last ')'
+        end = data.rfind(b")")
+        try:
+            starttime = int(data[end + 2:].split()[19])
+        except (IndexError, ValueError):
+            return None
+        return starttime, data[data.find(b"(") + 1:end].decode("utf-8", "replace")
+
+    def close(self):
+        if self.connector is not None:
+            self.connector.close()
+
+
+class CgroupWatcher:
+    """Tracks which watched cgroup patterns currently match a populated cgroup."""
+
+    def __init__(self, patterns, root=CGROUP_ROOT):
+        self.patterns = frozenset(patterns)
+        self.root = root
+
+    def scan(self):
+        return frozenset(pattern for pattern in self.patterns if self._populated(pattern))
+
+    def _populated(self, pattern):
+        path = os.path.join(self.root, pattern)
+        if any(char in pattern for char in "*?["):
+            import glob
+
+            paths = glob.glob(path)
+        else:
+            paths = [path]
+        for cgroup in paths:
+            try:
+                with open(os.path.join(cgroup, "cgroup.events"), "rb") as f:
+                    if b"populated 1" in f.read():
+                        return True
+            except OSError:
+                continue
+        return False
+
+
+def read_load(path="/proc/loadavg"):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def read_pressure(path=PROC_PRESSURE_CPU):
+    """Returns the 'some avg10' CPU pressure percentage."""
+    try:
+        with open(path, "rb") as f:
+            return float(parse_pressure(f.read(), "avg10"))
+    except (OSError, ValueError):
+        return 0.0
+
+
+class AutoTuner:
+    """
+    Picks the first matching rule each tick and applies it, subject to:
+      - a minimum dwell time in the current mode before switching again,
+      - a cap on switches per hour (rate limit),
+      - per-rule hysteresis and sustain windows (see Rule).
+    The rule in effect is applied again if its scheduler was replaced from outside (noticed through
+    the kernel's enable_seq, or the backend's status where sysfs lacks it).
+    """
+
+    def __init__(self, rules, backend, min_dwell_s=DEFAULT_MIN_DWELL,
+                 max_switches_per_hour=DEFAULT_MAX_SWITCHES_PER_HOUR, dry_run=False,
+                 clock=time.monotonic, log=None, enable_seq_path=ENABLE_SEQ_PATH):
+        self.rules = rules
+        self.backend = backend
+        self.min_dwell_s = min_dwell_s
+        self.max_switches_per_hour = max_switches_per_hour
+        self.dry_run = dry_run
+        self.clock = clock
+        self.log = log or (lambda message: None)
+        self.enable_seq_path = enable_seq_path
+        self.current = None
+        # enable_seq of the scheduler the current rule loaded, once it attached
+        self.applied_seq = None
+        self.last_switch = None
+        self.switch_times = deque(maxlen=max(max_switches_per_hour, 1))
+
+    def choose(self, observation, now):
+        chosen = None
+        for rule in self.rules:
+            # Every rule is evaluated so sustain windows keep running even when shadowed
+            if rule.matches(observation, now) and chosen is None:
+                chosen = rule
+        return chosen
+
+    def may_switch(self, now):
+        """A max_switches_per_hour of 0 (or less) allows no switches at all."""
+        if self.max_switches_per_hour <= 0:
+            return False
+        if self.last_switch is not None and now - self.last_switch < self.min_dwell_s:
+            return False
+        if len(self.switch_times) >= self.max_switches_per_hour and now - self.switch_times[0] < 3600:
+            return False
+        return True
+
+    def replaced_externally(self):
+        """True when the scheduler the current rule applied is no longer the one loaded."""
+        if self.dry_run or self.current is None:
+            return False
+        enable_seq = read_enable_seq(self.enable_seq_path)
+        if enable_seq is not None and self.applied_seq is not None:
+            return enable_seq != self.applied_seq
+        status = self.backend.get_status()
+        return status.ok and status.scheduler != self.current.scheduler
+
+    def tick(self, observation):
+        """Evaluates one observation. Returns the rule applied this tick, or None."""
+        now = self.clock()
+        rule = self.choose(observation, now)
+        if rule is None:
+            return None
+        if rule is self.current:
+            if not self.replaced_externally():
+                return None
+            if not self.may_switch(now):
+                return None
+            self.log(f"{rule.scheduler} was replaced outside autotune")
+        elif not self.may_switch(now):
+            return None
+
+        self.log(f"rule '{rule.name}' matched: applying {rule.scheduler} {' '.join(rule.args)}".rstrip())
+        if not self.dry_run:
+            enable_seq = read_enable_seq(self.enable_seq_path)
+            result = apply_scheduler(self.backend, rule.scheduler, rule.args)
+            if not result.ok:
+                self.log(f"failed to {result.action_verb} to {rule.scheduler}: {result.error_text()}")
+                # Failed attempts count against the rate limit too, so a broken rule cannot thrash
+                self.last_switch = now
+                self.switch_times.append(now)
+                return None
+            self.applied_seq = wait_for_enable_seq(enable_seq, self.enable_seq_path)
+        self.current = rule
+        self.last_switch = now
+        self.switch_times.append(now)
+        return rule
+
+
+def load_rules(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    rules = [Rule(entry) for entry in data.get("rules", [])]
+    if not rules:
+        raise ValueError("no rules defined")
+    return data, rules
+
+
+def main(argv=None):
+    from instrumentation import instrument
+    from scx_backend import create_backend
+
+    parser = argparse.ArgumentParser(description="Automatically switch scheduler modes based on workload rules.")
+    parser.add_argument("--rules", required=True, help="JSON rules file")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="seconds between evaluations")
+    parser.add_argument("--dry-run", action="store_true", help="log decisions without applying them")
+    options = parser.parse_args(argv)
+
+    try:
+        config, rules = load_rules(options.rules)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: could not load rules: {e}", file=sys.stderr)
+        return 2
+
+    names = set().union(*(rule.watched_names for rule in rules))
+    watcher = ProcessWatcher(names, connector=ProcConnector.open() if names else None)
+    cgroups = CgroupWatcher(set().union(*(rule.watched_cgroups for rule in rules)))
+    backend = instrument(create_backend())
+    tuner = AutoTuner(
+        rules,
+        backend,
+        min_dwell_s=config.get("min_dwell_s", DEFAULT_MIN_DWELL),
+        max_switches_per_hour=config.get("max_switches_per_hour", DEFAULT_MAX_SWITCHES_PER_HOUR),
+        dry_run=options.dry_run,
+        log=lambda message: print(time.strftime("%H:%M:%S"), message, flush=True),
+    )
+    try:
+        while True:
+            tuner.tick({"processes": watcher.scan(), "cgroups": cgroups.scan(), "load": read_load(),
+                        "pressure": read_pressure()})
+            time.sleep(options.interval)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
+        backend.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# benchmark_view.py
+
+import os
+import sys
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout
+)
+
+from sched_benchmark import load_results
+from scx_process import run_command
+
+# Running a full mode sweep takes a while; give it far longer than a single scxctl call.
+BENCHMARK_TIMEOUT = 3600
+
+COLUMNS = [
+    ("Scheduler", lambda e: e["scheduler"]),
+    ("Mode", lambda e: e["mode"] or "Default"),
+    ("Wakeup p50 (us)", lambda e: e["wakeup"]["p50_us"]),
+    ("Wakeup p99 (us)", lambda e: e["wakeup"]["p99_us"]),
+    ("Wakeup p99.9 (us)", lambda e: e["wakeup"]["p999_us"]),
+    ("Pipe p99 (us)", lambda e: e["pipe"]["p99_us"]),
+    ("Pipe round trips/s", lambda e: e["pipe"]["ops_per_s"]),
+    ("CPU ops/s", lambda e: e["cpu"]["ops_per_s"]),
+]
+
+
+class BenchmarkResultsDialog(QDialog):
+    """
+    Side-by-side comparison of the last sched_benchmark.py results.
+    The main window keeps one instance; results are re-read each time it is shown.
+    """
+
+    def __init__(self, runner, scheduler=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Scheduler Benchmark Results")
+        self.resize(900, 400)
+        self.runner = runner
+        self.scheduler = scheduler
+        self.running = False
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([name for name, _ in COLUMNS])
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        self.run_button = QPushButton()
+        self.run_button.clicked.connect(self.run_benchmark)
+        # A frozen build has no Python interpreter to run the harness with
+        self.run_button.setEnabled(not getattr(sys, "frozen", False))
+        buttons.addWidget(self.run_button)
+        reload_button = QPushButton("Reload")
+        reload_button.clicked.connect(self.load)
+        buttons.addWidget(reload_button)
+        layout.addLayout(buttons)
+        self.set_scheduler(scheduler)
+
+    def set_scheduler(self, scheduler):
+        """Chooses what the Benchmark button runs: one scheduler's modes, or all of them when None."""
+        self.scheduler = scheduler
+        self.run_button.setText(f"Benchmark {scheduler} Modes" if scheduler else "Benchmark All Modes")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.running:
+            self.load()
+
+    def load(self):
+        data = load_results()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(0)
+        if data is None:
+            self.summary_label.setText("No benchmark results yet.")
+            return
+
+        results = data.get("results", [])
+        self.summary_label.setText(f"{len(results)} runs on {data.get('host')}, {data.get('duration_s')} s per workload.")
+        self.table.setRowCount(len(results))
+        for row, entry in enumerate(results):
+            for column, (_name, getter) in enumerate(COLUMNS):
+                item = QTableWidgetItem()
+                try:
+                    value = getter(entry)
+                except (KeyError, TypeError):
+                    value = "failed" if column >= 2 else ""
+                if isinstance(value, float):
+                    item.setData(Qt.DisplayRole, round(value, 1))
+                else:
+                    item.setData(Qt.DisplayRole, value)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+
+    def run_benchmark(self):
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sched_benchmark.py")
+        command = [sys.executable, script]
+        if self.scheduler:
+            command += ["--sched", self.scheduler]
+        self.running = True
+        self.run_button.setEnabled(False)
+        self.summary_label.setText("Benchmark running; schedulers will be switched while it runs...")
+        self.runner.submit(
+            "sched_benchmark",
+            lambda cancel_event: run_command(command, BENCHMARK_TIMEOUT, cancel_event),
+            self.on_benchmark_finished,
+        )
+
+    def on_benchmark_finished(self, result):
+        self.running = False
+        self.run_button.setEnabled(True)
+        self.load()
+        if not result.ok:
+            self.summary_label.setText(f"Benchmark failed: {result.error_text()}")
@@ -0,0 +1,151 @@
+# bench_coalescing.py
+#
+# Drives bursts of Confirm/Stop clicks and selection churn through the GUI and counts what reaches
+# the backend and how many option panel rebuilds run. Uses a counting in-process backend.
+# Run from the repository root:  QT_QPA_PLATFORM=offscreen python benchmarks/bench_coalescing.py
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+
+from scheduler_data import SCHEDULER_OPTIONS
+from scx_process import CommandResult
+import scxctl_configurator
+
+BURST = 20
+# Simulated BPF load time, long enough for a burst to pile up behind the first call
+CALL_SECONDS = 0.2
+
+
+class CountingBackend:
+    """Stands in for scx_loader; counts start/switch/stop calls."""
+
+    name = "counting"
+
+    def __init__(self):
+        self.calls = []
+        self.running = None
+        self.lock = threading.Lock()
+
+    def _result(self, command):
+        result = CommandResult(command, returncode=0)
+        result.scheduler = self.running
+        return result
+
+    def get_status(self, timeout=None, cancel_event=None):
+        return self._result(["get"])
+
+    def list_schedulers(self, timeout=None, cancel_event=None):
+        result = self._result(["list"])
+        result.schedulers = list(SCHEDULER_OPTIONS)
+        return result
+
+    def _apply(self, verb, scheduler, args):
+        with self.lock:
+            self.calls.append((verb, scheduler, tuple(args)))
+        time.sleep(CALL_SECONDS)
+        self.running = scheduler
+        return self._result([verb, scheduler or ""])
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("start", scheduler, args)
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("switch", scheduler, args)
+
+    def stop(self, timeout=None, cancel_event=None):
+        result = self._apply("stop", None, ())
+        self.running = None
+        return result
+
+    def close(self):
+        pass
+
+
+def wait_idle(app, window):
+    while window.runner.is_busy():
+        app.processEvents()
+        time.sleep(0.005)
+    app.processEvents()
+
+
+def main():
+    backend = CountingBackend()
+    scxctl_configurator.create_backend = lambda: backend
+    os.environ["SCXCTL_METRICS"] = "0"
+
+    app = QApplication(sys.argv)
+    window = scxctl_configurator.SchedulerSelector()
+    window.verify_checkbox.setChecked(False)
+    window.show()
+    wait_idle(app, window)
+    window.status_monitor.stop()
+
+    rebuilds = []
+    original_update = window.update_dynamic_options
+
+    def counting_update():
+        rebuilds.append(window.scheduler_combo.currentText())
+        original_update()
+
+    window.options_update.func = counting_update
+    window.options_update.timer.timeout.disconnect()
+    window.options_update.timer.timeout.connect(counting_update)
+
+    checks = []
+
+    # 1. Identical Confirm clicks: the first runs, the rest collapse into it
+    window.scheduler_combo.setCurrentText("bpfland")
+    for _ in range(BURST):
+        window.confirm_selection()
+    wait_idle(app, window)
+    checks.append(("identical confirms", BURST, len(backend.calls), len(backend.calls) == 1))
+
+    # 2. Confirm clicks while changing the args: only the first (already running) and the last run
+    backend.calls.clear()
+    for index in range(BURST):
+        window.args_textbox.setText(f"-s {1000 + index}")
+        window.confirm_selection()
+    wait_idle(app, window)
+    last_ok = backend.calls[-1][2] == ("-s", str(1000 + BURST - 1))
+    checks.append(("superseded switches", BURST, len(backend.calls), len(backend.calls) <= 2 and last_ok))
+
+    # 3. Stop hammered after a confirm: the pending switch is dropped, one stop runs
+    backend.calls.clear()
+    window.args_textbox.setText("-p")
+    window.confirm_selection()
+    for _ in range(BURST):
+        window.disable_scheduler()
+    wait_idle(app, window)
+    checks.append(("confirm then stops", BURST + 1, len(backend.calls),
+                   len(backend.calls) <= 2 and backend.calls[-1][0] == "stop"))
+
+    # 4. Scrolling through the scheduler list: one rebuild once the selection settles
+    rebuilds.clear()
+    for _ in range(BURST):
+        for name in SCHEDULER_OPTIONS:
+            window.scheduler_combo.setCurrentText(name)
+            app.processEvents()
+    time.sleep(scxctl_configurator.SELECTION_DEBOUNCE_MS / 1000 * 2)
+    app.processEvents()
+    checks.append(("selection churn", BURST * len(SCHEDULER_OPTIONS), len(rebuilds), len(rebuilds) == 1))
+
+    print(f"{'burst':<22}{'requests':>10}{'backend calls / rebuilds':>28}")
+    ok = True
+    for name, requests, calls, passed in checks:
+        ok &= passed
+        print(f"{name:<22}{requests:>10}{calls:>28}  {'ok' if passed else 'FAIL'}")
+    print(f"runner: {window.runner.coalesced_count} coalesced, {window.runner.dropped_count} dropped")
+    print("PASS" if ok else "FAIL")
+
+    window.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# bench_fleet.py
+#
+# Rolls a profile out to a simulated fleet through fleet.FakeTransport (no network) and compares
+# the wall time with what a serial loop would take. Also checks the concurrency bound, the retry
+# of flaky hosts and that every host ends up on the requested scheduler.
+# Run from the repository root:  python benchmarks/bench_fleet.py --hosts 500 --latency 0.05
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet import FakeTransport, fleet_apply
+
+
+class CountingTransport(FakeTransport):
+    """Tracks the peak number of hosts with a call in flight."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.in_flight = set()
+        self.peak = 0
+
+    async def run(self, host, command, timeout=30.0):
+        self.in_flight.add(host)
+        self.peak = max(self.peak, len(self.in_flight))
+        try:
+            return await super().run(host, command, timeout)
+        finally:
+            self.in_flight.discard(host)
+
+
+async def rollout(hosts, transport, concurrency, retries):
+    results = []
+    async for host_result in fleet_apply(hosts, "flash", ["-m", "performance", "-w", "-C", "0"], transport,
+                                         concurrency=concurrency, retries=retries, backoff=0.01):
+        results.append(host_result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated fleet rollout benchmark.")
+    parser.add_argument("--hosts", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per remote call")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--flaky", type=int, default=10, help="hosts that fail their first call")
+    options = parser.parse_args()
+
+    hosts = [f"node{index:04d}" for index in range(options.hosts)]
+    # Half the fleet already runs something, so both start and switch paths are exercised
+    running = {host: "bpfland" for host in hosts[::2]}
+    flaky = {host: 1 for host in hosts[1:options.flaky * 7:7]}
+    # One host that never recovers
+    flaky[hosts[-1]] = 1000
+    transport = CountingTransport(options.latency, flaky, running)
+
+    start = time.perf_counter()
+    results = asyncio.run(rollout(hosts, transport, options.concurrency, retries=2))
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if not r.ok]
+    retried = [r for r in results if r.ok and r.attempts > 1]
+    on_target = sum(1 for host in hosts if transport.running.get(host) == "flash")
+    serial = len(transport.calls) * options.latency
+
+    print(f"hosts:                  {len(results)}")
+    print(f"remote calls:           {len(transport.calls)}")
+    print(f"peak hosts in flight:   {transport.peak} (limit {options.concurrency})")
+    print(f"retried and recovered:  {len(retried)}")
+    print(f"failed:                 {len(failed)}")
+    print(f"on requested scheduler: {on_target}")
+    print(f"wall time (s):          {elapsed:.2f}")
+    print(f"serial estimate (s):    {serial:.2f}")
+
+    ok = (len(results) == len(hosts) and transport.peak <= options.concurrency
+          and len(failed) == 1 and on_target == len(hosts) - 1)
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
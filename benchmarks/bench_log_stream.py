@@ -0,0 +1,160 @@
+# bench_log_stream.py
+#
+# Soaks the scheduler log pane: days of once-a-second stats output pushed through LogBuffer with a
+# filter active (memory must stay flat), filter changes on a full buffer, and a GUI run where a
+# child process floods the dialog while the event loop is watched for stalls.
+# Run from the repository root:  QT_QPA_PLATFORM=offscreen python benchmarks/bench_log_stream.py
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler_log import DEFAULT_CAPACITY, LogBuffer, LogFollower
+
+# Simulated uptime of a scheduler printing a few stats lines every second
+SOAK_DAYS = 3
+LINES_PER_SECOND = 4
+
+# Lines the flooding child prints, as fast as it can
+FLOOD_LINES = 200000
+
+MAX_STALL_MS = 100
+MAX_GROWTH_BYTES = 64 * 1024
+
+
+def stats_line(second, index):
+    return (f"2026-10-17T12:00:00+0000 host scx_bpfland[123]: [{second}.{index}] tasks=  {second % 997:4d} "
+            f"lat_us={second % 313:5d} dispatch={second * 7 % 100003:8d} nr_kthread={index}")
+
+
+def feed(buffer, seconds, first_second=0):
+    batch = []
+    for second in range(first_second, first_second + seconds):
+        batch.extend(stats_line(second, index) for index in range(LINES_PER_SECOND))
+        if len(batch) >= 256:
+            buffer.extend(batch)
+            batch.clear()
+    buffer.extend(batch)
+
+
+def soak(failures):
+    buffer = LogBuffer()
+    buffer.set_filter("dispatch")
+    seconds = SOAK_DAYS * 86400
+    start = time.perf_counter()
+    feed(buffer, seconds)
+    elapsed = time.perf_counter() - start
+
+    # Memory is traced separately (tracing slows appends down ~30x). One turnover first, so every
+    # stored line is a traced allocation, then ten more.
+    turnover = buffer.capacity // LINES_PER_SECOND
+    tracemalloc.start()
+    feed(buffer, turnover, seconds)
+    baseline = tracemalloc.get_traced_memory()[0]
+    feed(buffer, 10 * turnover, seconds + turnover)
+    growth = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    total = seconds * LINES_PER_SECOND
+    print(f"soak: {total:,} lines ({SOAK_DAYS} days at {LINES_PER_SECOND}/s) in {elapsed:.1f} s "
+          f"({total / elapsed:,.0f} lines/s incl. formatting), memory growth over 10 turnovers {growth / 1024:.1f} KiB")
+    check("buffer stays at capacity", len(buffer) == DEFAULT_CAPACITY and buffer.rows() == DEFAULT_CAPACITY, failures)
+    check("memory flat once full", growth < MAX_GROWTH_BYTES, failures)
+    last_second = seconds + 11 * turnover - 1
+    check("newest line kept", buffer.row(buffer.rows() - 1) == stats_line(last_second, LINES_PER_SECOND - 1),
+          failures)
+    return buffer
+
+
+def filters(buffer, failures):
+    timings = []
+    for text in ("lat_us", "lat_us=  12", "lat_us=  123", "", "nr_kthread=3"):
+        start = time.perf_counter()
+        buffer.set_filter(text)
+        timings.append(f"{text or '(none)'!r} {(time.perf_counter() - start) * 1000:.1f} ms -> {buffer.rows()}")
+    print("filter: " + ", ".join(timings))
+    expected = sum(1 for i in range(buffer.rows()) if "nr_kthread=3" in buffer.row(i))
+    check("filter rows match", buffer.rows() == expected == DEFAULT_CAPACITY // LINES_PER_SECOND, failures)
+    buffer.set_filter("lat_us=  12")
+    narrowed = buffer.rows()
+    buffer.set_filter("lat_us=  1")
+    buffer.set_filter("lat_us=  12")
+    check("narrowing equals a full rescan", buffer.rows() == narrowed, failures)
+
+
+def gui(failures):
+    from PySide6.QtCore import QElapsedTimer, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from log_view import SchedulerLogDialog
+
+    app = QApplication(sys.argv)
+    buffer = LogBuffer()
+    dialog = SchedulerLogDialog(buffer, lambda: None)
+    dialog.follower.stop()
+    buffer.clear()
+    dialog.show()
+    app.processEvents()
+
+    clock = QElapsedTimer()
+    clock.start()
+    ticks = {"last": 0, "worst": 0}
+
+    def tick():
+        now = clock.elapsed()
+        ticks["worst"] = max(ticks["worst"], now - ticks["last"] - 5)
+        ticks["last"] = now
+
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(5)
+
+    flood = f"import sys\nfor i in range({FLOOD_LINES}): sys.stdout.write(f'flood line {{i}} dispatch={{i % 7}}\\n')"
+    dialog.follower = LogFollower([sys.executable, "-c", flood], buffer)
+    start = time.perf_counter()
+    dialog.follower.start()
+    dialog.filter_textbox.setText("dispatch=3")
+    while dialog.follower.running:
+        app.processEvents()
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    deadline = time.perf_counter() + 1
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.005)
+    timer.stop()
+
+    last = dialog.model.data(dialog.model.index(dialog.model.rowCount() - 1))
+    print(f"gui: {FLOOD_LINES:,} lines followed in {elapsed:.2f} s, {dialog.model.rowCount()} rows shown, "
+          f"worst stall {ticks['worst']} ms")
+    check("view shows the filtered buffer", dialog.model.rowCount() == buffer.rows() > 0, failures)
+    newest = max(i for i in range(FLOOD_LINES - 7, FLOOD_LINES) if i % 7 == 3)
+    check("last row is the newest match", last == f"flood line {newest} dispatch=3", failures)
+    buffer.set_filter("")
+    dialog.sync()
+    check("follower exit reported", buffer.row(buffer.rows() - 1).endswith("exited with code 0.]"), failures)
+    check("GUI never stalled", ticks["worst"] <= MAX_STALL_MS, failures)
+    dialog.shutdown()
+    dialog.close()
+
+
+def check(name, condition, failures):
+    print(f"  {'ok  ' if condition else 'FAIL'} {name}")
+    if not condition:
+        failures.append(name)
+
+
+def main():
+    failures = []
+    buffer = soak(failures)
+    filters(buffer, failures)
+    gui(failures)
+    print("PASS" if not failures else "FAIL")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# bench_option_panels.py
+#
+# Counts widget allocations and time per scheduler switch in the options area.
+# Run from the repository root:  QT_QPA_PLATFORM=offscreen python benchmarks/bench_option_panels.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCX_BACKEND", "scxctl")
+
+from PySide6.QtWidgets import QApplication
+
+from scheduler_data import SCHEDULER_OPTIONS
+from scxctl_configurator import SchedulerSelector
+
+ROUNDS = 20
+
+
+def main():
+    app = QApplication(sys.argv)
+    window = SchedulerSelector()
+    # The backend connects on the worker, and the list result queues --help introspection;
+    # let both settle so nothing rebuilds panels while measuring
+    window.runner.pool.waitForDone()
+    app.processEvents()
+    window.background.pool.waitForDone()
+    app.processEvents()
+    window.status_monitor.stop()
+    window.set_scheduler_list(list(SCHEDULER_OPTIONS))
+    window.show()
+    app.processEvents()
+
+    count = window.scheduler_combo.count()
+
+    # First pass builds each panel once
+    for index in range(count):
+        window.scheduler_combo.setCurrentIndex(index)
+        # Selection changes are debounced; flush so each switch is measured
+        window.flush_selection()
+    app.processEvents()
+
+    before = set(map(id, QApplication.allWidgets()))
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for index in range(count):
+            window.scheduler_combo.setCurrentIndex(index)
+            window.flush_selection()
+            app.processEvents()
+    elapsed = time.perf_counter() - start
+    after = set(map(id, QApplication.allWidgets()))
+
+    switches = ROUNDS * count
+    print(f"switches:               {switches}")
+    print(f"widgets allocated:      {len(after - before)}")
+    print(f"widgets per switch:     {len(after - before) / switches:.2f}")
+    print(f"time per switch (us):   {elapsed / switches * 1e6:.1f}")
+
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+# bench_replay.py
+#
+# End-to-end GUI regression run against the replaying fake scxctl (replay.py), no sched_ext needed.
+# Each scenario replays a fixture, optionally slowed down or with injected failures, drives the
+# window (load list, confirm, switch, stop) and reports action latency, the longest GUI event-loop
+# stall and whether the expected scxctl commands and feedback came out.
+#
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_replay.py
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_replay.py --slow-scale 10 --scenario slow
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PySide6.QtCore import QElapsedTimer, QTimer
+from PySide6.QtWidgets import QApplication
+
+# A GUI thread blocked for longer than this is a regression: backend calls must stay off it.
+MAX_STALL_MS = 100
+TICK_MS = 5
+
+
+def fixture(name):
+    return os.path.join(ROOT, "fixtures", f"{name}.json")
+
+
+SCENARIOS = {
+    "basic": {"fixture": "scxctl_basic", "env": {}},
+    "slow": {"fixture": "scxctl_basic", "env": {"SCXCTL_REPLAY_EXTRA_LATENCY": "0.2"}},
+    "switch-fails": {"fixture": "scxctl_basic", "env": {"SCXCTL_REPLAY_FAIL": "switch"}},
+    "loader-down": {"fixture": "scxctl_loader_down", "env": {}},
+    "unparsable-list": {"fixture": "scxctl_unparsable_list", "env": {}},
+}
+
+
+class StallMeter:
+    """Ticks every TICK_MS on the GUI thread and remembers the longest gap between ticks."""
+
+    def __init__(self):
+        self.clock = QElapsedTimer()
+        self.clock.start()
+        self.last = 0
+        self.worst = 0
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(TICK_MS)
+
+    def tick(self):
+        now = self.clock.elapsed()
+        self.worst = max(self.worst, now - self.last - TICK_MS)
+        self.last = now
+
+
+def wait_for(app, predicate, timeout=30.0):
+    """Spins the event loop until predicate() holds. Returns the elapsed milliseconds, or None."""
+    start = time.perf_counter()
+    while not predicate():
+        if time.perf_counter() - start > timeout:
+            return None
+        app.processEvents()
+        time.sleep(0.001)
+    return (time.perf_counter() - start) * 1000
+
+
+def run_scenario(app, name, scenario, workdir, slow_scale):
+    import scxctl_configurator
+
+    state_path = os.path.join(workdir, f"{name}.state")
+    env = {
+        "SCXCTL_REPLAY_FIXTURE": fixture(scenario["fixture"]),
+        "SCXCTL_REPLAY_STATE": state_path,
+        "SCXCTL_REPLAY_LATENCY_SCALE": str(slow_scale if name == "slow" else 1),
+        **scenario["env"],
+    }
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    # A fresh cache dir per scenario so the list really comes from the fake scxctl
+    os.environ["XDG_CACHE_HOME"] = os.path.join(workdir, name, "cache")
+
+    report = {"scenario": name}
+    stall = None
+    try:
+        window = scxctl_configurator.SchedulerSelector()
+        window.verify_checkbox.setChecked(False)
+        window.show()
+        # Building and first painting the window is synchronous by design; measure from there on
+        app.processEvents()
+        stall = StallMeter()
+        report["list_ms"] = wait_for(app, lambda: window.is_interactive)
+        report["list_feedback"] = window.feedback_label.text()
+        report["schedulers"] = window.current_scheduler_list()
+
+        def act(action):
+            window.feedback_label.setText("")
+            action()
+            return wait_for(app, lambda: window.feedback_label.text().startswith(("Scheduler successfully", "ERROR")))
+
+        if window.select_button.isEnabled():
+            window.scheduler_combo.setCurrentText("bpfland")
+            report["start_ms"] = act(window.confirm_selection)
+            report["start_feedback"] = window.feedback_label.text()
+            window.scheduler_combo.setCurrentText("flash")
+            window.flush_selection()
+            window.args_textbox.setText("-m all")
+            report["switch_ms"] = act(window.confirm_selection)
+            report["switch_feedback"] = window.feedback_label.text()
+        report["stop_ms"] = act(window.disable_scheduler)
+        report["stop_feedback"] = window.feedback_label.text()
+        # Closing joins the status monitor thread; that wait is not interactive
+        stall.timer.stop()
+        window.close()
+        # Destroy each window before the next scenario builds another
+        window.deleteLater()
+        app.processEvents()
+    finally:
+        if stall is not None:
+            stall.timer.stop()
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    report["worst_stall_ms"] = stall.worst if stall is not None else 0
+    try:
+        with open(state_path, encoding="utf-8") as f:
+            report["commands"] = [call for call in json.load(f)["calls"] if call != "get"]
+    except (OSError, ValueError, KeyError):
+        report["commands"] = []
+    return report
+
+
+def expectations(report):
+    """(description, passed) checks per scenario."""
+    name = report["scenario"]
+    checks = [("GUI never stalled", report["worst_stall_ms"] <= MAX_STALL_MS)]
+    if name in ("basic", "slow"):
+        checks += [
+            ("list parsed", len(report["schedulers"]) == 8),
+            ("idle -> start", "start --sched bpfland" in report["commands"]),
+            ("running -> switch", "switch --sched flash --args=-m,all" in report["commands"]),
+            ("start succeeded", report["start_feedback"].startswith("Scheduler successfully started")),
+            ("stop succeeded", report["stop_feedback"].startswith("Scheduler successfully")),
+        ]
+    elif name == "switch-fails":
+        checks += [("switch error shown", report["switch_feedback"].startswith("ERROR: Failed to switch")),
+                   ("injected message", "injected failure" in report["switch_feedback"])]
+    elif name == "loader-down":
+        checks += [("list error shown", report["list_feedback"].startswith("ERROR: scxctl list failed")),
+                   ("stop error shown", report["stop_feedback"].startswith("ERROR: Failed to stop"))]
+    elif name == "unparsable-list":
+        checks += [("parse error shown", report["list_feedback"].startswith("Error: Could not parse"))]
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay fixtures through the GUI and time its actions.")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="run only these (repeatable)")
+    parser.add_argument("--slow-scale", type=float, default=5.0, help="latency multiplier of the 'slow' scenario")
+    parser.add_argument("--json", action="store_true", help="print the raw reports")
+    options = parser.parse_args()
+
+    os.environ["SCX_BACKEND"] = "scxctl"
+    os.environ.setdefault("SCXCTL_METRICS", "0")
+    app = QApplication(sys.argv)
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        # Put the fake first on PATH under the name the backend runs
+        bin_dir = os.path.join(workdir, "bin")
+        os.makedirs(bin_dir)
+        os.symlink(os.path.join(ROOT, "replay.py"), os.path.join(bin_dir, "scxctl"))
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+
+        for name in options.scenario or list(SCENARIOS):
+            report = run_scenario(app, name, SCENARIOS[name], workdir, options.slow_scale)
+            if options.json:
+                print(json.dumps(report))
+            timings = "  ".join(
+                f"{label} {report[key]:.0f} ms" for label, key in
+                (("list", "list_ms"), ("start", "start_ms"), ("switch", "switch_ms"), ("stop", "stop_ms"))
+                if report.get(key) is not None
+            )
+            print(f"{name:16s} {timings}  worst stall {report['worst_stall_ms']} ms")
+            for description, passed in expectations(report):
+                failures += not passed
+                print(f"    {'ok  ' if passed else 'FAIL'} {description}")
+
+    print("PASS" if not failures else "FAIL")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    status = main()
+    # PySide6 6.12.0 leaks references to None/True/False on every call into a Python slot, and the
+    # interpreter aborts (exit 134) collecting them at shutdown. Everything is reported by now.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(status)
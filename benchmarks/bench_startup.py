@@ -0,0 +1,65 @@
+# bench_startup.py
+#
+# Measures time-to-first-paint and time-to-interactive of the GUI, from process spawn.
+# Exits non-zero when the median exceeds the startup budget, so regressions are caught.
+#
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --command dist/scxctl_configurator/scxctl_configurator
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startup budget in milliseconds, measured from spawn.
+FIRST_PAINT_BUDGET_MS = 600
+INTERACTIVE_BUDGET_MS = 1200
+
+
+def run_once(command, timeout):
+    env = dict(os.environ, SCXCTL_STARTUP_TRACE="exit")
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    spawned = time.time()
+    proc = subprocess.run(command, env=env, capture_output=True, text=True, timeout=timeout, cwd=ROOT)
+    marks = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("startup-trace "):
+            _, milestone, stamp = line.split()
+            marks[milestone] = (float(stamp) - spawned) * 1000
+    return marks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--command", nargs="+", default=[sys.executable, os.path.join(ROOT, "scxctl_configurator.py")],
+                        help="what to launch, e.g. the packaged binary")
+    options = parser.parse_args()
+
+    samples = {"first_paint": [], "interactive": []}
+    for _ in range(options.runs):
+        marks = run_once(options.command, options.timeout)
+        for milestone in samples:
+            if milestone not in marks:
+                print(f"run did not reach '{milestone}'", file=sys.stderr)
+                return 2
+            samples[milestone].append(marks[milestone])
+
+    budgets = {"first_paint": FIRST_PAINT_BUDGET_MS, "interactive": INTERACTIVE_BUDGET_MS}
+    over_budget = False
+    for milestone, values in samples.items():
+        median = statistics.median(values)
+        over = median > budgets[milestone]
+        over_budget |= over
+        print(f"{milestone:12s} median {median:7.1f} ms  max {max(values):7.1f} ms  "
+              f"budget {budgets[milestone]} ms{'  OVER BUDGET' if over else ''}")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
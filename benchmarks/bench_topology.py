@@ -0,0 +1,59 @@
+# bench_topology.py
+#
+# Builds the fixture sysfs cpu trees from tests/sysfs_trees.py, checks what
+# topology.py reads from them and the hints it derives, and times the one-off parse.
+# Run from the repository root:  python benchmarks/bench_topology.py
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.sysfs_trees import build_tree, hybrid_desktop, two_ccx_server
+from topology import format_cpu_list, mode_hint, rank_modes, read_topology, suggest_masks
+
+
+def check(name, condition, failures):
+    print(f"  {'ok  ' if condition else 'FAIL'} {name}")
+    if not condition:
+        failures.append(name)
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        desktop_root = os.path.join(tmp, "desktop")
+        server_root = os.path.join(tmp, "server")
+        build_tree(desktop_root, hybrid_desktop())
+        build_tree(server_root, two_ccx_server())
+
+        desktop = read_topology(desktop_root)
+        print(f"desktop: {desktop.summary()}")
+        check("efficiency cores", format_cpu_list(desktop.efficiency_cpus) == "16-23", failures)
+        check("physical cores", format_cpu_list(desktop.physical_cpus) == "0,2,4,6,8,10,12,14,16-23", failures)
+        check("bpfland Power Save applies", mode_hint("bpfland", "Power Save", desktop)[0] == 1, failures)
+        check("lavd physical-core mode applies", mode_hint("lavd", "Gaming & Low Latency", desktop)[0] == 1, failures)
+        check("mask suggestion", ("Performance cores", ["-m", "0xffff"]) in suggest_masks("bpfland", desktop), failures)
+
+        start = time.perf_counter()
+        server = read_topology(server_root)
+        elapsed = time.perf_counter() - start
+        print(f"server:  {server.summary()}")
+        check("two LLC domains", len(server.llc_groups()) == 2, failures)
+        check("not hybrid", not server.hybrid, failures)
+        check("cosmos -a ranked first", rank_modes("cosmos", server)[0] == "Server", failures)
+        check("Power Save flagged as not applicable", mode_hint("flash", "Power Save", server)[0] == -1, failures)
+        llc1 = hex(((1 << 64) - 1) << 64 | ((1 << 64) - 1) << 192)
+        check("LLC masks", ("LLC 1", ["-m", llc1]) in suggest_masks("flash", server), failures)
+        check("masks are hex", all(args[1].startswith("0x") for _label, args in suggest_masks("flash", server)),
+              failures)
+        print(f"parse time for {len(server)} CPUs: {elapsed * 1000:.1f} ms")
+
+    print("PASS" if not failures else "FAIL")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+# command_runner.py
+
+import itertools
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from scx_process import DEFAULT_TIMEOUT, CommandResult, run_command
+
+
+class _JobSignals(QObject):
+    # Emitted from the worker thread; delivered to the GUI thread as a queued call.
+    finished = Signal(int, object)
+
+
+class CommandJob(QRunnable):
+    """A single unit of work executed on the runner's worker thread."""
+
+    def __init__(self, job_id, label, func, signals, lock, key=None, signature=None):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.job_id = job_id
+        self.label = label
+        self.func = func
+        self.signals = signals
+        self.cancel_event = threading.Event()
+        # Coalescing state, guarded by the runner's lock
+        self.lock = lock
+        self.key = key
+        self.signature = signature
+        self.started = False
+        self.dropped = False
+
+    def run(self):
+        with self.lock:
+            if self.dropped:
+                # Superseded before it started; the runner already forgot about it
+                return
+            self.started = True
+        if self.cancel_event.is_set():
+            result = CommandResult([self.label], cancelled=True)
+        else:
+            try:
+                result = self.func(self.cancel_event)
+            except Exception as e:
+                result = CommandResult([self.label], error=f"An unexpected error occurred: {e}")
+        self.signals.finished.emit(self.job_id, result)
+
+
+class CommandRunner(QObject):
+    """
+    Runs scxctl commands off the GUI thread.
+    The pool has a single worker so start/switch/stop requests execute strictly in submission order.
+    Jobs submitted with a key coalesce with the pending jobs of the same key (see submit).
+    """
+
+    job_finished = Signal(int, object)
+    busy_changed = Signal(bool)
+
+    def __init__(self, parent=None, timeout=DEFAULT_TIMEOUT):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_job_finished)
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._callbacks = {}
+        self._lock = threading.Lock()
+        self.coalesced_count = 0
+        self.dropped_count = 0
+
+    def submit(self, label, func, callback=None, key=None, signature=None):
+        """
+        Queues func(cancel_event) to run on the worker thread.
+        callback(result) is invoked on the GUI thread once it completes.
+
+        With a key, only the latest intent for that key runs: a queued or running job with the same
+        signature absorbs this request (callback gets its result, nothing new is queued), and queued
+        jobs of the key with another signature are dropped without running or calling back.
+        """
+        # Dropping may empty the queue for a moment; that does not end the busy period
+        was_busy = bool(self._jobs)
+        if key is not None:
+            with self._lock:
+                for job in reversed(list(self._jobs.values())):
+                    if job.key != key or job.cancel_event.is_set():
+                        continue
+                    if signature is not None and job.signature == signature:
+                        if callback is not None:
+                            self._callbacks.setdefault(job.job_id, []).append(callback)
+                        self.coalesced_count += 1
+                        return job.job_id
+                    if not job.started:
+                        job.dropped = True
+                        del self._jobs[job.job_id]
+                        self._callbacks.pop(job.job_id, None)
+                        self.dropped_count += 1
+
+        job_id = next(self._ids)
+        job = CommandJob(job_id, label, func, self._signals, self._lock, key, signature)
+        self._jobs[job_id] = job
+        if callback is not None:
+            self._callbacks[job_id] = [callback]
+        if not was_busy:
+            self.busy_changed.emit(True)
+        self.pool.start(job)
+        return job_id
+
+    def submit_command(self, command, callback=None, timeout=None):
+        """Queues a plain command line using the runner's default timeout."""
+        timeout = self.timeout if timeout is None else timeout
+        return self.submit(
+            " ".join(command),
+            lambda cancel_event: run_command(command, timeout, cancel_event),
+            callback,
+        )
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.cancel_event.set()
+
+    def cancel_all(self):
+        for job in self._jobs.values():
+            job.cancel_event.set()
+
+    def is_busy(self):
+        return bool(self._jobs)
+
+    def shutdown(self, wait_ms=-1):
+        """Cancels everything still queued or running and waits for the worker to drain."""
+        self.cancel_all()
+        self.pool.waitForDone(wait_ms)
+
+    def _on_job_finished(self, job_id, result):
+        self._jobs.pop(job_id, None)
+        for callback in self._callbacks.pop(job_id, ()):
+            callback(result)
+        self.job_finished.emit(job_id, result)
+        if not self._jobs:
+            self.busy_changed.emit(False)
+
+
+class Debouncer(QObject):
+    """
+    Collapses a burst of trigger() calls into one call of func, delay_ms after the last one.
+    flush() runs a pending call immediately, for code that needs its effect right away.
+    """
+
+    def __init__(self, func, delay_ms, parent=None):
+        super().__init__(parent)
+        self.func = func
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay_ms)
+        self.timer.timeout.connect(self.func)
+
+    def trigger(self, *args):
+        """Signal-compatible: extra arguments (e.g. an index) are ignored."""
+        self.timer.start()
+
+    def flush(self):
+        if self.timer.isActive():
+            self.timer.stop()
+            self.func()
@@ -0,0 +1,202 @@
+# flag_schema.py
+#
+# Compiles the per-scheduler "Flags" tables in scheduler_data into lookup tables and
+# validates free-text scheduler arguments against them. GUI-free.
+
+import re
+
+from scheduler_data import SCHEDULER_OPTIONS
+
+# Flag types understood in scheduler_data "Flags" entries.
+FLAG_TYPES = ("bool", "bool-value", "int", "float", "choice", "domain", "str")
+
+# Named primary domains accepted alongside CPU lists / hex masks.
+DOMAIN_NAMES = ("auto", "performance", "powersave", "all", "turbo")
+
+_CPU_LIST_RE = re.compile(r"^(0x[0-9a-fA-F]+|\d+(-\d+)?(,\d+(-\d+)?)*)$")
+_BOOL_VALUES = ("true", "false")
+
+
+class FlagSpec:
+    """One scheduler flag. name is the canonical spelling used in SCHEDULER_OPTIONS."""
+
+    __slots__ = ("name", "long", "kind", "minimum", "maximum", "choices", "excludes", "description")
+
+    def __init__(self, name, long=None, kind="bool", minimum=None, maximum=None, choices=(), excludes=(),
+                 description=""):
+        if kind not in FLAG_TYPES:
+            raise ValueError(f"{name}: unknown flag type '{kind}'")
+        self.name = name
+        self.long = long
+        self.kind = kind
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = tuple(choices)
+        self.excludes = frozenset(excludes)
+        self.description = description
+
+    @property
+    def takes_value(self):
+        return self.kind != "bool"
+
+    def check_value(self, value):
+        """Returns an error message for a bad value, or None."""
+        kind = self.kind
+        if kind in ("int", "float"):
+            try:
+                number = int(value) if kind == "int" else float(value)
+            except ValueError:
+                return f"{self.name} expects {'an integer' if kind == 'int' else 'a number'}, got '{value}'"
+            if self.minimum is not None and number < self.minimum:
+                return f"{self.name} must be >= {self.minimum}, got {value}"
+            if self.maximum is not None and number > self.maximum:
+                return f"{self.name} must be <= {self.maximum}, got {value}"
+        elif kind == "bool-value":
+            if value.lower() not in _BOOL_VALUES:
+                return f"{self.name} expects true or false, got '{value}'"
+        elif kind == "choice":
+            if value not in self.choices:
+                return f"{self.name} expects one of {', '.join(self.choices)}, got '{value}'"
+        elif kind == "domain":
+            if value not in DOMAIN_NAMES and not _CPU_LIST_RE.match(value):
+                return f"{self.name} expects {', '.join(DOMAIN_NAMES)}, a CPU list or a hex mask, got '{value}'"
+        return None
+
+    def __repr__(self):
+        return f"FlagSpec({self.name!r}, kind={self.kind!r})"
+
+
+class CompiledSchema:
+    """
+    Flag lookup table for one scheduler, keyed by every spelling (short and long).
+    When strict, flags missing from the table are rejected; otherwise they pass through.
+    """
+
+    __slots__ = ("lookup", "strict")
+
+    def __init__(self, specs, strict=False):
+        self.lookup = {}
+        self.strict = strict
+        for spec in specs:
+            self.lookup[spec.name] = spec
+            if spec.long:
+                self.lookup[spec.long] = spec
+
+    def _split_cluster(self, token):
+        """
+        '-pk' -> ([p, k], None), '-ks5000' -> ([k, s], '5000'): bool flags up to the first one that
+        takes a value, which gets the rest of the token. None when a letter is not a known flag.
+        """
+        specs = []
+        for position in range(1, len(token)):
+            spec = self.lookup.get("-" + token[position])
+            if spec is None:
+                return None
+            specs.append(spec)
+            if spec.takes_value:
+                value = token[position + 1:]
+                return specs, (value[1:] if value.startswith("=") else value) or None
+        return specs, None
+
+    def validate(self, tokens):
+        """Checks a tokenized argument list in one pass. Returns a list of error strings."""
+        errors = []
+        seen = []
+        lookup = self.lookup
+        index = 0
+        count = len(tokens)
+        while index < count:
+            token = tokens[index]
+            index += 1
+            value = None
+
+            if token.startswith("--") and "=" in token:
+                token, value = token.split("=", 1)
+            spec = lookup.get(token)
+
+            if spec is None and len(token) > 2 and token[0] == "-" and token[1] != "-":
+                # Short flags clustered the way clap accepts them: -pk, -s5000, -ks5000
+                cluster = self._split_cluster(token)
+                if cluster is not None:
+                    specs, value = cluster
+                    seen.extend(specs[:-1])
+                    spec = specs[-1]
+
+            if spec is None:
+                if not token.startswith("-"):
+                    errors.append(f"Unexpected value '{token}'")
+                elif self.strict:
+                    errors.append(f"Unknown flag {token}")
+                elif index < count and not tokens[index].startswith("-"):
+                    index += 1  # assume the unknown flag takes the following value
+                continue
+
+            seen.append(spec)
+            if spec.takes_value:
+                if value is None:
+                    if index >= count:
+                        errors.append(f"{spec.name} expects a value")
+                        continue
+                    value = tokens[index]
+                    index += 1
+                error = spec.check_value(value)
+                if error:
+                    errors.append(error)
+            elif value is not None:
+                errors.append(f"{spec.name} does not take a value")
+
+        if seen:
+            unique = {spec.name: spec for spec in seen}
+            names = set(unique)
+            for spec in unique.values():
+                conflict = spec.excludes & names
+                if conflict:
+                    errors.append(f"{spec.name} cannot be combined with {', '.join(sorted(conflict))}")
+                    names.discard(spec.name)
+        return errors
+
+
+def compile_flags(flags, strict=False):
+    """Builds a CompiledSchema from a scheduler_data "Flags" dict."""
+    specs = []
+    for name, data in flags.items():
+        specs.append(FlagSpec(
+            name,
+            long=data.get("Long"),
+            kind=data.get("Type", "bool"),
+            minimum=data.get("Min"),
+            maximum=data.get("Max"),
+            choices=data.get("Choices", ()),
+            excludes=data.get("Excludes", ()),
+            description=data.get("Description", ""),
+        ))
+    return CompiledSchema(specs, strict)
+
+
+_compiled = {}
+
+
+def get_schema(scheduler):
+    """Returns the compiled schema for a scheduler (compiled once per session), or None if it has no flags."""
+    if scheduler not in _compiled:
+        options = SCHEDULER_OPTIONS.get(scheduler, {})
+        flags = options.get("Flags")
+        _compiled[scheduler] = compile_flags(flags, options.get("StrictFlags", False)) if flags else None
+    return _compiled[scheduler]
+
+
+def invalidate_schemas():
+    """Drops compiled schemas, e.g. after generated flags were merged into SCHEDULER_OPTIONS."""
+    _compiled.clear()
+
+
+def validate_args(scheduler, args):
+    """
+    Validates scheduler arguments (a string or token list).
+    Returns a list of error strings; empty when the args are fine or the scheduler has no schema.
+    """
+    schema = get_schema(scheduler)
+    if schema is None:
+        return []
+    tokens = args.split() if isinstance(args, str) else list(args)
+    return schema.validate(tokens)
@@ -0,0 +1,231 @@
+# fleet.py
+#
+# Applies one profile to many hosts at once: the headless confirm_selection, fanned out over
+# SSH-style transports with bounded parallelism. Results stream back as each host finishes.
+# GUI-free.
+#
+#   python fleet.py --inventory hosts.txt --profile flash/Server --concurrency 64
+#   python fleet.py --inventory hosts.txt --sched lavd --args "--performance" --json
+#
+# The inventory is one host per line (anything ssh accepts, e.g. user@node17); '#' starts a comment.
+
+import argparse
+import asyncio
+import json
+import random
+import shlex
+import sys
+import time
+
+from flag_schema import validate_args
+from scx_backend import NO_SCHEDULER_TEXT, parse_status
+from scx_core import choose_action, resolve_args, scxctl_command
+from scx_process import DEFAULT_TIMEOUT, CommandResult
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 10.0
+
+SSH_OPTIONS = ("-o", "BatchMode=yes", "-o", "ConnectTimeout=10")
+
+
+def load_inventory(path):
+    hosts = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            host = line.split("#", 1)[0].strip()
+            if host and host not in hosts:
+                hosts.append(host)
+    return hosts
+
+
+class SSHTransport:
+    """Runs commands on a host through the ssh client (keys/agent only; never prompts)."""
+
+    def __init__(self, ssh="ssh", options=SSH_OPTIONS):
+        self.ssh = ssh
+        self.options = list(options)
+
+    async def run(self, host, command, timeout=DEFAULT_TIMEOUT):
+        full_command = [self.ssh, *self.options, host, "--", " ".join(shlex.quote(arg) for arg in command)]
+        start = time.monotonic()
+        result = CommandResult(command)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *full_command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            result.error = f"Could not run {self.ssh}: {e}"
+            return result
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            result.timed_out = True
+        else:
+            result.returncode = proc.returncode
+            result.stdout = stdout.decode(errors="replace")
+            result.stderr = stderr.decode(errors="replace")
+        result.duration = time.monotonic() - start
+        return result
+
+
+class FakeTransport:
+    """
+    In-process stand-in for a fleet: answers scxctl get/start/switch/stop per host without any network.
+    latency is seconds per call; fail_times maps host -> number of calls that fail before it recovers.
+    Every command is logged in self.calls as (host, command).
+    """
+
+    def __init__(self, latency=0.01, fail_times=None, running=None):
+        self.latency = latency
+        self.fail_times = dict(fail_times or {})
+        self.running = dict(running or {})
+        self.calls = []
+
+    async def run(self, host, command, timeout=DEFAULT_TIMEOUT):
+        self.calls.append((host, list(command)))
+        await asyncio.sleep(self.latency)
+        result = CommandResult(command, returncode=0, duration=self.latency)
+        if self.fail_times.get(host, 0) > 0:
+            self.fail_times[host] -= 1
+            result.returncode = 255
+            result.stderr = f"ssh: connect to host {host} port 22: Connection refused"
+            return result
+
+        verb = command[1]
+        if verb == "get":
+            scheduler = self.running.get(host)
+            result.stdout = f"running {scheduler}\n" if scheduler else f"{NO_SCHEDULER_TEXT}\n"
+        elif verb in ("start", "switch"):
+            self.running[host] = command[command.index("--sched") + 1]
+        elif verb == "stop":
+            self.running.pop(host, None)
+        return result
+
+
+class HostResult:
+    """Outcome of applying the profile to one host."""
+
+    __slots__ = ("host", "ok", "action", "attempts", "error", "duration")
+
+    def __init__(self, host, ok, action=None, attempts=0, error=None, duration=0.0):
+        self.host = host
+        self.ok = ok
+        self.action = action
+        self.attempts = attempts
+        self.error = error
+        self.duration = duration
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+async def apply_once(transport, host, scheduler, args, timeout, executable="scxctl"):
+    """One start-or-switch on a host, with the verb from choose_action. Returns (verb, CommandResult)."""
+    status = parse_status(await transport.run(host, scxctl_command("get", executable=executable), timeout))
+    if not status.ok:
+        return "get", status
+    verb = choose_action(status)
+    return verb, await transport.run(host, scxctl_command(verb, scheduler, args, executable), timeout)
+
+
+async def apply_host(transport, host, scheduler, args, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                     backoff=DEFAULT_BACKOFF, sleep=asyncio.sleep):
+    """Applies to one host, retrying failures with jittered exponential backoff."""
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        verb, result = await apply_once(transport, host, scheduler, args, timeout)
+        if result.ok or attempt > retries:
+            return HostResult(host, result.ok, verb, attempt, None if result.ok else result.error_text(),
+                              time.monotonic() - start)
+        delay = min(backoff * 2 ** (attempt - 1), MAX_BACKOFF)
+        await sleep(delay * random.uniform(0.5, 1.0))
+
+
+async def fleet_apply(hosts, scheduler, args, transport, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                      retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """
+    Async generator yielding a HostResult per host, in completion order.
+    At most `concurrency` hosts are in flight at any time; a retrying host keeps its slot while it backs off.
+    """
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def bounded(host):
+        async with semaphore:
+            return await apply_host(transport, host, scheduler, args, timeout, retries, backoff)
+
+    tasks = [asyncio.ensure_future(bounded(host)) for host in hosts]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Apply a scheduler profile to many hosts over ssh.")
+    parser.add_argument("--inventory", required=True, help="file with one host per line")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--profile", help="saved profile to apply (see profiles.py)")
+    target.add_argument("--sched", help="scheduler to start or switch to")
+    parser.add_argument("--mode", help="named mode for --sched")
+    parser.add_argument("--args", default="", help="custom scheduler arguments for --sched; override --mode")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="hosts in flight at once")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES, help="extra attempts per failed host")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per remote call")
+    parser.add_argument("--ssh", default="ssh", help="ssh client to use")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per host as it finishes")
+    return parser
+
+
+async def run_fleet(options, hosts, scheduler, args, transport):
+    failed = 0
+    async for host_result in fleet_apply(hosts, scheduler, args, transport, options.concurrency,
+                                         options.timeout, options.retries):
+        failed += not host_result.ok
+        if options.json:
+            print(json.dumps(host_result.to_dict()), flush=True)
+        elif host_result.ok:
+            print(f"{host_result.host}: {host_result.action}ed to {scheduler} ({host_result.duration:.1f}s)", flush=True)
+        else:
+            print(f"{host_result.host}: FAILED after {host_result.attempts} attempts: {host_result.error}", flush=True)
+    return failed
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.profile:
+        from profiles import ProfileStore
+
+        profile = ProfileStore().load().get(options.profile)
+        if profile is None:
+            print(f"ERROR: Unknown profile '{options.profile}'.", file=sys.stderr)
+            return 2
+        scheduler, args = profile["scheduler"], profile["args"]
+    else:
+        scheduler, args = options.sched, resolve_args(options.sched, options.mode, options.args)
+
+    errors = validate_args(scheduler, args)
+    if errors:
+        print(f"ERROR: Invalid arguments: {'; '.join(errors)}", file=sys.stderr)
+        return 2
+    try:
+        hosts = load_inventory(options.inventory)
+    except OSError as e:
+        print(f"ERROR: could not read inventory: {e}", file=sys.stderr)
+        return 2
+
+    failed = asyncio.run(run_fleet(options, hosts, scheduler, args, SSHTransport(options.ssh)))
+    if not options.json:
+        print(f"{len(hosts) - failed}/{len(hosts)} hosts applied.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
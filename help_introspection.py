@@ -0,0 +1,220 @@
+# help_introspection.py
+#
+# Builds flag schemas for installed schedulers by parsing their clap-style `scx_<name> --help`
+# output, so schedulers without hand-written tables in scheduler_data still get validation.
+# Results are cached per binary path, keyed by size and mtime; only changed binaries are re-run.
+#
+#   python help_introspection.py bpfland flash     # print the generated Flags tables as JSON
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from scheduler_cache import cache_dir, write_json_atomic
+
+# Bump when the parser output changes; older cache files are ignored.
+CACHE_FORMAT = 2
+MAX_CACHED_BINARIES = 256
+HELP_TIMEOUT = 10.0
+
+# "  -s, --slice-us <SLICE_US>  Maximum slice ..." / "      --stats <STATS>" / "  -v, --verbose..."
+# (the trailing "..." marks a flag that may be repeated, e.g. a verbosity count)
+_OPTION_RE = re.compile(
+    r"^\s{1,8}(?:(?P<short>-[A-Za-z0-9])(?:,\s*|\s+(?=<)|$|(?=\s{2,})|\.\.\.))?"
+    r"(?P<long>--[A-Za-z0-9][\w-]*)?(?:\.\.\.)?"
+    r"(?:[ =]\[?<(?P<value>[^>]+)>\]?(?:\.\.\.)?)?"
+    r"(?:\s{2,}(?P<help>.*))?$"
+)
+_DEFAULT_RE = re.compile(r"\[default: ([^\]]*)\]")
+_POSSIBLE_RE = re.compile(r"\[possible values: ([^\]]*)\]")
+
+# Never passed to scx_loader
+_IGNORED = {"-h", "--help", "-V", "--version"}
+
+
+def help_cache_path():
+    return os.path.join(cache_dir(), "help_schema.json")
+
+
+def _infer_type(value_name, default, choices):
+    if choices:
+        if sorted(choices) == ["false", "true"]:
+            return "bool-value"
+        return "choice"
+    if "DOMAIN" in value_name.upper():
+        return "domain"
+    if default is not None:
+        for kind, cast in (("int", int), ("float", float)):
+            try:
+                cast(default)
+                return kind
+            except ValueError:
+                pass
+    return "str"
+
+
+def parse_clap_help(text):
+    """Parses clap --help output into a scheduler_data style "Flags" dict."""
+    flags = {}
+    current = None
+    current_key = None
+
+    def finish():
+        if current is None or current_key in _IGNORED:
+            return
+        blob = " ".join(current.pop("_text"))
+        default = _DEFAULT_RE.search(blob)
+        possible = _POSSIBLE_RE.search(blob)
+        choices = [c.strip() for c in possible.group(1).split(",")] if possible else []
+        value_name = current.pop("_value")
+        if value_name is None:
+            current["Type"] = "bool"
+        else:
+            current["Type"] = _infer_type(value_name, default.group(1) if default else None, choices)
+            if current["Type"] == "choice":
+                current["Choices"] = choices
+        description = _DEFAULT_RE.sub("", _POSSIBLE_RE.sub("", blob)).strip()
+        if description:
+            current["Description"] = description.split(". ")[0].rstrip(".") + "."
+        flags[current_key] = current
+
+    in_options = False
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if not line.startswith(" "):
+            # Section headers: "Options:", "Usage: ...", "Arguments:"
+            finish()
+            current = None
+            in_options = line.rstrip().endswith(":") and "option" in line.lower()
+            continue
+        if not in_options:
+            continue
+        match = _OPTION_RE.match(line)
+        if match and (match.group("short") or match.group("long")) and line.lstrip().startswith("-"):
+            finish()
+            short, long = match.group("short"), match.group("long")
+            current_key = short or long
+            current = {"_value": match.group("value"), "_text": []}
+            if short and long:
+                current["Long"] = long
+            if match.group("help"):
+                current["_text"].append(match.group("help").strip())
+        elif current is not None:
+            current["_text"].append(line.strip())
+    finish()
+    return flags
+
+
+def find_scheduler_binaries(names):
+    """Maps scheduler names to installed scx_<name> executables."""
+    binaries = {}
+    for name in names:
+        path = shutil.which(f"scx_{name}")
+        if path:
+            binaries[name] = path
+    return binaries
+
+
+def introspect_binary(path):
+    """Runs one scheduler's --help and parses it. Executed on a pool thread."""
+    try:
+        result = subprocess.run([path, "--help"], capture_output=True, text=True, timeout=HELP_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return parse_clap_help(result.stdout or result.stderr)
+
+
+def _binary_key(path):
+    st = os.stat(path)
+    return [st.st_size, int(st.st_mtime)]
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+        return {}
+    binaries = data.get("binaries")
+    return binaries if isinstance(binaries, dict) else {}
+
+
+def _save_cache(path, binaries):
+    if len(binaries) > MAX_CACHED_BINARIES:
+        return
+    write_json_atomic(path, {"format": CACHE_FORMAT, "binaries": binaries})
+
+
+def introspect_schedulers(names, cache_path=None, max_workers=None):
+    """
+    Returns {name: Flags dict} for every installed scheduler in names.
+    Binaries whose size/mtime match the cache are not executed; the rest run in parallel.
+    Each pool thread only waits on its own scx_<name> child process, so threads give the same
+    parallelism as a process pool without forking the (possibly Qt-hosting) parent.
+    """
+    cache_path = cache_path or help_cache_path()
+    binaries = find_scheduler_binaries(names)
+    cached = _load_cache(cache_path)
+
+    flags_by_name = {}
+    stale = {}
+    fresh_cache = {}
+    for name, path in binaries.items():
+        try:
+            key = _binary_key(path)
+        except OSError:
+            continue
+        entry = cached.get(path)
+        if entry and entry.get("key") == key:
+            flags_by_name[name] = entry["flags"]
+            fresh_cache[path] = entry
+        else:
+            stale[name] = (path, key)
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            parsed = pool.map(introspect_binary, [path for path, _key in stale.values()])
+            for (name, (path, key)), flags in zip(stale.items(), parsed):
+                if flags:
+                    flags_by_name[name] = flags
+                    fresh_cache[path] = {"key": key, "flags": flags}
+
+    if stale or len(fresh_cache) != len(cached):
+        _save_cache(cache_path, fresh_cache)
+    return flags_by_name
+
+
+def merge_into_options(options, flags_by_name):
+    """
+    Adds generated flags to a SCHEDULER_OPTIONS style dict in place.
+    Hand-written entries win; flags they already cover (by short or long spelling) are skipped.
+    Since a generated table lists every flag, the scheduler becomes strict.
+    """
+    for name, generated in flags_by_name.items():
+        entry = options.setdefault(name, {"Modes": {}, "Flags": {}})
+        flags = entry.setdefault("Flags", {})
+        known = set(flags) | {data["Long"] for data in flags.values() if data.get("Long")}
+        for key, data in generated.items():
+            if key in flags:
+                # Learn the long spelling of a hand-written short flag
+                if data.get("Long") and not flags[key].get("Long"):
+                    flags[key]["Long"] = data["Long"]
+                continue
+            if key in known or data.get("Long") in known:
+                continue
+            flags[key] = data
+        entry["StrictFlags"] = True
+    return options
+
+
+if __name__ == "__main__":
+    from scheduler_data import SCHEDULER_OPTIONS
+
+    print(json.dumps(introspect_schedulers(sys.argv[1:] or list(SCHEDULER_OPTIONS)), indent=2))
@@ -0,0 +1,237 @@
+# instrumentation.py
+#
+# Timings, outcome counters and the last error for every backend call (list, get, start, switch,
+# stop), labelled by backend so loader time can be told apart from our own. GUI-free.
+#
+# Disabled, instrument() returns the backend untouched, so there is no per-call cost at all.
+#
+#   SCXCTL_METRICS=1|0          force on/off (the GUI defaults to on, the CLI tools to off)
+#   SCXCTL_METRICS_PORT=9464    serve Prometheus text on http://127.0.0.1:<port>/metrics
+#   SCXCTL_METRICS_FILE=path    write a JSON dump there when the backend is closed
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Histogram bucket upper bounds in seconds (Prometheus 'le'); the last bucket is +Inf.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Backend method -> operation label
+OPERATIONS = {
+    "list_schedulers": "list",
+    "get_status": "get",
+    "start": "start",
+    "switch": "switch",
+    "stop": "stop",
+}
+
+OUTCOMES = ("ok", "failed", "timed_out", "cancelled")
+
+
+def is_enabled(default=False):
+    value = os.environ.get("SCXCTL_METRICS")
+    if value is None:
+        return default or bool(os.environ.get("SCXCTL_METRICS_PORT") or os.environ.get("SCXCTL_METRICS_FILE"))
+    return value not in ("", "0")
+
+
+class OperationStats:
+    """Histogram, outcome counts and last error of one (backend, operation) pair."""
+
+    __slots__ = ("buckets", "total", "count", "outcomes", "last_error", "last_error_time")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+        self.last_error = None
+        self.last_error_time = None
+
+    def record(self, seconds, outcome, error=None):
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.outcomes[outcome] += 1
+        if error is not None:
+            self.last_error = error
+            self.last_error_time = time.time()
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (inf when it falls past the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return BUCKETS[index] if index < len(BUCKETS) else float("inf")
+        return float("inf")
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum_s": self.total,
+            "mean_s": self.total / self.count if self.count else None,
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], self.buckets)),
+            "outcomes": dict(self.outcomes),
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+        }
+
+
+class Registry:
+    """All OperationStats, keyed by (backend, operation). Calls arrive from worker threads."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def record(self, backend, operation, seconds, result=None, exception=None):
+        if exception is not None:
+            outcome, error = "failed", f"{type(exception).__name__}: {exception}"
+        elif result.ok:
+            outcome, error = "ok", None
+        else:
+            outcome = "timed_out" if result.timed_out else "cancelled" if result.cancelled else "failed"
+            error = result.error_text()
+        with self.lock:
+            stats = self.stats.get((backend, operation))
+            if stats is None:
+                stats = self.stats[(backend, operation)] = OperationStats()
+            stats.record(seconds, outcome, error)
+
+    def snapshot(self):
+        """{(backend, operation): stats dict}, consistent at one point in time."""
+        with self.lock:
+            return {key: stats.to_dict() for key, stats in self.stats.items()}
+
+    def to_json(self):
+        return {
+            "time": time.time(),
+            "operations": [
+                dict(backend=backend, operation=operation, **stats)
+                for (backend, operation), stats in sorted(self.snapshot().items())
+            ],
+        }
+
+    def dump_json(self, path):
+        from scheduler_cache import write_json_atomic
+
+        return write_json_atomic(path, self.to_json(), indent=2)
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP scxctl_backend_call_seconds Duration of scx_loader backend calls.",
+            "# TYPE scxctl_backend_call_seconds histogram",
+        ]
+        snapshot = sorted(self.snapshot().items())
+        for (backend, operation), stats in snapshot:
+            labels = f'backend="{backend}",operation="{operation}"'
+            cumulative = 0
+            for bound, bucket_count in stats["buckets"].items():
+                cumulative += bucket_count
+                lines.append(f'scxctl_backend_call_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"scxctl_backend_call_seconds_sum{{{labels}}} {stats['sum_s']}")
+            lines.append(f"scxctl_backend_call_seconds_count{{{labels}}} {stats['count']}")
+        lines += [
+            "# HELP scxctl_backend_calls_total Backend calls by outcome.",
+            "# TYPE scxctl_backend_calls_total counter",
+        ]
+        for (backend, operation), stats in snapshot:
+            for outcome, value in stats["outcomes"].items():
+                lines.append(
+                    f'scxctl_backend_calls_total{{backend="{backend}",operation="{operation}",outcome="{outcome}"}} {value}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by every instrumented backend
+REGISTRY = Registry()
+
+
+class InstrumentedBackend:
+    """Wraps a backend and records every operation in OPERATIONS; everything else is passed through."""
+
+    def __init__(self, backend, registry=REGISTRY, dump_path=None):
+        self.backend = backend
+        self.registry = registry
+        self.dump_path = dump_path
+        self.name = backend.name
+        for method_name, operation in OPERATIONS.items():
+            setattr(self, method_name, self._timed(operation, getattr(backend, method_name)))
+
+    def _timed(self, operation, method):
+        record = self.registry.record
+        name = self.name
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                record(name, operation, time.perf_counter() - start, exception=e)
+                raise
+            record(name, operation, time.perf_counter() - start, result)
+            return result
+
+        return call
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def close(self):
+        if self.dump_path:
+            self.registry.dump_json(self.dump_path)
+        self.backend.close()
+
+
+def instrument(backend, default=False):
+    """Returns backend wrapped for metrics when enabled, otherwise backend itself."""
+    if not is_enabled(default):
+        return backend
+    port = os.environ.get("SCXCTL_METRICS_PORT")
+    if port:
+        start_server(int(port))
+    return InstrumentedBackend(backend, dump_path=os.environ.get("SCXCTL_METRICS_FILE"))
+
+
+_server = None
+
+
+def start_server(port, registry=REGISTRY):
+    """Serves /metrics (Prometheus text) and /metrics.json on localhost from a daemon thread."""
+    global _server
+    if _server is not None:
+        return _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = registry.prometheus_text().encode(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, content_type = json.dumps(registry.to_json()).encode(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        _server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    except OSError:
+        return None
+    threading.Thread(target=_server.serve_forever, name="scx-metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,163 @@
+# log_view.py
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import (
+    QComboBox, QDialog, QHBoxLayout, QLabel, QLineEdit, QListView, QPushButton, QVBoxLayout
+)
+
+from command_runner import Debouncer
+from scheduler_log import LogFollower, journal_command, monitor_command
+
+# How often new lines are pulled into the view while it is visible
+SYNC_MS = 200
+
+FILTER_DEBOUNCE_MS = 150
+
+SOURCES = ["scx_loader journal", "Scheduler stats (--monitor)"]
+
+
+class LogListModel(QAbstractListModel):
+    """
+    Exposes a LogBuffer's filtered rows to a QListView without copying them.
+    sync() turns what changed in the buffer since the last call into row removals at the top and
+    insertions at the bottom, so the view only lays out the rows it actually shows.
+    """
+
+    def __init__(self, buffer, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self._generation = None
+        self._added = 0
+        self._evicted = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._added - self._evicted
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        with self.buffer.lock:
+            generation, _added, evicted = self.buffer.counters()
+            if generation != self._generation:
+                return None
+            # Rows are numbered as of the last sync; the reader may have evicted some since
+            return self.buffer.row(self._evicted + index.row() - evicted)
+
+    def sync(self):
+        """Applies the buffer's changes since the last call. Returns True when rows were added."""
+        with self.buffer.lock:
+            generation, added, evicted = self.buffer.counters()
+        rows = self._added - self._evicted
+        if generation != self._generation or evicted - self._evicted > rows:
+            # New filter, cleared buffer, or more lines arrived than it holds
+            self.beginResetModel()
+            self._generation, self._added, self._evicted = generation, added, evicted
+            self.endResetModel()
+            return True
+        if evicted > self._evicted:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - self._evicted - 1)
+            self._evicted = evicted
+            self.endRemoveRows()
+        if added > self._added:
+            rows = self._added - self._evicted
+            self.beginInsertRows(QModelIndex(), rows, rows + added - self._added - 1)
+            self._added = added
+            self.endInsertRows()
+            return True
+        return False
+
+
+class SchedulerLogDialog(QDialog):
+    """
+    Live scheduler output: the scx_loader journal or the running scheduler's stats stream.
+    The follower keeps filling the buffer while the dialog is hidden; the view only syncs while shown.
+    """
+
+    def __init__(self, buffer, running_scheduler, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Scheduler Log")
+        self.resize(900, 450)
+        self.buffer = buffer
+        self.running_scheduler = running_scheduler
+        self.follower = None
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Source:"))
+        self.source_combo = QComboBox()
+        self.source_combo.addItems(SOURCES)
+        self.source_combo.activated.connect(self.restart_follower)
+        controls.addWidget(self.source_combo)
+        self.filter_textbox = QLineEdit()
+        self.filter_textbox.setPlaceholderText("Filter lines...")
+        self.filter_update = Debouncer(self.apply_filter, FILTER_DEBOUNCE_MS, self)
+        self.filter_textbox.textChanged.connect(self.filter_update.trigger)
+        controls.addWidget(self.filter_textbox, 1)
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(self.buffer.clear)
+        controls.addWidget(self.clear_button)
+        layout.addLayout(controls)
+
+        self.model = LogListModel(buffer, self)
+        self.view = QListView()
+        # Uniform rows let the view skip measuring every line; only visible rows are ever fetched
+        self.view.setUniformItemSizes(True)
+        self.view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.view.setEditTriggers(QListView.NoEditTriggers)
+        self.view.setSelectionMode(QListView.ExtendedSelection)
+        self.view.setModel(self.model)
+        layout.addWidget(self.view)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.sync)
+        self.restart_follower()
+
+    def restart_follower(self):
+        if self.follower is not None:
+            self.follower.stop()
+        if self.source_combo.currentIndex() == 0:
+            command = journal_command()
+        else:
+            scheduler = self.running_scheduler()
+            if scheduler is None:
+                self.follower = None
+                self.buffer.append("[No scheduler is running; nothing to monitor.]")
+                return
+            command = monitor_command(scheduler)
+        self.buffer.append(f"[Following: {' '.join(command)}]")
+        self.follower = LogFollower(command, self.buffer)
+        self.follower.start()
+
+    def apply_filter(self):
+        self.buffer.set_filter(self.filter_textbox.text())
+        self.sync()
+
+    def sync(self):
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        if self.model.sync() and at_bottom:
+            self.view.scrollToBottom()
+        shown = self.model.rowCount()
+        total = len(self.buffer)
+        self.summary_label.setText(
+            f"<small>{total} lines kept (last {self.buffer.capacity})"
+            + (f", {shown} match" if self.buffer.filter_text.strip() else "") + "</small>"
+        )
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.sync()
+        self.timer.start(SYNC_MS)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def shutdown(self):
+        self.timer.stop()
+        if self.follower is not None:
+            self.follower.stop()
@@ -0,0 +1,228 @@
+# profiles.py
+#
+# Named scheduler+args profiles kept on disk, with per-host overlays merged on top of the
+# defaults shipped in SCHEDULER_OPTIONS, and a diff-based apply that skips needless BPF reloads.
+# GUI-free.
+#
+# $XDG_CONFIG_HOME/scxctl_configurator/profiles.json:
+#
+#   {
+#     "version": 1,
+#     "profiles": {
+#       "studio": {"scheduler": "bpfland", "args": ["-s", "5000", "-m", "performance"]}
+#     },
+#     "hosts": {
+#       "build-box": {"studio": {"args": ["-s", "2000"]}, "nightly": {"scheduler": "flash", "args": ["-m", "all"]}}
+#     }
+#   }
+#
+# Shipped defaults are named "<scheduler>/<mode>" (e.g. "flash/Server"); user profiles override
+# them by name, and the overlay for the current hostname overrides both, field by field.
+
+import json
+import os
+import socket
+
+from scheduler_cache import cache_dir, write_json_atomic
+from scheduler_data import SCHEDULER_OPTIONS
+from scx_backend import short_name
+from scx_process import DEFAULT_TIMEOUT, CommandResult
+from status_monitor import ENABLE_SEQ_PATH, read_enable_seq, wait_for_enable_seq
+
+# Bump when the file layout changes; files with another version are not loaded.
+PROFILE_FORMAT = 1
+
+# Same idea as the scheduler cache bounds: a corrupt file must not stall startup.
+MAX_PROFILE_BYTES = 256 * 1024
+
+
+def config_dir():
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "scxctl_configurator")
+
+
+def profiles_path():
+    return os.path.join(config_dir(), "profiles.json")
+
+
+def applied_path():
+    return os.path.join(cache_dir(), "applied.json")
+
+
+def default_profiles():
+    """One profile per SCHEDULER_OPTIONS mode, named '<scheduler>/<mode>'."""
+    profiles = {}
+    for scheduler, options in SCHEDULER_OPTIONS.items():
+        for mode, mode_data in options.get("Modes", {}).items():
+            profiles[f"{scheduler}/{mode}"] = {"scheduler": scheduler, "args": mode_data.get("Flags", "").split()}
+    return profiles
+
+
+def _valid_profile(data):
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get("scheduler"), str)
+        and isinstance(data.get("args"), list)
+        and all(isinstance(arg, str) for arg in data["args"])
+    )
+
+
+def _merge(base, overlay):
+    """Field-wise merge of one profile overlay; entries that end up incomplete are dropped."""
+    if not isinstance(overlay, dict):
+        return base
+    merged = {}
+    for name, fields in overlay.items():
+        if not isinstance(fields, dict):
+            continue
+        profile = dict(base.get(name, {}), **fields)
+        if isinstance(profile.get("args"), str):
+            profile["args"] = profile["args"].split()
+        if _valid_profile(profile):
+            merged[name] = {"scheduler": profile["scheduler"], "args": list(profile["args"])}
+    return dict(base, **merged)
+
+
+class ProfileStore:
+    """
+    Profiles indexed by name. The file is parsed once and only re-read when its size or mtime
+    changes, so repeated lookups (and repeated load() calls from tooling) cost a stat.
+    """
+
+    def __init__(self, path=None, host=None):
+        self.path = path or profiles_path()
+        self.host = host or socket.gethostname()
+        self.user_profiles = {}
+        self.host_profiles = {}
+        self.index = default_profiles()
+        self.error = None
+        self._signature = None
+
+    def load(self):
+        """Re-reads the file if it changed. Problems are kept in self.error; defaults still apply."""
+        try:
+            st = os.stat(self.path)
+            signature = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            signature = None
+        if signature == self._signature:
+            return self
+        self._signature = signature
+        self.error = None
+        self.user_profiles = {}
+        self.host_profiles = {}
+
+        if signature is not None:
+            try:
+                if signature[0] > MAX_PROFILE_BYTES:
+                    raise ValueError(f"larger than {MAX_PROFILE_BYTES} bytes")
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict) or data.get("version") != PROFILE_FORMAT:
+                    raise ValueError(f"unsupported profile format (expected version {PROFILE_FORMAT})")
+                self.user_profiles = data.get("profiles") or {}
+                self.host_profiles = (data.get("hosts") or {}).get(self.host) or {}
+            except (OSError, ValueError) as e:
+                self.error = f"{self.path}: {e}"
+
+        self.index = _merge(_merge(default_profiles(), self.user_profiles), self.host_profiles)
+        return self
+
+    def names(self):
+        return sorted(self.index)
+
+    def get(self, name):
+        """Returns {'scheduler': ..., 'args': [...]} or None."""
+        return self.index.get(name)
+
+    def _read_raw(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or data.get("version") != PROFILE_FORMAT:
+            data = {"version": PROFILE_FORMAT, "profiles": {}, "hosts": {}}
+        return data
+
+    def save(self, name, scheduler, args, host_only=False):
+        """Stores a profile (in this host's overlay when host_only). Returns an error string or None."""
+        data = self._read_raw()
+        entry = {"scheduler": scheduler, "args": list(args)}
+        if host_only:
+            data.setdefault("hosts", {}).setdefault(self.host, {})[name] = entry
+        else:
+            data.setdefault("profiles", {})[name] = entry
+        error = write_json_atomic(self.path, data, indent=2)
+        self.load()
+        return error
+
+    def delete(self, name):
+        """Removes a user profile and this host's overlay of it. Shipped defaults stay."""
+        data = self._read_raw()
+        data.get("profiles", {}).pop(name, None)
+        data.get("hosts", {}).get(self.host, {}).pop(name, None)
+        error = write_json_atomic(self.path, data, indent=2)
+        self.load()
+        return error
+
+
+# --- DIFF-BASED APPLY ---
+
+def load_applied(path=None):
+    """The last scheduler+args applied through a profile, or None."""
+    try:
+        with open(path or applied_path(), encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if _valid_profile(data) else None
+
+
+def record_applied(scheduler, args, path=None, enable_seq=None):
+    return write_json_atomic(path or applied_path(),
+                             {"scheduler": scheduler, "args": list(args), "enable_seq": enable_seq}, indent=2)
+
+
+def plan_apply(profile, running, applied, enable_seq=None):
+    """
+    'noop' when the profile is already running with the same args, 'start' when sched_ext is idle,
+    'switch' otherwise. Neither scxctl nor scx_loader reports the running args, so they come from
+    the applied record, which only counts while the kernel's enable_seq still matches it.
+    """
+    if running is None:
+        return "start"
+    if short_name(running) != profile["scheduler"]:
+        return "switch"
+    if (applied is not None and applied.get("scheduler") == profile["scheduler"]
+            and applied.get("args") == profile["args"] and applied.get("enable_seq") == enable_seq):
+        return "noop"
+    return "switch"
+
+
+def apply_profile(backend, profile, timeout=DEFAULT_TIMEOUT, cancel_event=None,
+                  applied_file=None, enable_seq_path=ENABLE_SEQ_PATH):
+    """
+    Applies a profile with the cheapest action that gets there.
+    The returned CommandResult carries the chosen verb ('noop', 'start' or 'switch') in result.action_verb.
+    The backend returns before the new scheduler attaches, so the applied record waits for enable_seq
+    to move on; if it never does, the record gets no enable_seq and the next apply will not be a noop.
+    """
+    status = backend.get_status(timeout, cancel_event)
+    enable_seq = read_enable_seq(enable_seq_path)
+    if status.ok:
+        verb = plan_apply(profile, status.scheduler, load_applied(applied_file), enable_seq)
+    else:
+        # Unknown state: same fallback as choose_action
+        verb = "switch"
+
+    if verb == "noop":
+        result = CommandResult([], returncode=0)
+    else:
+        call = backend.start if verb == "start" else backend.switch
+        result = call(profile["scheduler"], profile["args"], timeout, cancel_event)
+        if result.ok:
+            attached = wait_for_enable_seq(enable_seq, enable_seq_path, cancel_event=cancel_event)
+            record_applied(profile["scheduler"], profile["args"], applied_file, attached)
+    result.action_verb = verb
+    return result
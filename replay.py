@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# replay.py
+#
+# Record/replay of backend interactions, so the subprocess paths can be exercised without a
+# sched_ext kernel. GUI-free.
+#
+# Recording: set SCXCTL_RECORD=fixture.json and use the app (or the CLI) normally; every
+# list/get/start/switch/stop call is captured with its output, exit code and latency, and the
+# fixture is written when the backend is closed (i.e. when the app exits). Or run a
+# scripted session against the real loader:
+#
+#   python replay.py record --output fixtures/mine.json --sched bpfland
+#
+# Replaying: this file doubles as a fake scxctl. Point PATH (or ScxctlBackend's executable) at a
+# link named scxctl and tell it which fixture to serve:
+#
+#   SCXCTL_REPLAY_FIXTURE=fixtures/scxctl_basic.json SCX_BACKEND=scxctl scxctl_configurator.py
+#
+# Responses are matched by command line. start/switch/stop are served in recorded order (the last
+# one repeats once they run out); get/list answer as they did at the same point of the recording.
+# The replay position lives in SCXCTL_REPLAY_STATE (default: <fixture>.state), so successive
+# processes continue one session; delete it to rewind.
+#
+# Injection, on top of whatever the fixture holds:
+#   SCXCTL_REPLAY_LATENCY_SCALE=4        multiply recorded latencies
+#   SCXCTL_REPLAY_EXTRA_LATENCY=0.5      add seconds to every call
+#   SCXCTL_REPLAY_FAIL=switch,start      make these verbs fail (exit 1, message on stderr)
+
+import json
+import os
+import sys
+import threading
+import time
+
+FIXTURE_FORMAT = 1
+
+# Backend method -> scxctl verb
+VERBS = {
+    "list_schedulers": "list",
+    "get_status": "get",
+    "start": "start",
+    "switch": "switch",
+    "stop": "stop",
+}
+
+# Commands that do not change the scheduler state, so replaying them does not move the session on
+# (--version is what the scheduler cache runs to fingerprint the binary)
+READ_ONLY_COMMANDS = (["get"], ["list"], ["--version"])
+
+INJECTED_FAILURE = "Error: injected failure (SCXCTL_REPLAY_FAIL)"
+
+
+def command_key(argv):
+    """Fixture key of an scxctl command line (without the executable)."""
+    return " ".join(argv)
+
+
+def load_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("version") != FIXTURE_FORMAT:
+        raise ValueError(f"{path}: unsupported fixture format (expected version {FIXTURE_FORMAT})")
+    return data
+
+
+# --- RECORDING ---
+
+class RecordingBackend:
+    """
+    Wraps a backend and keeps every call in memory; close() writes them to the fixture file.
+    Calls may come from several threads at once (command runner, status monitor).
+    """
+
+    def __init__(self, backend, path):
+        from scx_core import scxctl_command
+
+        self.backend = backend
+        self.path = path
+        self.name = backend.name
+        self.interactions = []
+        self.lock = threading.Lock()
+        self.scxctl_command = scxctl_command
+        for method_name, verb in VERBS.items():
+            setattr(self, method_name, self._recorded(verb, getattr(backend, method_name)))
+
+    def _recorded(self, verb, method):
+        def call(*args, **kwargs):
+            scheduler, sched_args = (args[0], args[1]) if verb in ("start", "switch") else (None, ())
+            start = time.monotonic()
+            result = method(*args, **kwargs)
+            interaction = {
+                "argv": self.scxctl_command(verb, scheduler, sched_args)[1:],
+                "returncode": result.returncode if not (result.timed_out or result.error) else None,
+                "stdout": result.stdout,
+                "stderr": result.stderr if not result.error else result.error,
+                "timed_out": result.timed_out,
+                "latency_s": round(time.monotonic() - start, 6),
+            }
+            with self.lock:
+                self.interactions.append(interaction)
+            return result
+
+        return call
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+    def save(self):
+        """Writes the interactions recorded so far. Returns None, or the error as a string."""
+        from scheduler_cache import write_json_atomic
+
+        with self.lock:
+            interactions = list(self.interactions)
+        data = {"version": FIXTURE_FORMAT, "source": f"recorded from {self.name} on {os.uname().nodename}",
+                "interactions": interactions}
+        return write_json_atomic(self.path, data, indent=2)
+
+    def close(self):
+        try:
+            self.backend.close()
+        finally:
+            self.save()
+
+
+def record_session(backend, scheduler=None, args=()):
+    """A scripted capture: list and get, then (with a scheduler) start/switch, get, stop, get."""
+    from scx_core import apply_scheduler
+
+    backend.list_schedulers()
+    backend.get_status()
+    if scheduler:
+        apply_scheduler(backend, scheduler, list(args))
+        backend.get_status()
+        backend.stop()
+        backend.get_status()
+
+
+# --- REPLAY (fake scxctl) ---
+
+class Replayer:
+    """
+    Serves fixture responses by command line, remembering its position in a state file.
+    start/switch/stop recordings are served in order. Reads (get, list) are served from the
+    point of the recording the session has reached, i.e. after as many state changes as have been
+    replayed, so any number of status polls sees the same answer.
+    """
+
+    # Commands kept in the state file's call log, for checking what a session ran
+    MAX_LOGGED_CALLS = 1000
+
+    def __init__(self, fixture, state_path):
+        self.responses = {}
+        epoch = 0
+        for interaction in fixture.get("interactions", []):
+            self.responses.setdefault(command_key(interaction["argv"]), []).append((epoch, interaction))
+            if interaction["argv"][:1] not in READ_ONLY_COMMANDS:
+                epoch += 1
+        self.state_path = state_path
+
+    def _advance(self, key, mutating):
+        """Returns (position of key, state changes replayed before this call) and records the call."""
+        import fcntl
+
+        with open(self.state_path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                state = json.loads(f.read() or "{}")
+            except ValueError:
+                state = {}
+            positions = state.setdefault("positions", {})
+            index = positions.get(key, 0)
+            positions[key] = index + 1
+            epoch = state.get("epoch", 0)
+            if mutating:
+                state["epoch"] = epoch + 1
+            state["calls"] = (state.get("calls", []) + [key])[-self.MAX_LOGGED_CALLS:]
+            f.seek(0)
+            f.truncate()
+            json.dump(state, f)
+        return index, epoch
+
+    def respond(self, argv):
+        """Returns the interaction to serve for argv, or None when the fixture never saw it."""
+        key = command_key(argv)
+        mutating = argv[:1] not in READ_ONLY_COMMANDS
+        recorded = self.responses.get(key)
+        if not recorded and argv[:1] in (["start"], ["switch"]):
+            # Not recorded with these args: use the same verb and scheduler, else the same verb
+            for prefix in (command_key(argv[:3]), argv[0]):
+                recorded = next((v for k, v in self.responses.items() if k == prefix or k.startswith(prefix + " ")),
+                                None)
+                if recorded:
+                    break
+        index, epoch = self._advance(key, mutating)
+        if not recorded:
+            return None
+        if mutating:
+            return recorded[min(index, len(recorded) - 1)][1]
+        reached = [interaction for recorded_epoch, interaction in recorded if recorded_epoch <= epoch]
+        return reached[-1] if reached else recorded[0][1]
+
+
+def replay_main(argv):
+    fixture_path = os.environ.get("SCXCTL_REPLAY_FIXTURE")
+    if not fixture_path:
+        print("Error: SCXCTL_REPLAY_FIXTURE is not set", file=sys.stderr)
+        return 2
+    try:
+        fixture = load_fixture(fixture_path)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    state_path = os.environ.get("SCXCTL_REPLAY_STATE") or f"{fixture_path}.state"
+    interaction = Replayer(fixture, state_path).respond(argv)
+
+    scale = float(os.environ.get("SCXCTL_REPLAY_LATENCY_SCALE", "1"))
+    extra = float(os.environ.get("SCXCTL_REPLAY_EXTRA_LATENCY", "0"))
+    failing = set(filter(None, os.environ.get("SCXCTL_REPLAY_FAIL", "").split(",")))
+
+    if interaction is None:
+        time.sleep(extra)
+        print(f"Error: no recorded response for 'scxctl {command_key(argv)}'", file=sys.stderr)
+        return 1
+    time.sleep(interaction.get("latency_s", 0) * scale + extra)
+    if argv and argv[0] in failing:
+        print(INJECTED_FAILURE, file=sys.stderr)
+        return 1
+    if interaction.get("timed_out"):
+        # Hang until the caller's timeout kills us
+        time.sleep(3600)
+    sys.stdout.write(interaction.get("stdout", ""))
+    sys.stderr.write(interaction.get("stderr", ""))
+    returncode = interaction.get("returncode")
+    return 1 if returncode is None else returncode
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] != ["record"]:
+        return replay_main(argv)
+
+    import argparse
+
+    from scx_backend import create_backend
+
+    parser = argparse.ArgumentParser(prog="replay.py record", description="Capture a scripted scxctl session.")
+    parser.add_argument("--output", required=True, help="fixture file to write")
+    parser.add_argument("--sched", help="also start/switch to, then stop, this scheduler")
+    parser.add_argument("--args", default="", help="arguments for --sched")
+    options = parser.parse_args(argv[1:])
+
+    backend = RecordingBackend(create_backend(), options.output)
+    try:
+        record_session(backend, options.sched, options.args.split())
+    finally:
+        backend.close()
+    print(f"{len(backend.interactions)} interactions written to {options.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+# sched_benchmark.py
+#
+# Applies scheduler modes from SCHEDULER_OPTIONS one after another through the normal
+# start/switch path and runs local synthetic workloads under each. GUI-free.
+#
+#   python sched_benchmark.py --sched flash bpfland --duration 3
+#   SCXCTL_REPLAY_FIXTURE=fixtures/scxctl_basic.json python sched_benchmark.py --scxctl ./replay.py --duration 0.2
+#       (orchestration only, no sched_ext: replay.py serves a recorded scxctl session)
+#
+# Whatever was running before is restored afterwards. Each run is saved to its own timestamped
+# file under results_dir(); the GUI shows the newest.
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from array import array
+
+from scheduler_cache import cache_dir, write_json_atomic
+from scheduler_data import SCHEDULER_OPTIONS
+from scx_core import apply_scheduler, mode_flags
+
+RESULTS_FORMAT = 1
+
+# Workload defaults
+DEFAULT_DURATION = 3.0
+DEFAULT_SETTLE = 1.0
+WAKEUP_INTERVAL = 0.001
+CPU_CHUNK = 10000
+
+# Label used for the run without any sched_ext scheduler
+BASELINE = "(kernel default)"
+
+
+def results_dir():
+    return os.path.join(cache_dir(), "benchmarks")
+
+
+def results_path(created=None):
+    """bench_results-<UTC time>.json for a run started at created (default: now); names sort by age."""
+    created = time.time() if created is None else created
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime(created))
+    return os.path.join(results_dir(), f"bench_results-{stamp}-{int(created * 1000) % 1000:03d}.json")
+
+
+def latest_results_path():
+    """The newest saved results file, or None."""
+    try:
+        names = [name for name in os.listdir(results_dir())
+                 if name.startswith("bench_results-") and name.endswith(".json")]
+    except OSError:
+        return None
+    return os.path.join(results_dir(), max(names)) if names else None
+
+
+def percentile(sorted_samples, fraction):
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_samples:
+        return None
+    index = min(len(sorted_samples) - 1, max(0, math.ceil(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize_latency(samples):
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "p50_us": percentile(ordered, 0.50),
+        "p99_us": percentile(ordered, 0.99),
+        "p999_us": percentile(ordered, 0.999),
+    }
+
+
+# --- WORKLOADS (each runs in its own processes) ---
+
+def wakeup_samples(duration):
+    """cyclictest-style probe: how late (us) does each 1 ms sleep wake up? Also used by transaction."""
+    samples = array('d')
+    end = time.perf_counter() + duration
+    while True:
+        target = time.perf_counter() + WAKEUP_INTERVAL
+        if target > end:
+            break
+        time.sleep(WAKEUP_INTERVAL)
+        samples.append((time.perf_counter() - target) * 1e6)
+    return samples
+
+
+def _cpu_worker(duration):
+    ops = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        for _ in range(CPU_CHUNK):
+            pass
+        ops += CPU_CHUNK
+    return ops
+
+
+def _pipe_echo(sock):
+    try:
+        while True:
+            data = sock.recv(1)
+            if not data:
+                break
+            sock.sendall(data)
+    finally:
+        sock.close()
+
+
+def wakeup_latency(duration, threads, pool):
+    samples = array('d')
+    for chunk in pool.map(wakeup_samples, [duration] * threads):
+        samples.extend(chunk)
+    return summarize_latency(samples)
+
+
+def cpu_throughput(duration, threads, pool):
+    total = sum(pool.map(_cpu_worker, [duration] * threads))
+    return {"ops_per_s": total / duration}
+
+
+def pipe_ping_pong(duration, context):
+    """Round trips of one byte between two processes over a socketpair."""
+    parent, child = socket.socketpair()
+    echo = context.Process(target=_pipe_echo, args=(child,), daemon=True)
+    echo.start()
+    child.close()
+
+    samples = array('d')
+    end = time.perf_counter() + duration
+    try:
+        while True:
+            start = time.perf_counter()
+            if start > end:
+                break
+            parent.sendall(b"x")
+            parent.recv(1)
+            samples.append((time.perf_counter() - start) * 1e6)
+    finally:
+        parent.close()
+        echo.join(timeout=2)
+
+    summary = summarize_latency(samples)
+    summary["ops_per_s"] = len(samples) / duration
+    return summary
+
+
+def run_workloads(duration, threads):
+    context = multiprocessing.get_context("fork")
+    with context.Pool(threads) as pool:
+        return {
+            "wakeup": wakeup_latency(duration, threads, pool),
+            "cpu": cpu_throughput(duration, threads, pool),
+            "pipe": pipe_ping_pong(duration, context),
+        }
+
+
+# --- ORCHESTRATION ---
+
+def build_plan(schedulers=None, modes=None):
+    """Returns (scheduler, mode) pairs to benchmark; mode None means the scheduler's defaults."""
+    plan = []
+    for scheduler in schedulers or SCHEDULER_OPTIONS:
+        scheduler_modes = list(SCHEDULER_OPTIONS.get(scheduler, {}).get("Modes", {}))
+        selected = [m for m in scheduler_modes if not modes or m in modes]
+        if not modes:
+            plan.append((scheduler, None))
+        plan.extend((scheduler, mode) for mode in selected)
+    return plan
+
+
+def run_benchmarks(backend, plan, duration=DEFAULT_DURATION, settle=DEFAULT_SETTLE, threads=None,
+                   baseline=False, workloads=run_workloads, progress=None):
+    """
+    Applies every (scheduler, mode) in plan and measures it, then puts back whatever was running
+    before, even when a workload fails or the run is interrupted.
+    workloads(duration, threads) is injectable so orchestration can run against a fake backend.
+    """
+    threads = threads or os.cpu_count() or 1
+    before = backend.get_status()
+    try:
+        return _run_plan(backend, plan, duration, settle, threads, baseline, workloads, progress)
+    finally:
+        restore_scheduler(backend, before, progress)
+
+
+def running_args(scheduler):
+    """
+    Arguments the running scheduler was started with, when a profile apply recorded them for the
+    instance that is still loaded; neither backend reports them. [] otherwise.
+    """
+    from profiles import load_applied
+    from status_monitor import read_enable_seq
+
+    applied = load_applied()
+    if applied and applied["scheduler"] == scheduler and applied.get("enable_seq") == read_enable_seq():
+        return applied["args"]
+    return []
+
+
+def restore_scheduler(backend, before, progress=None):
+    """Returns sched_ext to the state get_status() reported before the run. Returns the CommandResult, or None."""
+    if not before.ok:
+        # Nothing known to restore to; leave the last benchmarked scheduler running
+        if progress:
+            progress(f"not restoring: the scheduler state before the run is unknown ({before.error_text()})")
+        return None
+    if before.scheduler is None:
+        result = backend.stop()
+        label = "stopping sched_ext"
+    else:
+        result = apply_scheduler(backend, before.scheduler, running_args(before.scheduler))
+        label = f"restoring {before.scheduler}"
+    if progress:
+        progress(label if result.ok else f"{label} failed: {result.error_text()}")
+    return result
+
+
+def _run_plan(backend, plan, duration, settle, threads, baseline, workloads, progress):
+    results = []
+
+    if baseline:
+        stop = backend.stop()
+        # 'stop' exits non-zero when nothing was running, which is fine for a baseline
+        entry = {"scheduler": BASELINE, "mode": None, "args": [],
+                 "ok": stop.error is None and not (stop.timed_out or stop.cancelled)}
+        if entry["ok"]:
+            time.sleep(settle)
+            entry.update(workloads(duration, threads))
+        results.append(entry)
+
+    for scheduler, mode in plan:
+        args = mode_flags(scheduler, mode).split() if mode else []
+        if progress:
+            progress(f"benchmarking {scheduler} / {mode or 'Default'}")
+        result = apply_scheduler(backend, scheduler, args)
+        entry = {
+            "scheduler": scheduler,
+            "mode": mode,
+            "args": args,
+            "ok": result.ok,
+            "action": result.action_verb,
+            "apply_s": result.duration,
+        }
+        if result.ok:
+            time.sleep(settle)
+            entry.update(workloads(duration, threads))
+        else:
+            entry["error"] = result.error_text()
+        results.append(entry)
+    return results
+
+
+def save_results(results, path=None, duration=DEFAULT_DURATION):
+    created = time.time()
+    path = path or results_path(created)
+    data = {
+        "format": RESULTS_FORMAT,
+        "host": socket.gethostname(),
+        "created": int(created),
+        "duration_s": duration,
+        "results": results,
+    }
+    error = write_json_atomic(path, data)
+    if error:
+        raise OSError(error)
+    return path
+
+
+def load_results(path=None):
+    """Returns the saved results dict (the newest run unless path is given), or None when missing or unreadable."""
+    path = path or latest_results_path()
+    if path is None:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != RESULTS_FORMAT:
+        return None
+    return data
+
+
+def _format(value, spec=".0f"):
+    # Percentiles are None when a very short run collected no samples
+    return "-" if value is None else format(value, spec)
+
+
+def format_entry(entry):
+    """One console line per run."""
+    label = f"{entry['scheduler']:10s} {entry['mode'] or 'Default':22s}"
+    if not entry["ok"]:
+        return f"{label} FAILED: {entry.get('error')}"
+    wakeup, pipe, cpu = entry["wakeup"], entry["pipe"], entry["cpu"]
+    return (f"{label} wakeup p50/p99/p99.9 "
+            f"{_format(wakeup['p50_us'])}/{_format(wakeup['p99_us'])}/{_format(wakeup['p999_us'])} us  "
+            f"pipe p99 {_format(pipe['p99_us'])} us {_format(pipe['ops_per_s'])}/s  "
+            f"cpu {_format(cpu['ops_per_s'], '.3g')} ops/s")
+
+
+def main(argv=None):
+    from instrumentation import instrument
+    from scx_backend import ScxctlBackend, create_backend
+
+    parser = argparse.ArgumentParser(description="Benchmark scheduler modes with synthetic workloads.")
+    parser.add_argument("--sched", nargs="+", help="schedulers to benchmark (default: all known)")
+    parser.add_argument("--mode", nargs="+", help="only these mode names")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds per workload")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE, help="seconds to wait after applying")
+    parser.add_argument("--threads", type=int, help="worker processes per workload (default: CPU count)")
+    parser.add_argument("--baseline", action="store_true", help="also measure with no sched_ext scheduler")
+    parser.add_argument("--scxctl", help="use this scxctl executable (e.g. replay.py) instead of the default backend")
+    parser.add_argument("--output", help=f"results file (default: a new timestamped file in {results_dir()})")
+    options = parser.parse_args(argv)
+
+    backend = instrument(ScxctlBackend(options.scxctl) if options.scxctl else create_backend())
+    try:
+        results = run_benchmarks(
+            backend,
+            build_plan(options.sched, options.mode),
+            duration=options.duration,
+            settle=options.settle,
+            threads=options.threads,
+            baseline=options.baseline,
+            progress=lambda message: print(message, file=sys.stderr, flush=True),
+        )
+    finally:
+        backend.close()
+
+    path = save_results(results, options.output, options.duration)
+    for entry in results:
+        print(format_entry(entry))
+    print(f"results written to {path}")
+    return 0 if all(entry["ok"] for entry in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# scheduler_cache.py
+
+import json
+import os
+import shutil
+
+# Bump when the file layout changes; older files are ignored.
+CACHE_FORMAT = 2
+
+# Upper bounds so a corrupt or hostile cache file can never blow up startup.
+MAX_CACHE_BYTES = 16 * 1024
+MAX_SCHEDULERS = 128
+MAX_NAME_LENGTH = 64
+
+# Binaries whose upgrade can change the supported scheduler list.
+FINGERPRINT_BINARIES = ("scxctl", "scx_loader")
+VERSION_TIMEOUT = 2.0
+
+
+def cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "scxctl_configurator")
+
+
+def cache_path():
+    return os.path.join(cache_dir(), "schedulers.json")
+
+
+def write_json_atomic(path, data, indent=None):
+    """
+    Writes data as JSON to a private temporary file next to path, then renames it over path, so
+    readers never see a partial file and concurrent writers never share a temporary file.
+    Compact unless indent is given. Returns None, or the error as a string.
+    """
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=indent, separators=None if indent else (",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    except (OSError, TypeError, ValueError) as e:
+        return str(e)
+    return None
+
+
+def binary_version(path):
+    """First line of `<path> --version`, e.g. 'scx_loader 1.0.14', or None."""
+    import subprocess
+
+    try:
+        result = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=VERSION_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    lines = result.stdout.strip().splitlines()
+    return lines[0][:MAX_NAME_LENGTH] if result.returncode == 0 and lines else None
+
+
+def binary_fingerprint(known=None, run_versions=True):
+    """
+    Identifies the installed scxctl/scx_loader by path, size, mtime and reported version.
+    An upgrade of either binary changes the fingerprint and so invalidates the cache.
+    Asking for a version costs a fork, so it is taken from known (a stored fingerprint) while
+    path, size and mtime still match, and only run for a changed binary when run_versions is set.
+    """
+    known = known if isinstance(known, dict) else {}
+    fingerprint = {}
+    for name in FINGERPRINT_BINARIES:
+        path = shutil.which(name) or os.path.join("/usr/bin", name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            fingerprint[name] = None
+            continue
+        entry = [path, st.st_size, int(st.st_mtime)]
+        previous = known.get(name)
+        if isinstance(previous, list) and len(previous) == 4 and previous[:3] == entry:
+            entry.append(previous[3])
+        else:
+            entry.append(binary_version(path) if run_versions else None)
+        fingerprint[name] = entry
+    return fingerprint
+
+
+def _valid_names(names):
+    return (
+        isinstance(names, list)
+        and 0 < len(names) <= MAX_SCHEDULERS
+        and all(isinstance(n, str) and 0 < len(n) <= MAX_NAME_LENGTH for n in names)
+    )
+
+
+def _read_cache(path):
+    """The cache file's contents when it is a bounded, well-formed file of this format; else None."""
+    try:
+        if os.path.getsize(path) > MAX_CACHE_BYTES:
+            return None
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+        return None
+    return data
+
+
+def load_cached_schedulers(path=None):
+    """Returns the cached scheduler list, or None if it is missing, stale or malformed. Never forks."""
+    data = _read_cache(path or cache_path())
+    if data is None:
+        return None
+    stored = data.get("fingerprint")
+    if stored != binary_fingerprint(stored, run_versions=False):
+        return None
+    names = data.get("schedulers")
+    return names if _valid_names(names) else None
+
+
+def save_schedulers(names, path=None):
+    """
+    Writes the scheduler list atomically. Lists that exceed the bounds are not cached.
+    Versions are only asked for again when a binary changed since the previous save.
+    """
+    if not _valid_names(names):
+        return False
+    path = path or cache_path()
+    previous = _read_cache(path) or {}
+    data = {
+        "format": CACHE_FORMAT,
+        "fingerprint": binary_fingerprint(previous.get("fingerprint")),
+        "schedulers": names,
+    }
+    return write_json_atomic(path, data) is None
+
+
+def invalidate_cache(path=None):
+    try:
+        os.remove(path or cache_path())
+    except FileNotFoundError:
+        pass
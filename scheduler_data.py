@@ -16,7 +16,16 @@ SCHEDULER_OPTIONS = {
                 "Description": "Prioritize tasks with strict affinity. This option can increase throughput at the cost of latency and it is more suitable for server workloads."
             },
         },
-        "Flags": {},
+        "Flags": {
+            "-s": {"Long": "--slice-us", "Type": "int", "Min": 0, "Description": "Maximum time slice (us)."},
+            "-S": {"Type": "int", "Min": 0, "Description": "Minimum time slice (us)."},
+            "-l": {"Type": "int", "Description": "Time slice lag (us)."},
+            "-m": {"Long": "--primary-domain", "Type": "domain", "Description": "Primary scheduling domain."},
+            "-p": {"Type": "bool", "Description": "Prioritize tasks with strict affinity."},
+            "-k": {"Type": "bool", "Description": "Prioritize per-CPU kthreads."},
+            "-w": {"Type": "bool", "Description": "Disable synchronous wakeup optimizations."},
+            "-v": {"Long": "--verbose", "Type": "bool", "Description": "Verbose output."},
+        },
     },
     "flash": {
         "Modes": {
@@ -37,7 +46,18 @@ SCHEDULER_OPTIONS = {
                 "Description": "Tuned for server workloads. Trades responsiveness for throughput."
             },
         },
-        "Flags": {},
+        "Flags": {
+            "-s": {"Long": "--slice-us", "Type": "int", "Min": 0, "Description": "Maximum time slice (us)."},
+            "-S": {"Type": "int", "Min": 0, "Description": "Minimum time slice (us)."},
+            "-m": {"Long": "--primary-domain", "Type": "domain", "Description": "Primary scheduling domain."},
+            "-w": {"Type": "bool", "Description": "Synchronous wakeup optimizations."},
+            "-C": {"Type": "int", "Min": 0, "Description": "CPU capacity/frequency threshold."},
+            "-I": {"Type": "int", "Min": -1, "Description": "Idle resume latency (us), -1 to disable."},
+            "-t": {"Type": "int", "Min": 0, "Description": "Forced idle cycle period (us)."},
+            "-D": {"Type": "bool", "Description": "Server tuning: direct dispatch."},
+            "-L": {"Type": "bool", "Description": "Server tuning: local dispatch."},
+            "-v": {"Long": "--verbose", "Type": "bool", "Description": "Verbose output."},
+        },
     },
     "cosmos": {
         "Modes": {
@@ -62,7 +82,16 @@ SCHEDULER_OPTIONS = {
                 "Description": "Enable address space affinity to improve locality and performance in certain cache-sensitive workloads. Polling increased to 20ms."
             },
         },
-        "Flags": {},
+        "Flags": {
+            "-s": {"Long": "--slice-us", "Type": "int", "Min": 0, "Description": "Time slice / polling period (us)."},
+            "-c": {"Type": "int", "Min": 0, "Description": "CPU busy threshold; 0 disables CPU load tracking."},
+            "-p": {"Type": "int", "Min": 0, "Description": "CPU load polling period; 0 always enforces deadline scheduling."},
+            "-m": {"Long": "--primary-domain", "Type": "domain", "Description": "Primary scheduling domain."},
+            "-d": {"Type": "bool", "Description": "Disable deferred wakeups."},
+            "-w": {"Type": "bool", "Description": "Synchronous wakeup optimizations."},
+            "-a": {"Type": "bool", "Description": "Address space affinity."},
+            "-v": {"Long": "--verbose", "Type": "bool", "Description": "Verbose output."},
+        },
     },
     "lavd": {
         "Modes": {
@@ -75,7 +104,17 @@ SCHEDULER_OPTIONS = {
                 "Description": "Minimizes power consumption while maintaining reasonable performance. Prioritizes efficient cores and threads over physical cores."
             },
         },
-        "Flags": {},
+        "Flags": {
+            "--autopilot": {"Type": "bool", "Excludes": ["--autopower", "--performance", "--powersave"],
+                            "Description": "Pick the power mode automatically from CPU load."},
+            "--autopower": {"Type": "bool", "Excludes": ["--autopilot", "--performance", "--powersave"],
+                            "Description": "Follow the system energy profile."},
+            "--performance": {"Type": "bool", "Excludes": ["--autopilot", "--autopower", "--powersave"],
+                              "Description": "Use all cores, prioritizing physical cores."},
+            "--powersave": {"Type": "bool", "Excludes": ["--autopilot", "--autopower", "--performance"],
+                            "Description": "Prioritize efficient cores and threads."},
+            "-v": {"Long": "--verbose", "Type": "bool", "Description": "Verbose output."},
+        },
     },
     "p2dq": {
         "Modes": {
@@ -96,7 +135,15 @@ SCHEDULER_OPTIONS = {
                 "Description": "Improves server workloads by allowing tasks to run beyond their slice if the CPU is idle."
             },
         },
-        "Flags": {},
+        "Flags": {
+            "--task-slice": {"Type": "bool-value", "Description": "Stable per-task slice."},
+            "--sched-mode": {"Type": "choice", "Choices": ["default", "performance", "efficiency"],
+                             "Description": "Core selection bias."},
+            "--keep-running": {"Type": "bool", "Description": "Let tasks run past their slice when the CPU is idle."},
+            "-f": {"Type": "bool", "Description": "Interactive task sticking."},
+            "-y": {"Type": "bool", "Description": "Keep interactive tasks on their assigned CPU."},
+            "-v": {"Long": "--verbose", "Type": "bool", "Description": "Verbose output."},
+        },
     },
     "tickless": {
         "Modes": {
@@ -117,8 +164,14 @@ SCHEDULER_OPTIONS = {
                 "Description": "Reduced how often the scheduler checks for CPU contention to improve throughput at the cost of responsiveness."
             },
         },
-        "Flags": {},
+        "Flags": {
+            "-f": {"Type": "int", "Min": 1, "Description": "CPU contention check frequency (Hz)."},
+            "-s": {"Long": "--slice-us", "Type": "int", "Min": 0, "Description": "Time slice (us)."},
+            "-p": {"Type": "bool", "Description": "Aggressively keep tasks on the same CPU."},
+            "-v": {"Long": "--verbose", "Type": "bool", "Description": "Verbose output."},
+        },
     },
+    # Flags: typed schema per flag, see flag_schema.FLAG_TYPES. Keys are the spelling used in Modes.
     "rustland": {"Modes": {}, "Flags": {}},
     "rusty": {"Modes": {}, "Flags": {}},
     # Ensure all possible schedulers found by scxctl list are defined here
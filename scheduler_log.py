@@ -0,0 +1,279 @@
+# scheduler_log.py
+#
+# Follows scheduler output for the log pane: the scx_loader journal (schedulers started by the
+# loader log there) or any local command's stdout, e.g. a scheduler's own `--monitor` stats stream.
+# Lines land in a fixed-capacity ring buffer, so following a scheduler that prints stats every
+# second for days never grows memory. GUI-free.
+#
+#   python scheduler_log.py --filter dispatch              # follow the loader journal
+#   python scheduler_log.py -- scx_bpfland --monitor 1     # follow a command's output
+
+import os
+import threading
+from array import array
+
+LOADER_UNIT = "scx_loader.service"
+
+# Lines kept per buffer; the oldest are dropped first
+DEFAULT_CAPACITY = 10000
+
+# Longer lines are cut here (in characters), so capacity alone bounds memory
+MAX_LINE_LENGTH = 1000
+
+# Journal lines shown from before the pane was opened
+JOURNAL_BACKLOG = 200
+
+READ_CHUNK = 64 * 1024
+
+# How often the reader thread checks for stop() while its source is quiet
+POLL_INTERVAL = 0.5
+
+
+def journal_command(unit=LOADER_UNIT, backlog=JOURNAL_BACKLOG):
+    return ["journalctl", "--follow", "--no-pager", "--output=short-iso", f"--lines={backlog}", f"--unit={unit}"]
+
+
+def monitor_command(scheduler, interval=1):
+    """The scheduler's stats stream, read from the running instance (scx schedulers' --monitor)."""
+    return [f"scx_{scheduler}", "--monitor", str(interval)]
+
+
+class LogBuffer:
+    """
+    Ring buffer of text lines, addressed by sequence number (the n-th line ever appended), plus
+    an index of the sequence numbers matching the current filter.
+
+    The index is maintained incrementally: appends test only the new line, evictions drop from its
+    front, and narrowing the filter (typing more characters) rescans only the previous matches.
+    Readers call rows(), row() and counters() holding the buffer's lock; the reader thread appends.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.lines = [None] * capacity
+        self.first = 0
+        self.next = 0
+        self.lock = threading.Lock()
+        self.filter_text = ""
+        self._needle = ""
+        # Matching sequence numbers, itself a ring: there are never more matches than lines
+        self._matches = array('q', bytes(8 * capacity))
+        self._match_head = 0
+        self._match_count = 0
+        # Running totals of matches under the current filter, for views that sync incrementally
+        self.matched_total = 0
+        self.evicted_total = 0
+        self.filter_generation = 0
+
+    def _add_match(self, seq):
+        self._matches[(self._match_head + self._match_count) % self.capacity] = seq
+        self._match_count += 1
+        self.matched_total += 1
+
+    def _append(self, line):
+        if len(line) > MAX_LINE_LENGTH:
+            line = line[:MAX_LINE_LENGTH - 1] + "…"
+        if self.next - self.first == self.capacity:
+            # Evict the oldest line, and its index entry when it matched
+            if self._match_count and self._matches[self._match_head] == self.first:
+                self._match_head = (self._match_head + 1) % self.capacity
+                self._match_count -= 1
+                self.evicted_total += 1
+            self.first += 1
+        self.lines[self.next % self.capacity] = line
+        if self._needle and self._needle in line.lower():
+            self._add_match(self.next)
+        self.next += 1
+
+    def append(self, line):
+        with self.lock:
+            self._append(line)
+
+    def extend(self, lines):
+        """Appends a batch under one lock acquisition."""
+        with self.lock:
+            for line in lines:
+                self._append(line)
+
+    def clear(self):
+        with self.lock:
+            self.lines = [None] * self.capacity
+            self.first = self.next
+            self._match_head = self._match_count = 0
+            self.matched_total = self.evicted_total = 0
+            self.filter_generation += 1
+
+    def set_filter(self, text):
+        """Case-insensitive substring filter; an empty text shows every line."""
+        needle = text.strip().lower()
+        with self.lock:
+            if needle == self._needle:
+                return
+            if not needle:
+                candidates = None
+            elif self._needle and self._needle in needle:
+                # Narrowing: only lines that matched before can still match
+                candidates = [self._matches[(self._match_head + i) % self.capacity] for i in range(self._match_count)]
+            else:
+                candidates = range(self.first, self.next)
+            self.filter_text = text
+            self._needle = needle
+            self._match_head = self._match_count = 0
+            self.matched_total = self.evicted_total = 0
+            self.filter_generation += 1
+            if candidates is None:
+                return
+            lines, capacity = self.lines, self.capacity
+            for seq in candidates:
+                if needle in lines[seq % capacity].lower():
+                    self._add_match(seq)
+
+    def rows(self):
+        """Number of lines passing the filter."""
+        return self._match_count if self._needle else self.next - self.first
+
+    def row(self, index):
+        """Text of the index-th line passing the filter, or None when out of range."""
+        if index < 0 or index >= self.rows():
+            return None
+        if self._needle:
+            seq = self._matches[(self._match_head + index) % self.capacity]
+        else:
+            seq = self.first + index
+        return self.lines[seq % self.capacity]
+
+    def counters(self):
+        """
+        (filter generation, rows added, rows evicted) since the filter was last set; rows() equals
+        added - evicted. Unfiltered rows map straight onto sequence numbers.
+        """
+        if self._needle:
+            return self.filter_generation, self.matched_total, self.evicted_total
+        return self.filter_generation, self.next, self.first
+
+    def __len__(self):
+        return self.next - self.first
+
+
+class LogFollower:
+    """
+    Runs a command on a background thread and appends its output (stdout and stderr) to a
+    LogBuffer, line by line. The pipe is read non-blocking through a selector, so stop()
+    takes effect within POLL_INTERVAL even when the source is silent.
+    """
+
+    def __init__(self, command, buffer):
+        self.command = list(command)
+        self.buffer = buffer
+        self.proc = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scx-log-follower", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        proc = self.proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self):
+        import selectors
+        import subprocess
+
+        try:
+            self.proc = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+            )
+        except FileNotFoundError:
+            self.buffer.append(f"[{self.command[0]} command not found.]")
+            return
+        except OSError as e:
+            self.buffer.append(f"[Could not run {self.command[0]}: {e}]")
+            return
+
+        fd = self.proc.stdout.fileno()
+        os.set_blocking(fd, False)
+        partial = b""
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while not self._stop.is_set():
+                if not selector.select(POLL_INTERVAL):
+                    continue
+                try:
+                    chunk = os.read(fd, READ_CHUNK)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                *complete, partial = (partial + chunk).split(b"\n")
+                # An endless line without a newline is cut rather than accumulated
+                if len(partial) > MAX_LINE_LENGTH * 4:
+                    complete.append(partial)
+                    partial = b""
+                if complete:
+                    self.buffer.extend(line.decode("utf-8", "replace").rstrip("\r") for line in complete)
+        if partial:
+            self.buffer.append(partial.decode("utf-8", "replace"))
+
+        self.proc.stdout.close()
+        if self.proc.poll() is None:
+            self.proc.terminate()
+        try:
+            returncode = self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            returncode = self.proc.wait()
+        if not self._stop.is_set():
+            self.buffer.append(f"[{self.command[0]} exited with code {returncode}.]")
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    import time
+
+    parser = argparse.ArgumentParser(description="Follow scheduler output through the log pane's buffer.")
+    parser.add_argument("--unit", default=LOADER_UNIT, help="systemd unit to follow (default: %(default)s)")
+    parser.add_argument("--filter", default="", help="only print lines containing this text")
+    parser.add_argument("command", nargs="*", help="follow this command's output instead of the journal")
+    options = parser.parse_args()
+
+    log = LogBuffer()
+    log.set_filter(options.filter)
+    follower = LogFollower(options.command or journal_command(options.unit), log)
+    follower.start()
+    printed = 0
+    try:
+        while True:
+            alive = follower.running
+            with log.lock:
+                _generation, added, evicted = log.counters()
+                for index in range(max(printed, evicted) - evicted, added - evicted):
+                    print(log.row(index))
+            printed = added
+            sys.stdout.flush()
+            if not alive:
+                break
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        follower.stop()
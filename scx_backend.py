@@ -0,0 +1,231 @@
+# scx_backend.py
+
+import os
+import time
+
+from scx_core import scxctl_command
+from scx_process import DEFAULT_TIMEOUT, CommandResult, run_command
+
+# jeepney is optional (scxctl is used instead) and is only imported once the
+# D-Bus backend connects, keeping it off the startup path.
+
+# What 'scxctl get' prints when sched_ext is idle.
+NO_SCHEDULER_TEXT = "no scx scheduler running"
+
+# scx_loader D-Bus service
+LOADER_BUS_NAME = "org.scx.Loader"
+LOADER_OBJECT_PATH = "/org/scx/Loader"
+LOADER_INTERFACE = "org.scx.Loader"
+
+# scx_loader's SchedMode enum, in wire order
+LOADER_MODES = ["Auto", "Gaming", "PowerSave", "LowLatency", "Server"]
+
+
+def extract_schedulers(output_string):
+    """Parses the scheduler names out of 'scxctl list' output."""
+    import re
+
+    match = re.search(r'supported schedulers: \[(.*?)\]', output_string, re.DOTALL)
+    if match:
+        list_content = match.group(1)
+        schedulers = re.findall(r'"(.*?)"', list_content)
+        return schedulers
+    return []
+
+
+def short_name(scheduler):
+    """'scx_bpfland' -> 'bpfland', the form scxctl and SCHEDULER_OPTIONS use."""
+    return scheduler[4:] if scheduler.startswith("scx_") else scheduler
+
+
+def scheduler_name(description):
+    """'running bpfland in auto mode' (as printed by scxctl get) -> 'bpfland'; plain names pass through."""
+    import re
+
+    match = re.match(r"running (\S+)", description, re.IGNORECASE)
+    return short_name(match.group(1).lower()) if match else description
+
+
+def parse_status(result):
+    """Sets result.scheduler from the output of a 'scxctl get' CommandResult (None when idle) and returns it."""
+    output = result.stdout.strip()
+    if result.ok and output and output.lower() != NO_SCHEDULER_TEXT:
+        result.scheduler = scheduler_name(output)
+    return result
+
+
+class ScxctlBackend:
+    """Talks to scx_loader by forking the scxctl client for each call."""
+
+    name = "scxctl"
+
+    def __init__(self, executable="scxctl"):
+        self.executable = executable
+
+    def _run(self, verb, timeout, cancel_event, scheduler=None, args=()):
+        return run_command(scxctl_command(verb, scheduler, args, self.executable), timeout, cancel_event)
+
+    def get_status(self, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        """
+        Returns a CommandResult whose stdout mirrors 'scxctl get'.
+        result.scheduler is the running scheduler's short name, or None when idle.
+        """
+        return parse_status(self._run('get', timeout, cancel_event))
+
+    def list_schedulers(self, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        """Returns a CommandResult with result.schedulers set to the supported names."""
+        result = self._run('list', timeout, cancel_event)
+        result.schedulers = extract_schedulers(result.stdout) if result.ok else []
+        return result
+
+    def start(self, scheduler, args, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        return self._run('start', timeout, cancel_event, scheduler, args)
+
+    def switch(self, scheduler, args, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        return self._run('switch', timeout, cancel_event, scheduler, args)
+
+    def stop(self, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        return self._run('stop', timeout, cancel_event)
+
+    def close(self):
+        pass
+
+
+class LoaderBackend:
+    """
+    Talks to the scx_loader D-Bus service directly over one connection kept open for the life of the app.
+    Set SCX_LOADER_BUS=SESSION to point it at a stand-in service on the session bus.
+    """
+
+    name = "dbus"
+
+    def __init__(self, router, connection):
+        from jeepney import DBusAddress, Properties
+
+        self.router = router
+        self.connection = connection
+        self.address = DBusAddress(LOADER_OBJECT_PATH, bus_name=LOADER_BUS_NAME, interface=LOADER_INTERFACE)
+        self.properties = Properties(self.address)
+
+    @classmethod
+    def connect(cls, bus=None, timeout=2.0):
+        """Opens the bus connection and checks that scx_loader answers. Raises on failure."""
+        from jeepney.io.threading import DBusRouter, open_dbus_connection
+
+        bus = bus or os.environ.get("SCX_LOADER_BUS", "SYSTEM")
+        connection = open_dbus_connection(bus=bus)
+        backend = cls(DBusRouter(connection), connection)
+        try:
+            backend._get_property("SupportedSchedulers", timeout)
+        except Exception:
+            backend.close()
+            raise
+        return backend
+
+    def _call(self, method, signature=None, body=(), timeout=DEFAULT_TIMEOUT):
+        from jeepney import new_method_call
+        from jeepney.wrappers import unwrap_msg
+
+        message = new_method_call(self.address, method, signature, body)
+        return unwrap_msg(self.router.send_and_get_reply(message, timeout=timeout))
+
+    def _get_property(self, name, timeout=DEFAULT_TIMEOUT):
+        from jeepney.wrappers import unwrap_msg
+
+        reply = self.router.send_and_get_reply(self.properties.get(name), timeout=timeout)
+        _signature, value = unwrap_msg(reply)[0]
+        return value
+
+    def _invoke(self, label, func, cancel_event):
+        """Runs one D-Bus round trip and packs the outcome into a CommandResult."""
+        from jeepney.wrappers import DBusErrorResponse
+
+        result = CommandResult([self.name, label])
+        if cancel_event is not None and cancel_event.is_set():
+            result.cancelled = True
+            return result
+        start = time.monotonic()
+        try:
+            output = func()
+            result.stdout = output if isinstance(output, str) else ""
+            result.returncode = 0
+        except TimeoutError:
+            result.timed_out = True
+        except DBusErrorResponse as e:
+            result.returncode = 1
+            result.stderr = str(e.data[0]) if e.data else str(e.name)
+        except Exception as e:
+            result.error = f"D-Bus call failed: {e}"
+        result.duration = time.monotonic() - start
+        return result
+
+    def get_status(self, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        state = {}
+
+        def fetch():
+            current = self._get_property("CurrentScheduler", timeout)
+            if not current or current == "unknown":
+                state["scheduler"] = None
+                return NO_SCHEDULER_TEXT
+            mode = self._get_property("SchedulerMode", timeout)
+            mode_name = LOADER_MODES[mode] if mode < len(LOADER_MODES) else str(mode)
+            state["scheduler"] = short_name(current)
+            return f"running {short_name(current)} in {mode_name} mode"
+
+        result = self._invoke("get", fetch, cancel_event)
+        result.scheduler = state.get("scheduler")
+        return result
+
+    def list_schedulers(self, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        names = []
+
+        def fetch():
+            names.extend(short_name(s) for s in self._get_property("SupportedSchedulers", timeout))
+            return 'supported schedulers: [' + ', '.join(f'"{n}"' for n in names) + ']'
+
+        result = self._invoke("list", fetch, cancel_event)
+        result.schedulers = names if result.ok else []
+        return result
+
+    def start(self, scheduler, args, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        return self._apply("Start", scheduler, args, timeout, cancel_event)
+
+    def switch(self, scheduler, args, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        return self._apply("Switch", scheduler, args, timeout, cancel_event)
+
+    def stop(self, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        return self._invoke("stop", lambda: self._call("StopScheduler", timeout=timeout), cancel_event)
+
+    def close(self):
+        try:
+            self.router.close()
+        finally:
+            self.connection.close()
+
+    def _apply(self, verb, scheduler, args, timeout, cancel_event):
+        loader_name = scheduler if scheduler.startswith("scx_") else f"scx_{scheduler}"
+        if args:
+            func = lambda: self._call(f"{verb}SchedulerWithArgs", "sas", (loader_name, list(args)), timeout)
+        else:
+            func = lambda: self._call(f"{verb}Scheduler", "su", (loader_name, 0), timeout)
+        return self._invoke(verb.lower(), func, cancel_event)
+
+
+def create_backend():
+    """
+    Returns the D-Bus backend when scx_loader is reachable, otherwise the scxctl fallback.
+    SCX_BACKEND=scxctl forces the fallback. SCXCTL_RECORD=<file> records every call (see replay.py).
+    """
+    backend = None
+    if os.environ.get("SCX_BACKEND") != "scxctl":
+        try:
+            backend = LoaderBackend.connect()
+        except Exception:
+            pass
+    if backend is None:
+        backend = ScxctlBackend()
+    if os.environ.get("SCXCTL_RECORD"):
+        from replay import RecordingBackend
+
+        backend = RecordingBackend(backend, os.environ["SCXCTL_RECORD"])
+    return backend
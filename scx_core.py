@@ -0,0 +1,62 @@
+# scx_core.py
+#
+# Scheduler selection logic shared by the GUI and the headless CLI. Must not import PySide6.
+
+from scheduler_data import SCHEDULER_OPTIONS
+from scx_process import DEFAULT_TIMEOUT
+
+
+def mode_names(scheduler):
+    return list(SCHEDULER_OPTIONS.get(scheduler, {}).get("Modes", {}))
+
+
+def mode_flags(scheduler, mode_name):
+    """Returns the flag string of a named mode, or "" when the scheduler/mode is unknown."""
+    mode_data = SCHEDULER_OPTIONS.get(scheduler, {}).get("Modes", {}).get(mode_name, {})
+    return mode_data.get("Flags", "")
+
+
+def resolve_args(scheduler, mode_name=None, custom_args=""):
+    """
+    Pulls arguments from EITHER the custom args (if filled) OR the selected mode (if custom args are empty).
+    Returns the scheduler's own arguments as a token list.
+    """
+    final_args = (custom_args or "").strip()
+
+    if not final_args and mode_name:
+        final_args = mode_flags(scheduler, mode_name)
+
+    return final_args.split()
+
+
+def scxctl_command(verb, scheduler=None, args=(), executable="scxctl"):
+    """
+    Builds the scxctl command line for an action.
+    scxctl expects the scheduler's own arguments as one comma separated --args value.
+    """
+    command = [executable, verb]
+    if scheduler:
+        command += ['--sched', scheduler]
+    if args:
+        command.append(f"--args={','.join(args)}")
+    return command
+
+
+def choose_action(status_result):
+    """START when sched_ext is idle, SWITCH otherwise (including when the status is unknown)."""
+    if status_result.ok and status_result.scheduler is None:
+        return "start"
+    return "switch"
+
+
+def apply_scheduler(backend, scheduler, args, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+    """
+    Starts or switches to scheduler with args, deciding the verb from the live status.
+    The returned CommandResult carries the chosen verb in result.action_verb.
+    """
+    status = backend.get_status(timeout, cancel_event)
+    verb = choose_action(status)
+    call = backend.start if verb == "start" else backend.switch
+    result = call(scheduler, args, timeout, cancel_event)
+    result.action_verb = verb
+    return result
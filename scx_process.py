@@ -0,0 +1,103 @@
+# scx_process.py
+
+import subprocess
+import time
+
+# Seconds to wait for a single scxctl call before killing it.
+DEFAULT_TIMEOUT = 30.0
+
+# How often a running command checks for cancellation.
+POLL_INTERVAL = 0.05
+
+
+class CommandResult:
+    """
+    Outcome of one scxctl invocation, safe to hand across threads.
+    Backends and callers fill in the parsed fields that apply:
+      scheduler    short name of the running scheduler from get_status (None when idle)
+      schedulers   supported names from list_schedulers
+      action_verb  'start', 'switch' or 'noop', for results of apply_scheduler / apply_profile
+      state        final SwitchTransaction state, for verified switches
+    """
+
+    def __init__(self, command, returncode=None, stdout="", stderr="", error=None,
+                 timed_out=False, cancelled=False, duration=0.0):
+        self.command = list(command)
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.error = error
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+        self.duration = duration
+        self.scheduler = None
+        self.schedulers = []
+        self.action_verb = None
+        self.state = None
+
+    @property
+    def ok(self):
+        return self.returncode == 0 and self.error is None and not (self.timed_out or self.cancelled)
+
+    def error_text(self):
+        """Returns a one-line reason for a failed command."""
+        if self.cancelled:
+            return "Command cancelled."
+        if self.timed_out:
+            return "Command timed out."
+        if self.error:
+            return self.error
+        return self.stderr.strip() or f"exit code {self.returncode}"
+
+    def __repr__(self):
+        return f"CommandResult({' '.join(self.command)!r}, returncode={self.returncode})"
+
+
+def run_command(command, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+    """
+    Runs a command to completion, killing it on timeout or when cancel_event is set.
+    Never raises; failures are reported through the returned CommandResult.
+    """
+    start = time.monotonic()
+    result = CommandResult(command)
+
+    if cancel_event is not None and cancel_event.is_set():
+        result.cancelled = True
+        return result
+
+    try:
+        proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+        )
+    except FileNotFoundError:
+        result.error = f"{command[0]} command not found."
+        return result
+    except OSError as e:
+        result.error = f"An unexpected error occurred: {e}"
+        return result
+
+    deadline = start + timeout if timeout else None
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=POLL_INTERVAL)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_event is not None and cancel_event.is_set():
+                result.cancelled = True
+            elif deadline is not None and time.monotonic() >= deadline:
+                result.timed_out = True
+            else:
+                continue
+            proc.kill()
+            stdout, stderr = proc.communicate()
+            break
+
+    result.returncode = proc.returncode
+    result.stdout = stdout or ""
+    result.stderr = stderr or ""
+    result.duration = time.monotonic() - start
+    return result
@@ -0,0 +1,174 @@
+# scxctl_cli.py
+#
+# Headless entry point: applies SCHEDULER_OPTIONS modes without a display. Never imports PySide6.
+#
+#   python scxctl_cli.py --sched flash --mode Server
+#   python scxctl_cli.py --sched lavd --args "--performance" --dry-run --json
+#   python scxctl_cli.py --sched bpfland --verify
+#   python scxctl_cli.py --profile flash/Server
+#   python scxctl_cli.py --stop
+
+import argparse
+import json
+import sys
+
+from flag_schema import validate_args
+from scheduler_data import SCHEDULER_OPTIONS
+from instrumentation import instrument
+from scx_backend import create_backend
+from scx_core import choose_action, mode_names, resolve_args, scxctl_command
+from scx_process import DEFAULT_TIMEOUT
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Start, switch or stop sched_ext schedulers without the GUI.")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--sched", help="scheduler to start or switch to, e.g. flash")
+    action.add_argument("--stop", action="store_true", help="stop the running scheduler")
+    action.add_argument("--status", action="store_true", help="print the running scheduler")
+    action.add_argument("--list", action="store_true", help="list the schedulers scx_loader supports")
+    action.add_argument("--profile", help="apply a saved profile; does nothing if it is already running")
+    action.add_argument("--list-profiles", action="store_true", help="list the available profiles")
+    parser.add_argument("--mode", help="named mode from scheduler_data, e.g. Server")
+    parser.add_argument("--args", default="", help="custom scheduler arguments; override --mode")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run without changing anything")
+    parser.add_argument("--json", action="store_true", help="print a JSON object instead of text")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="seconds per backend call")
+    parser.add_argument("--verify", action="store_true",
+                        help="health-check the new scheduler and roll back to the previous one if it fails")
+    return parser
+
+
+def emit(report, as_json):
+    if as_json:
+        print(json.dumps(report))
+    elif report.get("ok"):
+        print(report.get("message", ""))
+    else:
+        print(f"ERROR: {report.get('error')}", file=sys.stderr)
+
+
+def finish(report, result, message):
+    """Completes report from a CommandResult; message is only used when the call succeeded."""
+    error = None if result.ok else result.error_text()
+    return dict(report, ok=result.ok, error=error, message=message if result.ok else f"ERROR: {error}")
+
+
+def dry_run_failure(report, status):
+    """A dry run cannot say what would happen when the current state could not be read."""
+    error = f"Could not read the current scheduler state: {status.error_text()}"
+    return dict(report, ok=False, error=error, message=f"ERROR: {error}")
+
+
+def run(options, backend):
+    """Executes the parsed options against backend and returns the report dict."""
+    if options.list:
+        result = backend.list_schedulers(options.timeout)
+        return {"ok": result.ok, "schedulers": result.schedulers, "error": None if result.ok else result.error_text(),
+                "message": "\n".join(result.schedulers)}
+
+    if options.status:
+        result = backend.get_status(options.timeout)
+        return {"ok": result.ok, "scheduler": result.scheduler, "error": None if result.ok else result.error_text(),
+                "message": result.stdout.strip()}
+
+    if options.list_profiles or options.profile:
+        return run_profile(options, backend)
+
+    if options.stop:
+        report = {"action": "stop", "command": scxctl_command("stop"), "dry_run": options.dry_run}
+        if options.dry_run:
+            status = backend.get_status(options.timeout)
+            if not status.ok:
+                return dry_run_failure(report, status)
+            message = " ".join(report["command"]) if status.scheduler else "No scheduler is running; nothing to stop."
+            return dict(report, ok=True, error=None, running=status.scheduler, message=message)
+        return finish(report, backend.stop(options.timeout), "Scheduler successfully stopped.")
+
+    scheduler = options.sched
+    if options.mode and options.mode not in mode_names(scheduler):
+        available = ", ".join(mode_names(scheduler)) or "none"
+        return {"ok": False, "error": f"Unknown mode '{options.mode}' for {scheduler}. Available modes: {available}"}
+
+    args = resolve_args(scheduler, options.mode, options.args)
+    errors = validate_args(scheduler, args)
+    if errors:
+        return {"ok": False, "scheduler": scheduler, "args": args, "error": "Invalid arguments: " + "; ".join(errors)}
+
+    status = backend.get_status(options.timeout)
+    verb = choose_action(status)
+    report = {
+        "action": verb,
+        "scheduler": scheduler,
+        "mode": options.mode,
+        "args": args,
+        "command": scxctl_command(verb, scheduler, args),
+        "dry_run": options.dry_run,
+    }
+    if options.dry_run:
+        if not status.ok:
+            # choose_action falls back to 'switch'; a preview should say it does not know
+            return dry_run_failure(dict(report, action=None, command=None), status)
+        return dict(report, ok=True, error=None, running=status.scheduler, message=" ".join(report["command"]))
+
+    if options.verify:
+        from transaction import SwitchTransaction
+
+        result = SwitchTransaction(backend).run(scheduler, args, options.timeout)
+        report["action"] = result.action_verb
+        report["transaction"] = result.state
+    else:
+        call = backend.start if verb == "start" else backend.switch
+        result = call(scheduler, args, options.timeout)
+    return finish(report, result, f"Scheduler successfully {report['action']}ed to: {scheduler}")
+
+
+
+def run_profile(options, backend):
+    from profiles import ProfileStore, apply_profile
+
+    store = ProfileStore().load()
+    if options.list_profiles:
+        lines = [f"{name}: {store.get(name)['scheduler']} {' '.join(store.get(name)['args'])}".rstrip()
+                 for name in store.names()]
+        return {"ok": True, "profiles": store.index, "error": store.error, "message": "\n".join(lines)}
+
+    profile = store.get(options.profile)
+    if profile is None:
+        return {"ok": False, "error": f"Unknown profile '{options.profile}'." + (f" ({store.error})" if store.error else "")}
+    errors = validate_args(profile["scheduler"], profile["args"])
+    if errors:
+        return {"ok": False, "profile": options.profile, "error": "Invalid arguments: " + "; ".join(errors)}
+
+    report = {"profile": options.profile, "scheduler": profile["scheduler"], "args": profile["args"],
+              "dry_run": options.dry_run}
+    if options.dry_run:
+        return dict(report, ok=True, error=None, message=f"{profile['scheduler']} {' '.join(profile['args'])}".rstrip())
+
+    result = apply_profile(backend, profile, options.timeout)
+    if result.action_verb == "noop":
+        message = f"Profile '{options.profile}' is already running; nothing to do."
+    else:
+        message = f"Scheduler successfully {result.action_verb}ed to: {profile['scheduler']}"
+    return finish(dict(report, action=result.action_verb), result, message)
+
+
+def main(argv=None):
+    options = build_parser().parse_args(argv)
+    if options.sched and options.sched not in SCHEDULER_OPTIONS and options.mode:
+        # Unknown schedulers may still be supported by scx_loader, but they have no named modes
+        print(f"ERROR: No modes are defined for scheduler '{options.sched}'.", file=sys.stderr)
+        return 2
+
+    backend = instrument(create_backend())
+    try:
+        report = run(options, backend)
+    finally:
+        backend.close()
+
+    emit(report, options.json)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
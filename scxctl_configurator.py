@@ -1,36 +1,227 @@
+import os
 import sys
-import re
-import subprocess
+import time
 from PySide6.QtWidgets import (
     QApplication, QWidget, QLabel, QComboBox, QVBoxLayout, QHBoxLayout, QPushButton, QGroupBox, QLineEdit,
-    QWidget as ContainerWidget
+    QStackedWidget, QCheckBox, QInputDialog, QWidget as ContainerWidget
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QEvent, QObject, Qt, QTimer, Signal
+from PySide6.QtGui import QColor
 
 # --- 1. Import Data ---
 from scheduler_data import SCHEDULER_OPTIONS
+from command_runner import CommandRunner, Debouncer
+from scx_backend import NO_SCHEDULER_TEXT, create_backend
+from scx_core import apply_scheduler, resolve_args
+from scx_process import CommandResult
+
+# Selection churn (arrow keys or the mouse wheel over a combo) settles into one rebuild.
+SELECTION_DEBOUNCE_MS = 50
+
+# Runner coalescing key shared by every action that changes the running scheduler:
+# only the latest start/switch/stop intent is executed.
+SCHEDULER_ACTION_KEY = "scheduler"
+
+# Applied once to the options group; matched by object name so panels never re-polish it.
+DESCRIPTION_STYLE = """
+    QLabel#descriptionLabel {
+        padding: 5px;
+        border: 1px solid #ccc;
+        border-radius: 3px;
+    }
+    QLabel#validationLabel {
+        color: #c0392b;
+    }
+"""
+
+
+class SchedulerOptionsPanel(ContainerWidget):
+    """Modes dropdown, description and custom arguments for a single scheduler. Built once, then reused."""
+
+    def __init__(self, scheduler, options, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        modes = options["Modes"]
+        flags = options["Flags"]
+
+        self.mode_combo = None
+        self.mode_layout_widget = None
+
+        # 1. Mode Dropdown Widgets
+        if modes:
+            mode_layout = QHBoxLayout()
+            mode_layout.addWidget(QLabel("Scheduler Mode:"))
+
+            self.mode_combo = QComboBox(self)
+            self.mode_combo.addItem("Default (No Mode Flags)")
+            for mode_name in modes.keys():
+                self.mode_combo.addItem(mode_name)
+            mode_layout.addWidget(self.mode_combo)
+
+            self.mode_layout_widget = ContainerWidget()
+            self.mode_layout_widget.setLayout(mode_layout)
+            layout.addWidget(self.mode_layout_widget)
+        else:
+            layout.addWidget(QLabel("No specific Modes available for this scheduler."))
+
+        # 2. Description Label
+        self.description_label = QLabel()
+        self.description_label.setObjectName("descriptionLabel")
+        self.description_label.setWordWrap(True)
+        layout.addWidget(self.description_label)
+
+        # 3. Custom Arguments Text Box (Static and visible)
+        args_layout = QHBoxLayout()
+        args_layout.addWidget(QLabel("Custom Arguments (Overrides Mode):"))
+        self.args_textbox = QLineEdit(self)
+        self.args_textbox.setPlaceholderText('e.g., -m performance -w -C 0')
+        if flags:
+            self.args_textbox.setToolTip("Known flags: " + " ".join(flags))
+        args_layout.addWidget(self.args_textbox)
+
+        self.args_layout_widget = ContainerWidget()
+        self.args_layout_widget.setLayout(args_layout)
+        layout.addWidget(self.args_layout_widget)
+
+        # 4. Argument validation against the scheduler's flag schema
+        self.validation_label = QLabel()
+        self.validation_label.setObjectName("validationLabel")
+        self.validation_label.setWordWrap(True)
+        self.validation_label.hide()
+        layout.addWidget(self.validation_label)
+        self.args_textbox.textChanged.connect(self.validate_args)
+        self.flag_checkboxes = []
+
+        # 5. Hardware hints, filled in once the CPU topology has been read
+        self.hardware_label = QLabel()
+        self.hardware_label.setWordWrap(True)
+        self.hardware_label.linkActivated.connect(self.use_suggested_mask)
+        self.hardware_label.hide()
+        layout.addWidget(self.hardware_label)
+        self.mask_suggestions = []
+
+    def validate_args(self, text):
+        """Flags bad custom arguments as they are typed. Returns the list of errors."""
+        from flag_schema import validate_args
+
+        errors = validate_args(self.scheduler, text)
+        self.validation_label.setText("<br>".join(errors))
+        self.validation_label.setVisible(bool(errors))
+        return errors
+
+    def apply_topology(self, topology):
+        """Marks modes that do or don't fit this machine and offers CPU masks for the primary domain."""
+        from topology import format_cpu_list, mode_hint, parse_cpu_mask, suggest_masks
+
+        if self.mode_combo:
+            for index in range(1, self.mode_combo.count()):
+                score, note = mode_hint(self.scheduler, self.mode_combo.itemText(index), topology)
+                self.mode_combo.setItemData(index, note, Qt.ToolTipRole)
+                if score < 0:
+                    self.mode_combo.setItemData(index, QColor("gray"), Qt.ForegroundRole)
+
+        self.mask_suggestions = suggest_masks(self.scheduler, topology)
+        text = f"<small>This machine: {topology.summary()}."
+        if self.mask_suggestions:
+            links = " &middot; ".join(
+                f'<a href="{index}">{label} ({format_cpu_list(parse_cpu_mask(args[1]))})</a>'
+                for index, (label, args) in enumerate(self.mask_suggestions)
+            )
+            text += f" Primary domain: {links}"
+        self.hardware_label.setText(text + "</small>")
+        self.hardware_label.setVisible(len(topology) > 0)
+
+    def use_suggested_mask(self, link):
+        """Puts the chosen CPU mask into the custom args, replacing any earlier value of that flag."""
+        flag, mask = self.mask_suggestions[int(link)][1]
+        tokens = self.args_textbox.text().split()
+        if flag in tokens:
+            position = tokens.index(flag)
+            tokens[position:position + 2] = [flag, mask]
+        else:
+            tokens += [flag, mask]
+        self.args_textbox.setText(" ".join(tokens))
+
 
 class SchedulerSelector(QWidget):
+    # Carries SchedulerState from the monitor thread to the GUI thread.
+    status_changed = Signal(object)
+    # Emitted once the backend is connected and the scheduler list has been revalidated.
+    interactive = Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SCXCTL Scheduler Configurator")
-        self.setGeometry(100, 100, 500, 500)
+        self.setGeometry(100, 100, 700, 560)
 
         self.dynamic_widgets_group = QGroupBox("Configuration Options")
         self.dynamic_layout = QVBoxLayout()
         self.dynamic_widgets_group.setLayout(self.dynamic_layout)
 
-        # Class variables to hold dynamic widgets
-        self.mode_layout_widget = None
-        self.args_layout_widget = None
+        # One lazily built options panel per scheduler, shown through a stack
+        self.options_stack = QStackedWidget()
+        self.dynamic_layout.addWidget(self.options_stack)
+        self.dynamic_layout.addStretch()
+        self.option_panels = {}
+        # Widgets of the currently visible panel
+        self.dynamic_widgets_group.setStyleSheet(DESCRIPTION_STYLE)
         self.mode_combo = None
         self.args_textbox = None
         self.description_label = None
 
         self.current_status_text = ""
+        self.runner = CommandRunner(self)
+        # Work that does not touch the loader (e.g. --help introspection) runs here,
+        # so it never delays a queued start/switch/stop.
+        self.background = CommandRunner(self)
+        # Connecting to the loader happens on the worker, so the window paints first.
+        # Every later backend job is queued behind this one and sees self.backend set.
+        self.backend = None
+        # Why connecting failed; the scheduler actions stay disabled while it is set
+        self.backend_error = None
+        self.status_monitor = None
+        # Loaded once the window has painted, like the telemetry panel
+        self.profile_store = None
+        self.telemetry_panel = None
+        self.deferred_setup_done = False
+        # Remembers the args last committed, so a failed health check can restore them
+        self.transaction = None
+        self.is_interactive = False
+        # CPU topology for hardware hints; read on the background runner
+        self.topology = None
+        # Scheduler output and full error text of failed actions, shown by the log dialog; created on first use
+        self.scheduler_log = None
+        self.log_dialog = None
+        # Created on first use and re-shown afterwards
+        self.benchmark_dialog = None
+        self.stats_dialog = None
+        self.options_update = Debouncer(self.update_dynamic_options, SELECTION_DEBOUNCE_MS, self)
+        self.description_update = Debouncer(self.update_description, SELECTION_DEBOUNCE_MS, self)
         self.setup_ui()
+        self.runner.busy_changed.connect(self.on_runner_busy)
+        self.status_changed.connect(self.on_status_changed)
+        self.runner.submit("connect backend", self.connect_backend, self.on_backend_ready)
         self.populate_dropdown_from_scxctl()
-        self.update_status()
+        self.background.submit("cpu topology", self.read_topology, self.on_topology_ready)
+
+    def connect_backend(self, cancel_event):
+        """Runs on the worker thread ahead of any other backend job."""
+        from instrumentation import instrument
+
+        self.backend = instrument(create_backend(), default=True)
+        return self.backend
+
+    def on_backend_ready(self, backend):
+        if self.backend is None:
+            self.show_no_backend(backend.error_text())
+            return
+        from status_monitor import StatusMonitor
+
+        self.status_monitor = StatusMonitor(self.status_changed.emit, self.backend)
+        self.status_monitor.start()
 
     def setup_ui(self):
         """Initializes all static widgets and the main layout."""
@@ -50,13 +241,35 @@ class SchedulerSelector(QWidget):
             }
             """
         )
-        self.main_layout.addWidget(self.status_indicator)
+        # 0b. Live telemetry goes next to the status once the window has painted (see showEvent)
+        self.status_row = QHBoxLayout()
+        self.status_row.addWidget(self.status_indicator, 1)
+        self.main_layout.addLayout(self.status_row)
 
         # 1. Main Scheduler Dropdown
         self.main_layout.addWidget(QLabel("Select an Available Scheduler:"))
+        scheduler_row = QHBoxLayout()
         self.scheduler_combo = QComboBox(self)
-        self.scheduler_combo.currentIndexChanged.connect(self.update_dynamic_options)
-        self.main_layout.addWidget(self.scheduler_combo)
+        self.scheduler_combo.currentIndexChanged.connect(self.options_update.trigger)
+        scheduler_row.addWidget(self.scheduler_combo, 1)
+        self.refresh_button = QPushButton("Refresh List")
+        self.refresh_button.clicked.connect(self.refresh_scheduler_list)
+        scheduler_row.addWidget(self.refresh_button)
+        self.main_layout.addLayout(scheduler_row)
+
+        # 1b. Saved Profiles
+        profile_row = QHBoxLayout()
+        profile_row.addWidget(QLabel("Profile:"))
+        self.profile_combo = QComboBox(self)
+        self.profile_combo.activated.connect(self.load_profile_into_form)
+        profile_row.addWidget(self.profile_combo, 1)
+        self.apply_profile_button = QPushButton("Apply Profile")
+        self.apply_profile_button.clicked.connect(self.apply_selected_profile)
+        profile_row.addWidget(self.apply_profile_button)
+        self.save_profile_button = QPushButton("Save as Profile...")
+        self.save_profile_button.clicked.connect(self.save_profile)
+        profile_row.addWidget(self.save_profile_button)
+        self.main_layout.addLayout(profile_row)
 
         # 2. Dynamic Options Group Box (Modes/Flags, Description, Custom Args)
         self.main_layout.addWidget(self.dynamic_widgets_group)
@@ -65,12 +278,28 @@ class SchedulerSelector(QWidget):
         self.select_button = QPushButton("Confirm Selection (Switch or Start Scheduler)")
         self.select_button.clicked.connect(self.confirm_selection)
         self.main_layout.addWidget(self.select_button)
+        self.verify_checkbox = QCheckBox("Health check after switching (roll back if unhealthy)")
+        self.verify_checkbox.setChecked(True)
+        self.main_layout.addWidget(self.verify_checkbox)
 
         # Stop Button
         self.mgmt_layout = QHBoxLayout()
         self.disable_button = QPushButton("Stop Scheduler")
         self.disable_button.clicked.connect(self.disable_scheduler)
         self.mgmt_layout.addWidget(self.disable_button)
+        self.cancel_button = QPushButton("Cancel Pending")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_commands)
+        self.mgmt_layout.addWidget(self.cancel_button)
+        self.benchmark_button = QPushButton("Benchmark Results...")
+        self.benchmark_button.clicked.connect(self.show_benchmark_results)
+        self.mgmt_layout.addWidget(self.benchmark_button)
+        self.stats_button = QPushButton("Backend Stats...")
+        self.stats_button.clicked.connect(self.show_backend_stats)
+        self.mgmt_layout.addWidget(self.stats_button)
+        self.log_button = QPushButton("Scheduler Log...")
+        self.log_button.clicked.connect(self.show_scheduler_log)
+        self.mgmt_layout.addWidget(self.log_button)
         self.main_layout.addLayout(self.mgmt_layout)
 
         # 4. Feedback Label
@@ -80,16 +309,32 @@ class SchedulerSelector(QWidget):
 
         self.update_dynamic_options()
 
-    def clear_layout(self, layout):
-        if layout is not None:
-            while layout.count():
-                item = layout.takeAt(0)
-                widget = item.widget()
-                if widget is not None:
-                    widget.deleteLater()
-                sub_layout = item.layout()
-                if sub_layout is not None:
-                    self.clear_layout(sub_layout)
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.deferred_setup_done:
+            self.deferred_setup_done = True
+            QTimer.singleShot(0, self.finish_setup)
+
+    def finish_setup(self):
+        """Builds what the first paint does not need: the telemetry panel and the profile list."""
+        from telemetry_view import TelemetryPanel
+
+        self.telemetry_panel = TelemetryPanel(self)
+        self.status_row.addWidget(self.telemetry_panel, 2)
+        self.populate_profiles()
+
+    # --- BACKEND STATE ---
+
+    def show_no_backend(self, error):
+        """Connecting to scx_loader/scxctl failed: say so and keep every scheduler action disabled."""
+        self.backend_error = error
+        self.status_indicator.setText(f"ERROR: No backend: {error}")
+        self.feedback_label.setText(f"ERROR: Could not connect to scx_loader or scxctl. {error}")
+        for button in (self.select_button, self.disable_button, self.apply_profile_button, self.benchmark_button):
+            button.setEnabled(False)
+
+    def no_backend_result(self, label):
+        return CommandResult([label], error=f"No backend: {self.backend_error or 'not connected'}")
 
     def autofill_arguments(self, mode_flags):
         """Autofills the custom arguments textbox with the selected mode's flags."""
@@ -101,7 +346,8 @@ class SchedulerSelector(QWidget):
     def update_description(self):
         """Updates the description label and triggers autofill based on the selected mode."""
 
-        selected_scheduler = self.scheduler_combo.currentText()
+        # The visible panel's scheduler; the combo may already name the next one
+        selected_scheduler = self.options_stack.currentWidget().scheduler
 
         if not self.mode_combo or self.mode_combo.currentIndex() == 0:
             self.description_label.setText("<small>Select a mode above to view its description and flags.</small>")
@@ -111,6 +357,16 @@ class SchedulerSelector(QWidget):
         mode_name = self.mode_combo.currentText()
 
         mode_data = SCHEDULER_OPTIONS.get(selected_scheduler, {}).get("Modes", {}).get(mode_name, {})
+        flags = mode_data.get("Flags", "No flags.")
+
+        self.description_label.setText(self.mode_description(selected_scheduler, mode_name))
+
+        # Trigger autofill with the extracted flags
+        self.autofill_arguments(flags)
+
+
+    def mode_description(self, scheduler, mode_name):
+        mode_data = SCHEDULER_OPTIONS.get(scheduler, {}).get("Modes", {}).get(mode_name, {})
 
         description = mode_data.get("Description", "No description available.")
         flags = mode_data.get("Flags", "No flags.")
@@ -119,280 +375,485 @@ class SchedulerSelector(QWidget):
         formatted_text = f"<b>Flags:</b> <code>{flags}</code><br>"
         formatted_text += f"<b>Description:</b> {description}"
 
-        self.description_label.setText(formatted_text)
-
-        # Trigger autofill with the extracted flags
-        self.autofill_arguments(flags)
+        if self.topology is not None:
+            from topology import mode_hint
 
+            note = mode_hint(scheduler, mode_name, self.topology)[1]
+            if note:
+                formatted_text += f"<br><b>On this machine:</b> {note}"
+        return formatted_text
 
     def update_dynamic_options(self):
         """
-        Clears old options and rebuilds all dynamic widgets, including the static custom arguments.
+        Shows the options panel for the selected scheduler, building it the first time it is needed.
+        Panels are kept in the stack afterwards, so switching back preserves in-progress custom args.
         """
+        # A mode change still waiting on the debouncer belongs to the panel being left; apply it there
+        # now, before the trackers move on and it autofills the next panel's custom args instead.
+        self.description_update.flush()
         selected_scheduler = self.scheduler_combo.currentText()
-        options = SCHEDULER_OPTIONS.get(selected_scheduler, {"Modes": {}, "Flags": {}})
 
-        self.clear_layout(self.dynamic_layout)
+        panel = self.option_panels.get(selected_scheduler)
+        created = panel is None
+        if created:
+            options = SCHEDULER_OPTIONS.get(selected_scheduler, {"Modes": {}, "Flags": {}})
+            panel = SchedulerOptionsPanel(selected_scheduler, options)
+            self.option_panels[selected_scheduler] = panel
+            self.options_stack.addWidget(panel)
+            if self.topology is not None:
+                panel.apply_topology(self.topology)
+
+        # Point the dynamic widget trackers at the visible panel
+        self.mode_combo = panel.mode_combo
+        self.args_textbox = panel.args_textbox
+        self.description_label = panel.description_label
+
+        self.options_stack.setCurrentWidget(panel)
+
+        if created:
+            if self.mode_combo:
+                # Connect to update description (which also triggers autofill)
+                self.mode_combo.currentIndexChanged.connect(self.description_update.trigger)
+            # Initial call
+            self.update_description()
+
+    def format_status(self, state):
+        """Turns a SchedulerState from the monitor into the formatted status line."""
+        if state.error:
+            return f"ERROR: {state.error}"
+        if state.name is None:
+            return "Scheduler Status: DISABLED"
+        from transaction import scheduler_from_ops
+
+        return f"Scheduler Status: {scheduler_from_ops(state.name).upper()}"
+
+    def flush_selection(self):
+        """Applies debounced selection changes now, so the visible panel matches the combos."""
+        self.options_update.flush()
+        self.description_update.flush()
+
+    def submit_backend(self, label, method_name, callback, key=None, signature=None):
+        """Queues self.backend.<method_name>(timeout=..., cancel_event=...) on the worker thread."""
+        timeout = self.runner.timeout
+        return self.runner.submit(
+            label,
+            lambda cancel_event: (
+                getattr(self.backend, method_name)(timeout=timeout, cancel_event=cancel_event)
+                if self.backend is not None else self.no_backend_result(label)
+            ),
+            callback,
+            key,
+            signature,
+        )
 
-        modes = options["Modes"]
-        flags = options["Flags"]
+    def update_status(self):
+        """Asks the status monitor for an immediate re-read; the indicator updates only if the state changed."""
+        if self.status_monitor is not None:
+            self.status_monitor.poke()
+
+    def on_status_changed(self, state):
+        if state.error:
+            self.current_status_text = ""
+        elif state.name is None:
+            self.current_status_text = NO_SCHEDULER_TEXT
+        else:
+            self.current_status_text = state.name.lower()
+        self.status_indicator.setText(self.format_status(state))
 
-        # Reset dynamic widget trackers
-        self.mode_layout_widget = None
-        self.args_layout_widget = None
-        self.mode_combo = None
-        self.args_textbox = None
-        self.description_label = None
+    # --- ENABLE/DISABLE HANDLERS ---
 
+    def run_mgmt_command(self, action, method_name):
+        command_str = f"scxctl {action}"
+        self.feedback_label.setText(f"Attempting command: {command_str}")
+        self.submit_backend(command_str, method_name, lambda result: self.on_mgmt_result(action, result),
+                            SCHEDULER_ACTION_KEY, (action,))
 
-        # 1. Mode Dropdown Widgets
-        if modes:
-            mode_layout = QHBoxLayout()
-            mode_layout.addWidget(QLabel("Scheduler Mode:"))
+    def on_mgmt_result(self, action, result):
+        if result.ok:
+            self.feedback_label.setText(f"Scheduler successfully {action}d.")
+        else:
+            self.feedback_label.setText(f"ERROR: Failed to {action} scheduler. Error: {result.error_text()}")
+            self.record_failure(action, result)
+        self.update_status()
 
-            self.mode_combo = QComboBox(self)
-            self.mode_combo.addItem("Default (No Mode Flags)")
-            for mode_name in modes.keys():
-                self.mode_combo.addItem(mode_name)
+    def disable_scheduler(self):
+        self.run_mgmt_command("stop", "stop")
 
-            # Connect to update description (which now also triggers autofill)
-            self.mode_combo.currentIndexChanged.connect(self.update_description)
+    def cancel_commands(self):
+        self.runner.cancel_all()
+        self.feedback_label.setText("Cancelling pending commands...")
 
-            mode_layout.addWidget(self.mode_combo)
+    # --- CONFIRM/START/SWITCH ACTION ---
 
-            self.mode_layout_widget = ContainerWidget()
-            self.mode_layout_widget.setLayout(mode_layout)
-            self.dynamic_layout.addWidget(self.mode_layout_widget)
-        else:
-            self.dynamic_layout.addWidget(QLabel("No specific Modes available for this scheduler."))
+    def confirm_selection(self):
+        """
+        Pulls arguments from EITHER the textbox (if filled) OR the dropdown (if textbox is empty).
+        The backend takes care of the scxctl space-to-comma translation.
+        The start-vs-switch decision is made on the worker thread right before executing,
+        so queued requests always see the state left by the previous one.
+        """
+        self.flush_selection()
+        selected_scheduler = self.scheduler_combo.currentText()
 
+        if selected_scheduler.startswith("--- ERROR ---"):
+            self.feedback_label.setText("ERROR: Please select a valid scheduler.")
+            return
 
-        # 2. Description Label
-        self.description_label = QLabel()
-        self.description_label.setWordWrap(True)
-        self.description_label.setStyleSheet(
-            """
-            QLabel {
-                padding: 5px;
-                border: 1px solid #ccc;
-                border-radius: 3px;
-            }
-            """
-        )
-        self.dynamic_layout.addWidget(self.description_label)
+        # 1. Prepare Arguments: Custom textbox takes precedence
+        selected_mode_name = None
+        if self.mode_combo and self.mode_combo.currentIndex() > 0:
+            selected_mode_name = self.mode_combo.currentText()
+        sched_args = resolve_args(selected_scheduler, selected_mode_name, self.args_textbox.text())
 
+        # Reject bad args here instead of paying for a scxctl round-trip and a failed BPF load
+        from flag_schema import validate_args
 
-        # 3. Custom Arguments Text Box (Static and visible)
-        args_layout = QHBoxLayout()
-        args_layout.addWidget(QLabel("Custom Arguments (Overrides Mode):"))
-        self.args_textbox = QLineEdit(self)
-        self.args_textbox.setPlaceholderText('e.g., -m performance -w -C 0')
-        args_layout.addWidget(self.args_textbox)
+        errors = validate_args(selected_scheduler, sched_args)
+        if errors:
+            self.feedback_label.setText(f"ERROR: Invalid arguments: {'; '.join(errors)}")
+            return
 
-        self.args_layout_widget = ContainerWidget()
-        self.args_layout_widget.setLayout(args_layout)
-        self.dynamic_layout.addWidget(self.args_layout_widget)
+        self.feedback_label.setText(
+            f"Attempting command: scxctl start|switch --sched {selected_scheduler} {' '.join(sched_args)}".rstrip()
+        )
+        timeout = self.runner.timeout
+        verify = self.verify_checkbox.isChecked()
+
+        def apply(cancel_event):
+            if self.backend is None:
+                return self.no_backend_result("scxctl apply")
+            if not verify:
+                return apply_scheduler(self.backend, selected_scheduler, sched_args, timeout, cancel_event)
+            if self.transaction is None:
+                from transaction import SwitchTransaction
+
+                self.transaction = SwitchTransaction(self.backend)
+            return self.transaction.run(selected_scheduler, sched_args, timeout, cancel_event)
+
+        self.runner.submit(
+            "scxctl apply",
+            apply,
+            lambda result: self.on_confirm_result(selected_scheduler, result),
+            SCHEDULER_ACTION_KEY,
+            ("apply", selected_scheduler, tuple(sched_args), verify),
+        )
 
-        # 4. Placeholder/Flags
-        if flags:
-            self.dynamic_layout.addWidget(QLabel("Individual flags not implemented for this scheduler."))
-            self.flag_checkboxes = []
+    def on_confirm_result(self, selected_scheduler, result):
+        action_verb = result.action_verb or "switch"
+        if result.state == "rolled back":
+            self.feedback_label.setText(f"ROLLED BACK: {result.error_text()}")
+            self.record_failure("switch", result)
+        elif result.ok:
+            self.feedback_label.setText(f"Scheduler successfully {action_verb}ed to: {selected_scheduler}")
         else:
-            self.flag_checkboxes = []
+            self.feedback_label.setText(f"ERROR: Failed to {action_verb} scheduler: {result.error_text()}")
+            self.record_failure(action_verb, result)
+        self.update_status()
 
-        self.dynamic_layout.addStretch()
+    # --- PROFILE METHODS ---
 
-        # Initial call
-        self.update_description()
+    def profiles(self):
+        """The ProfileStore, created on first use."""
+        if self.profile_store is None:
+            from profiles import ProfileStore
 
-    # --- STATUS CHECK METHODS (No Changes) ---
+            self.profile_store = ProfileStore().load()
+        return self.profile_store
 
-    def check_scheduler_status(self):
-        """Runs 'scxctl get' and returns the raw output and formatted status."""
-        try:
-            result = subprocess.run(
-                ['scxctl', 'get'],
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8'
-            )
-            output = result.stdout.strip()
-            self.current_status_text = output.lower()
+    def populate_profiles(self, selected=None):
+        self.profile_combo.clear()
+        self.profile_combo.addItems(self.profiles().load().names())
+        if selected:
+            self.profile_combo.setCurrentText(selected)
+        if self.profile_store.error:
+            self.feedback_label.setText(f"ERROR: Could not load profiles: {self.profile_store.error}")
 
-            if self.current_status_text == "no scx scheduler running":
-                return "Scheduler Status: DISABLED", output
+    def load_profile_into_form(self):
+        """Shows the selected profile's scheduler and args so they can be reviewed or edited."""
+        profile = self.profiles().get(self.profile_combo.currentText())
+        if profile is None:
+            return
+        index = self.scheduler_combo.findText(profile["scheduler"])
+        if index < 0:
+            self.feedback_label.setText(f"ERROR: Scheduler '{profile['scheduler']}' is not available.")
+            return
+        self.scheduler_combo.setCurrentIndex(index)
+        self.flush_selection()
+        self.args_textbox.setText(" ".join(profile["args"]))
 
-            if output:
-                scheduler_name = output.strip()
-                return f"Scheduler Status: {scheduler_name.upper()}", output
+    def save_profile(self):
+        self.flush_selection()
+        selected_scheduler = self.scheduler_combo.currentText()
+        if selected_scheduler.startswith("--- ERROR ---"):
+            self.feedback_label.setText("ERROR: Please select a valid scheduler.")
+            return
+        name, accepted = QInputDialog.getText(self, "Save Profile", "Profile name:")
+        name = name.strip()
+        if not accepted or not name:
+            return
+        sched_args = self.args_textbox.text().split()
+        error = self.profiles().save(name, selected_scheduler, sched_args)
+        if error:
+            self.feedback_label.setText(f"ERROR: Could not save profile: {error}")
+            return
+        self.populate_profiles(name)
+        self.feedback_label.setText(f"Profile '{name}' saved.")
+
+    def apply_selected_profile(self):
+        """Applies the profile with the cheapest action: nothing, a switch, or a start."""
+        name = self.profile_combo.currentText()
+        profile = self.profiles().get(name)
+        if profile is None:
+            return
+        from flag_schema import validate_args
+        from profiles import apply_profile
 
-            return "Scheduler Status: Status Unknown (Empty Output)", output
+        errors = validate_args(profile["scheduler"], profile["args"])
+        if errors:
+            self.feedback_label.setText(f"ERROR: Invalid arguments in profile '{name}': {'; '.join(errors)}")
+            return
+        self.feedback_label.setText(f"Applying profile '{name}'...")
+        timeout = self.runner.timeout
+        self.runner.submit(
+            "apply profile",
+            lambda cancel_event: (
+                apply_profile(self.backend, profile, timeout, cancel_event)
+                if self.backend is not None else self.no_backend_result("apply profile")
+            ),
+            lambda result: self.on_profile_result(name, profile, result),
+            SCHEDULER_ACTION_KEY,
+            ("profile", profile["scheduler"], tuple(profile["args"])),
+        )
 
-        except FileNotFoundError:
-            return "ERROR: scxctl command not found.", "ERROR"
-        except subprocess.CalledProcessError:
-            return "ERROR: scxctl get failed.", "ERROR"
-        except Exception as e:
-            return f"An unexpected error occurred: {e}", "ERROR"
+    def on_profile_result(self, name, profile, result):
+        if result.action_verb == "noop":
+            self.feedback_label.setText(f"Profile '{name}' is already running; nothing to do.")
+            return
+        self.on_confirm_result(profile["scheduler"], result)
 
-    def update_status(self):
-        status_text, _ = self.check_scheduler_status()
-        self.status_indicator.setText(status_text)
+    # --- LIST SCHEDULERS METHODS ---
 
-    # --- ENABLE/DISABLE HANDLERS (No Changes) ---
+    def populate_dropdown_from_scxctl(self):
+        """
+        Fills the dropdown from the on-disk cache right away (when valid),
+        then revalidates against 'scxctl list' in the background.
+        """
+        from scheduler_cache import load_cached_schedulers
 
-    def run_mgmt_command(self, action, command_list):
-        command_str = " ".join(command_list)
-        self.feedback_label.setText(f"Attempting command: {command_str}")
-        QApplication.processEvents()
-
-        try:
-            subprocess.run(
-                command_list,
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8',
-            )
-            self.feedback_label.setText(f"Scheduler successfully {action}d.")
-            self.update_status()
-        except subprocess.CalledProcessError as e:
-            error_message = f"Failed to {action} scheduler. Error: {e.stderr.strip()}"
-            self.feedback_label.setText(f"ERROR: {error_message}")
-        except Exception as e:
-            error_message = f"An unexpected error occurred: {e}"
-            self.feedback_label.setText(f"ERROR: {error_message}")
+        cached = load_cached_schedulers()
+        if cached:
+            self.set_scheduler_list(cached)
+            self.feedback_label.setText("Schedulers loaded from cache. Ready to configure.")
+        else:
+            self.feedback_label.setText("Running 'scxctl list' to detect schedulers...")
+        self.submit_backend("scxctl list", "list_schedulers", self.on_list_result, "list", "list")
 
-    def disable_scheduler(self):
-        self.run_mgmt_command("stop", ['scxctl', 'stop'])
+    def refresh_scheduler_list(self):
+        """Drops the cached list and asks the backend again."""
+        from scheduler_cache import invalidate_cache
 
-    # --- CONFIRM/START/SWITCH ACTION (Argument source logic updated) ---
+        invalidate_cache()
+        self.feedback_label.setText("Running 'scxctl list' to detect schedulers...")
+        self.submit_backend("scxctl list", "list_schedulers", self.on_list_result, "list", "list")
 
-    def confirm_selection(self):
-        """
-        Pulls arguments from EITHER the textbox (if filled) OR the dropdown (if textbox is empty).
-        Translates spaces to commas for argument passing.
-        Re-adds explicit quotes around the final args to match the required scxctl syntax.
-        """
-        selected_scheduler = self.scheduler_combo.currentText()
+    def current_scheduler_list(self):
+        return [self.scheduler_combo.itemText(i) for i in range(self.scheduler_combo.count())]
 
-        if selected_scheduler.startswith("--- ERROR ---"):
-            self.feedback_label.setText("ERROR: Please select a valid scheduler.")
+    def set_scheduler_list(self, scheduler_list):
+        """Replaces the dropdown entries, keeping the current selection when it is still offered."""
+        selected = self.scheduler_combo.currentText()
+        self.scheduler_combo.blockSignals(True)
+        self.scheduler_combo.clear()
+        for scheduler in scheduler_list:
+             self.scheduler_combo.addItem(scheduler)
+        index = self.scheduler_combo.findText(selected)
+        self.scheduler_combo.setCurrentIndex(max(index, 0))
+        self.scheduler_combo.blockSignals(False)
+        self.select_button.setEnabled(self.backend_error is None and not scheduler_list[0].startswith("--- ERROR ---"))
+        if self.scheduler_combo.currentText() != selected:
+            self.update_dynamic_options()
+
+    def on_list_result(self, result):
+        self.apply_list_result(result)
+        if not self.is_interactive:
+            self.is_interactive = True
+            self.interactive.emit()
+
+    def apply_list_result(self, result):
+        has_cached_list = self.scheduler_combo.count() > 0 and not self.scheduler_combo.itemText(0).startswith("--- ERROR ---")
+
+        if not result.ok:
+            if has_cached_list:
+                self.feedback_label.setText(f"Could not revalidate scheduler list; using cache. {result.error_text()}")
+                return
+            self.set_scheduler_list(["--- ERROR ---"])
+            self.feedback_label.setText(f"ERROR: scxctl list failed. {result.error_text()}")
             return
 
-        # Determine if we need to START or SWITCH
-        if self.current_status_text == "no scx scheduler running":
-            action_verb = "start"
-            base_command = ['scxctl', 'start', '--sched', selected_scheduler]
+        scheduler_list = result.schedulers
+
+        if scheduler_list:
+            from scheduler_cache import save_schedulers
+
+            if scheduler_list != self.current_scheduler_list():
+                self.set_scheduler_list(scheduler_list)
+            # Fingerprinting a changed binary runs its --version, so keep it off the GUI thread
+            self.background.submit("save scheduler cache", lambda cancel_event: save_schedulers(scheduler_list))
+            self.feedback_label.setText("Schedulers loaded. Ready to configure.")
+            self.introspect_schedulers(scheduler_list)
         else:
-            action_verb = "switch"
-            base_command = ['scxctl', 'switch', '--sched', selected_scheduler]
+            self.set_scheduler_list(["--- ERROR ---"])
+            self.feedback_label.setText("Error: Could not parse schedulers from command output.")
 
-        # 1. Prepare Arguments: Custom textbox takes precedence
-        final_args = self.args_textbox.text().strip()
+    def introspect_schedulers(self, scheduler_list):
+        """Generates flag schemas from each installed scheduler's --help in the background."""
+        from help_introspection import introspect_schedulers
 
-        if not final_args:
-            if self.mode_combo and self.mode_combo.currentIndex() > 0:
-                selected_mode_name = self.mode_combo.currentText()
-                mode_data = SCHEDULER_OPTIONS.get(selected_scheduler, {}).get("Modes", {}).get(selected_mode_name, {})
-                final_args = mode_data.get("Flags", "")
+        self.background.submit(
+            "scheduler --help",
+            lambda cancel_event: introspect_schedulers(scheduler_list),
+            self.on_introspection_result,
+        )
 
-        final_args = final_args.strip()
+    def on_introspection_result(self, flags_by_name):
+        if not isinstance(flags_by_name, dict) or not flags_by_name:
+            return
+        from flag_schema import invalidate_schemas
+        from help_introspection import merge_into_options
 
-        # Translate spaces to commas in the final arguments string
-        if final_args:
-            final_args_comma_separated = final_args.replace(' ', ',')
-        else:
-            final_args_comma_separated = final_args
-
-
-        # 2. Build the Final Command
-        final_command = list(base_command)
-
-        if final_args_comma_separated:
-            final_command.append(f'--args={final_args_comma_separated}')
-            # FIX: Adding back the explicit double quotes to match the required command-line syntax.
-
-        # 3. Execute (Outputting the command here for debugging)
-        # The output now correctly shows the quoted argument, e.g., --args "-c,75,-m,0-15"
-        self.feedback_label.setText(f"Attempting command: {' '.join(final_command)}")
-        QApplication.processEvents()
-
-        try:
-            # When the list is passed, subprocess.run handles the quoting for the shell.
-            # If the literal quotes cause an error again, we will know the system shell
-            # is being double-quoted and we must remove the quotes here, but for now,
-            # we follow your example syntax.
-            subprocess.run(
-                final_command,
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8',
-            )
-            self.feedback_label.setText(f"Scheduler successfully {action_verb}ed to: {selected_scheduler}")
-            self.update_status()
-        except subprocess.CalledProcessError as e:
-            error_message = f"Failed to {action_verb} scheduler: {e.stderr.strip()}"
-            self.feedback_label.setText(f"ERROR: {error_message}")
-        except Exception as e:
-            error_message = f"An unexpected error occurred: {e}"
-            self.feedback_label.setText(f"ERROR: {error_message}")
-
-    # --- LIST SCHEDULERS METHODS (No Changes) ---
-
-    def run_scxctl_list(self):
-        try:
-            result = subprocess.run(
-                ['scxctl', 'list'],
-                capture_output=True,
-                text=True,
-                check=True,
-                encoding='utf-8'
-            )
-            return result.stdout
-        except FileNotFoundError:
-            return "scxctl command not found. Install scxctl."
-        except subprocess.CalledProcessError as e:
-            return f"scxctl failed. Stderr: {e.stderr.strip()}"
-        except Exception as e:
-            return f"An unexpected error occurred: {e}"
-
-    def extract_schedulers(self, output_string):
-        match = re.search(r'supported schedulers: \[(.*?)\]', output_string, re.DOTALL)
-        if match:
-            list_content = match.group(1)
-            schedulers = re.findall(r'"(.*?)"', list_content)
-            return schedulers
-        return []
+        merge_into_options(SCHEDULER_OPTIONS, flags_by_name)
+        invalidate_schemas()
+        for panel in self.option_panels.values():
+            panel.validate_args(panel.args_textbox.text())
 
-    def populate_dropdown_from_scxctl(self):
-        self.feedback_label.setText("Running 'scxctl list' to detect schedulers...")
-        QApplication.processEvents()
+    # --- CPU TOPOLOGY ---
 
-        output = self.run_scxctl_list()
+    def read_topology(self, cancel_event):
+        """Runs on the background runner; sysfs is walked once per session."""
+        from topology import get_topology
 
-        if output.startswith("ERROR:"):
-            self.scheduler_combo.addItem("--- ERROR ---")
-            self.feedback_label.setText(f"ERROR: {output}")
-            self.select_button.setEnabled(False)
-            return
+        return get_topology()
 
-        scheduler_list = self.extract_schedulers(output)
+    def on_topology_ready(self, topology):
+        self.topology = topology
+        for panel in self.option_panels.values():
+            panel.apply_topology(topology)
+        if self.mode_combo and self.mode_combo.currentIndex() > 0:
+            self.description_label.setText(
+                self.mode_description(self.scheduler_combo.currentText(), self.mode_combo.currentText())
+            )
 
-        for scheduler in scheduler_list:
-             self.scheduler_combo.addItem(scheduler)
+    def show_benchmark_results(self):
+        from benchmark_view import BenchmarkResultsDialog
 
-        if scheduler_list:
-            self.feedback_label.setText("Schedulers loaded. Ready to configure.")
-        else:
-            self.scheduler_combo.addItem("--- ERROR ---")
-            self.feedback_label.setText("Error: Could not parse schedulers from command output.")
-            self.select_button.setEnabled(False)
+        selected_scheduler = self.scheduler_combo.currentText()
+        if selected_scheduler.startswith("--- ERROR ---"):
+            selected_scheduler = None
+        if self.benchmark_dialog is None:
+            # Benchmarks switch schedulers, so they queue on the same serialized runner as Confirm/Stop
+            self.benchmark_dialog = BenchmarkResultsDialog(self.runner, selected_scheduler, self)
+            self.benchmark_dialog.finished.connect(self.update_status)
+        elif not self.benchmark_dialog.running:
+            self.benchmark_dialog.set_scheduler(selected_scheduler)
+        self.benchmark_dialog.show()
+        self.benchmark_dialog.raise_()
+        self.benchmark_dialog.activateWindow()
+
+    def show_backend_stats(self):
+        if self.stats_dialog is None:
+            from instrumentation import is_enabled
+            from stats_view import BackendStatsDialog
+
+            self.stats_dialog = BackendStatsDialog(is_enabled(default=True), self)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+        self.stats_dialog.activateWindow()
+
+    # --- SCHEDULER LOG ---
+
+    def record_failure(self, action, result):
+        """Keeps the complete output of a failed action; the feedback label only has room for one line."""
+        lines = [f"[{time.strftime('%H:%M:%S')}] {action} failed: {' '.join(result.command)}"]
+        lines += [f"    {line}" for line in (result.stderr or result.error_text()).splitlines() if line.strip()]
+        self.log_buffer().extend(lines)
+
+    def running_scheduler(self):
+        """Short name of the running scheduler as known to the status indicator, or None."""
+        from scx_backend import scheduler_name
+        from transaction import scheduler_from_ops
+
+        if not self.current_status_text or self.current_status_text == NO_SCHEDULER_TEXT:
+            return None
+        # sysfs reports the ops name, e.g. 'bpfland_1.0.14_x86_64'
+        return scheduler_from_ops(scheduler_name(self.current_status_text))
+
+    def log_buffer(self):
+        if self.scheduler_log is None:
+            from scheduler_log import LogBuffer
+
+            self.scheduler_log = LogBuffer()
+        return self.scheduler_log
+
+    def show_scheduler_log(self):
+        if self.log_dialog is None:
+            from log_view import SchedulerLogDialog
+
+            self.log_dialog = SchedulerLogDialog(self.log_buffer(), self.running_scheduler, self)
+        self.log_dialog.show()
+        self.log_dialog.raise_()
+        self.log_dialog.activateWindow()
+
+    def on_runner_busy(self, busy):
+        self.cancel_button.setEnabled(busy)
+
+    def closeEvent(self, event):
+        if self.status_monitor is not None:
+            self.status_monitor.stop()
+        if self.telemetry_panel is not None:
+            self.telemetry_panel.shutdown()
+        if self.log_dialog is not None:
+            self.log_dialog.shutdown()
+        self.runner.shutdown()
+        self.background.shutdown()
+        if self.backend is not None:
+            self.backend.close()
+        super().closeEvent(event)
+
+
+class StartupTrace(QObject):
+    """
+    Prints wall-clock startup milestones to stderr for benchmarks/bench_startup.py.
+    Enabled by SCXCTL_STARTUP_TRACE=1; with SCXCTL_STARTUP_TRACE=exit the app quits once interactive.
+    """
+
+    def __init__(self, window, exit_when_interactive=False):
+        super().__init__(window)
+        self.painted = False
+        self.exit_when_interactive = exit_when_interactive
+        self.mark("constructed")
+        window.installEventFilter(self)
+        window.interactive.connect(self.on_interactive)
+
+    def mark(self, milestone):
+        print(f"startup-trace {milestone} {time.time():.6f}", file=sys.stderr, flush=True)
+
+    def eventFilter(self, obj, event):
+        if not self.painted and event.type() == QEvent.Paint:
+            self.painted = True
+            self.mark("first_paint")
+        return False
+
+    def on_interactive(self):
+        self.mark("interactive")
+        if self.exit_when_interactive:
+            self.parent().close()
+            QApplication.quit()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = SchedulerSelector()
+    trace_mode = os.environ.get("SCXCTL_STARTUP_TRACE")
+    if trace_mode:
+        StartupTrace(window, exit_when_interactive=(trace_mode == "exit"))
     window.show()
     sys.exit(app.exec())
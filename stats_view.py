@@ -0,0 +1,79 @@
+# stats_view.py
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QDialog, QLabel, QTableWidget, QTableWidgetItem, QVBoxLayout
+
+from instrumentation import REGISTRY
+
+REFRESH_MS = 1000
+
+
+def _ms(seconds):
+    if seconds is None:
+        return ""
+    if seconds == float("inf"):
+        return "> 30000"
+    return round(seconds * 1000, 1)
+
+
+COLUMNS = [
+    ("Backend", lambda key, s: key[0]),
+    ("Operation", lambda key, s: key[1]),
+    ("Calls", lambda key, s: s["count"]),
+    ("Failed", lambda key, s: s["outcomes"]["failed"]),
+    ("Timed out", lambda key, s: s["outcomes"]["timed_out"]),
+    ("Mean (ms)", lambda key, s: _ms(s["mean_s"])),
+    ("p50 <= (ms)", lambda key, s: _ms(s["p50_s"])),
+    ("p95 <= (ms)", lambda key, s: _ms(s["p95_s"])),
+    ("Last error", lambda key, s: s["last_error"] or ""),
+]
+
+
+class BackendStatsDialog(QDialog):
+    """
+    Live view of the instrumentation registry: one row per backend operation.
+    Refreshes only while shown; the main window keeps one instance and re-shows it.
+    """
+
+    def __init__(self, enabled=True, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Backend Call Statistics")
+        self.resize(900, 260)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([name for name, _ in COLUMNS])
+        layout.addWidget(self.table)
+
+        self.timer = None
+        if not enabled:
+            self.summary_label.setText("Instrumentation is off (SCXCTL_METRICS=0).")
+            return
+        self.summary_label.setText("Durations are bucketed; percentiles show the bucket's upper bound.")
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.timer is not None:
+            self.refresh()
+            self.timer.start(REFRESH_MS)
+
+    def hideEvent(self, event):
+        if self.timer is not None:
+            self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = sorted(REGISTRY.snapshot().items())
+        self.table.setRowCount(len(snapshot))
+        for row, (key, stats) in enumerate(snapshot):
+            for column, (_name, getter) in enumerate(COLUMNS):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setData(Qt.DisplayRole, getter(key, stats))
+        self.table.resizeColumnsToContents()
@@ -0,0 +1,200 @@
+# status_monitor.py
+
+import threading
+import time
+
+from scx_process import DEFAULT_TIMEOUT
+
+# sched_ext exposes its state through sysfs; reading these costs no fork.
+SCHED_EXT_ROOT = "/sys/kernel/sched_ext"
+
+# Incremented by the kernel every time a BPF scheduler is enabled; tells one loaded instance
+# from the next, even when both have the same name.
+ENABLE_SEQ_PATH = f"{SCHED_EXT_ROOT}/enable_seq"
+
+# scx_loader returns from Start/Switch once the scheduler process is spawned; attaching its
+# BPF ops happens afterwards. How long to wait for that, and how often to look.
+ATTACH_TIMEOUT = 10.0
+ATTACH_POLL_INTERVAL = 0.1
+
+# Poll interval bounds in seconds. The interval doubles each time nothing changed.
+MIN_INTERVAL = 0.5
+MAX_INTERVAL = 8.0
+
+
+class SchedulerState:
+    """Snapshot pushed to listeners. name is None when no scheduler is loaded."""
+
+    __slots__ = ("name", "error", "source")
+
+    def __init__(self, name=None, error=None, source=""):
+        self.name = name
+        self.error = error
+        self.source = source
+
+    @property
+    def running(self):
+        return self.name is not None and self.error is None
+
+    def __eq__(self, other):
+        return isinstance(other, SchedulerState) and (self.name, self.error) == (other.name, other.error)
+
+    def __repr__(self):
+        return f"SchedulerState(name={self.name!r}, error={self.error!r}, source={self.source!r})"
+
+
+def _read_first_line(path):
+    with open(path, encoding="utf-8") as f:
+        return f.readline().strip()
+
+
+def read_sysfs_state(root=SCHED_EXT_ROOT):
+    """
+    Reads sched_ext's state straight from sysfs.
+    Returns None when the kernel does not expose sched_ext, so callers can fall back to the backend.
+    """
+    try:
+        state = _read_first_line(f"{root}/state")
+    except OSError:
+        return None
+    if state != "enabled":
+        # "disabled", or transitional "enabling"/"disabling"
+        return SchedulerState(None if state == "disabled" else state, source="sysfs")
+    try:
+        ops = _read_first_line(f"{root}/root/ops")
+    except OSError:
+        ops = "unknown"
+    return SchedulerState(ops, source="sysfs")
+
+
+def read_enable_seq(path=ENABLE_SEQ_PATH):
+    """The kernel's enable counter, or None when sched_ext does not expose it."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def wait_for_enable_seq(before, path=ENABLE_SEQ_PATH, timeout=ATTACH_TIMEOUT, cancel_event=None,
+                        sleep=time.sleep):
+    """
+    Waits until enable_seq differs from before, i.e. a scheduler enabled after before was read
+    has attached. Returns the new value, or None on timeout, cancellation or when unavailable.
+    """
+    if before is None:
+        return None
+    for _ in range(max(1, int(timeout / ATTACH_POLL_INTERVAL))):
+        current = read_enable_seq(path)
+        if current is None:
+            return None
+        if current != before:
+            return current
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        sleep(ATTACH_POLL_INTERVAL)
+    return None
+
+
+class StatusMonitor:
+    """
+    Watches the running scheduler on a background thread and calls on_change(state)
+    only when the state differs from the last one reported.
+
+    Sources, cheapest first: sysfs reads, then the backend's get_status().
+    The poll backs off from MIN_INTERVAL to MAX_INTERVAL while nothing changes; a
+    loader PropertiesChanged signal or poke() resets it and triggers an immediate read.
+    sysfs attributes do not raise inotify events, which is why sysfs is polled rather than watched.
+    """
+
+    def __init__(self, on_change, backend=None, sysfs_root=SCHED_EXT_ROOT,
+                 min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self.on_change = on_change
+        self.backend = backend
+        self.sysfs_root = sysfs_root
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.last_state = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._signal_thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scx-status-monitor", daemon=True)
+        self._thread.start()
+        self._start_signal_listener()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def poke(self):
+        """Requests an immediate re-read, e.g. right after we started or stopped a scheduler."""
+        self.interval = self.min_interval
+        self._wake.set()
+
+    def read_state(self):
+        state = read_sysfs_state(self.sysfs_root)
+        if state is not None or self.backend is None:
+            return state or SchedulerState(error="sched_ext is not available.", source="sysfs")
+        result = self.backend.get_status(DEFAULT_TIMEOUT)
+        if not result.ok:
+            return SchedulerState(error=result.error_text(), source=self.backend.name)
+        return SchedulerState(result.scheduler, source=self.backend.name)
+
+    def check(self):
+        """One poll: reports the state if it changed and returns how long to wait before the next."""
+        state = self.read_state()
+        if state != self.last_state:
+            self.last_state = state
+            self.interval = self.min_interval
+            self.on_change(state)
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        return self.interval
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            self._wake.wait(self.check())
+
+    def _start_signal_listener(self):
+        """Subscribes to the loader's PropertiesChanged signal when a D-Bus backend is in use."""
+        router = getattr(self.backend, "router", None)
+        if router is None:
+            return
+        # Only reachable with the D-Bus backend, so jeepney is installed
+        from jeepney import MatchRule
+        from jeepney.bus_messages import message_bus
+
+        rule = MatchRule(
+            type="signal",
+            interface="org.freedesktop.DBus.Properties",
+            member="PropertiesChanged",
+            path=self.backend.address.object_path,
+        )
+        try:
+            router.send_and_get_reply(message_bus.AddMatch(rule), timeout=DEFAULT_TIMEOUT)
+        except Exception:
+            return
+        self._signal_thread = threading.Thread(
+            target=self._listen, args=(router, rule), name="scx-status-signals", daemon=True
+        )
+        self._signal_thread.start()
+
+    def _listen(self, router, rule):
+        with router.filter(rule, bufsize=8) as queue:
+            while not self._stop.is_set():
+                try:
+                    queue.get(timeout=1.0)
+                except Exception:
+                    continue
+                self.poke()
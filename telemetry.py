@@ -0,0 +1,218 @@
+# telemetry.py
+#
+# Low-overhead sampling of scheduler health from procfs. GUI-free; the parsers take raw bytes
+# so they can be fed recorded snapshots.
+
+import os
+import time
+from array import array
+
+PROC_SCHEDSTAT = "/proc/schedstat"
+PROC_STAT = "/proc/stat"
+PROC_PRESSURE_CPU = "/proc/pressure/cpu"
+
+# Samples kept per series (e.g. 5 minutes at 1 Hz)
+DEFAULT_CAPACITY = 300
+
+# Initial read buffer; grown on demand for machines with many CPUs
+INITIAL_BUFFER = 16 * 1024
+
+# Fields after "cpuN" in /proc/schedstat (version 15+)
+_SCHEDSTAT_RUN_DELAY = 7
+_SCHEDSTAT_TIMESLICES = 8
+
+
+def parse_schedstat(data):
+    """Returns (total run-queue delay in ns, total timeslices, cpu count) summed over all CPUs."""
+    run_delay = 0
+    timeslices = 0
+    cpus = 0
+    for line in data.split(b"\n"):
+        if line[:3] != b"cpu":
+            continue
+        fields = line.split()
+        if len(fields) <= _SCHEDSTAT_TIMESLICES + 1:
+            continue
+        run_delay += int(fields[_SCHEDSTAT_RUN_DELAY + 1])
+        timeslices += int(fields[_SCHEDSTAT_TIMESLICES + 1])
+        cpus += 1
+    return run_delay, timeslices, cpus
+
+
+def parse_stat(data):
+    """Returns (context switches since boot, [(busy, total) jiffies per CPU])."""
+    ctxt = 0
+    per_cpu = []
+    for line in data.split(b"\n"):
+        if line[:3] == b"cpu" and line[3:4].isdigit():
+            values = [int(v) for v in line.split()[1:9]]
+            # user nice system idle iowait irq softirq steal
+            idle = values[3] + (values[4] if len(values) > 4 else 0)
+            total = sum(values)
+            per_cpu.append((total - idle, total))
+        elif line.startswith(b"ctxt "):
+            ctxt = int(line.split()[1])
+    return ctxt, per_cpu
+
+
+def parse_pressure(data, field="total"):
+    """
+    One field of the 'some' line of a PSI file: the cumulative stall time in microseconds for
+    'total', or the stalled percentage for 'avg10', 'avg60' and 'avg300'. 0 when absent.
+    """
+    prefix = field.encode() + b"="
+    for line in data.split(b"\n"):
+        if line.startswith(b"some "):
+            for item in line.split()[1:]:
+                if item.startswith(prefix):
+                    value = item[len(prefix):]
+                    return int(value) if field == "total" else float(value)
+    return 0
+
+
+class RingBuffer:
+    """Fixed-capacity series of floats; memory never grows after construction."""
+
+    __slots__ = ("data", "capacity", "head", "count")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.data = array('d', bytes(8 * capacity))
+        self.capacity = capacity
+        self.head = 0
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def values(self):
+        """Oldest-to-newest copy of the stored samples."""
+        start = (self.head - self.count) % self.capacity
+        if start + self.count <= self.capacity:
+            return self.data[start:start + self.count]
+        return self.data[start:] + self.data[:self.head]
+
+    def latest(self):
+        return self.data[(self.head - 1) % self.capacity] if self.count else None
+
+    def __len__(self):
+        return self.count
+
+
+class ProcFile:
+    """Keeps a procfs file open and re-reads it into one reusable buffer."""
+
+    def __init__(self, path):
+        self.path = path
+        self.buffer = bytearray(INITIAL_BUFFER)
+        try:
+            self.fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            self.fd = None
+
+    @property
+    def available(self):
+        return self.fd is not None
+
+    def read(self):
+        """Returns a memoryview of the current contents, or None if the file is unavailable."""
+        if self.fd is None:
+            return None
+        while True:
+            length = os.preadv(self.fd, [self.buffer], 0)
+            if length < len(self.buffer):
+                return memoryview(self.buffer)[:length]
+            # Truncated; grow once and retry
+            self.buffer = bytearray(len(self.buffer) * 2)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+class TelemetrySampler:
+    """
+    Turns successive procfs snapshots into rates stored in ring buffers:
+    run-queue delay (ms of waiting per second, per CPU), context switches per second,
+    CPU pressure (% of time some task stalled on CPU) and the busiest CPU's utilization (%).
+    cpu_busy holds one ring per CPU, allocated up front for the CPUs /proc/stat lists.
+    """
+
+    SERIES = ("runqueue_delay", "context_switches", "cpu_pressure", "cpu_busy_max")
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, proc_root="/proc"):
+        self.files = {
+            "schedstat": ProcFile(os.path.join(proc_root, "schedstat")),
+            "stat": ProcFile(os.path.join(proc_root, "stat")),
+            "pressure": ProcFile(os.path.join(proc_root, "pressure", "cpu")),
+        }
+        self.times = RingBuffer(capacity)
+        self.series = {name: RingBuffer(capacity) for name in self.SERIES}
+        stat = self.files["stat"].read()
+        cpus = len(parse_stat(bytes(stat))[1]) if stat is not None else 0
+        self.cpu_busy = [RingBuffer(capacity) for _ in range(cpus)]
+        self._previous = None
+
+    def read_counters(self):
+        """One snapshot of the raw cumulative counters (None for unavailable sources)."""
+        schedstat = self.files["schedstat"].read()
+        stat = self.files["stat"].read()
+        pressure = self.files["pressure"].read()
+        ctxt, cpus = parse_stat(bytes(stat)) if stat is not None else (None, None)
+        return {
+            "time": time.monotonic(),
+            "schedstat": parse_schedstat(bytes(schedstat)) if schedstat is not None else None,
+            "ctxt": ctxt,
+            "cpus": cpus,
+            "pressure": parse_pressure(bytes(pressure)) if pressure is not None else None,
+        }
+
+    def add_counters(self, counters):
+        """Feeds one snapshot; returns True when a new sample was appended (needs two snapshots)."""
+        previous, self._previous = self._previous, counters
+        if previous is None:
+            return False
+        elapsed = counters["time"] - previous["time"]
+        if elapsed <= 0:
+            return False
+
+        runqueue_delay = 0.0
+        if counters["schedstat"] and previous["schedstat"]:
+            delay_ns = counters["schedstat"][0] - previous["schedstat"][0]
+            cpus = max(counters["schedstat"][2], 1)
+            runqueue_delay = delay_ns / 1e6 / elapsed / cpus
+
+        context_switches = 0.0
+        if counters["ctxt"] is not None and previous["ctxt"] is not None:
+            context_switches = (counters["ctxt"] - previous["ctxt"]) / elapsed
+
+        cpu_pressure = 0.0
+        if counters["pressure"] is not None and previous["pressure"] is not None:
+            cpu_pressure = (counters["pressure"] - previous["pressure"]) / 1e6 / elapsed * 100
+
+        busiest = 0.0
+        if counters["cpus"] and previous["cpus"]:
+            # zip stops at the shortest: CPUs hotplugged after startup have no ring
+            for ring, (busy, total), (previous_busy, previous_total) in zip(
+                    self.cpu_busy, counters["cpus"], previous["cpus"]):
+                elapsed_jiffies = total - previous_total
+                percent = (busy - previous_busy) * 100.0 / elapsed_jiffies if elapsed_jiffies > 0 else 0.0
+                ring.append(percent)
+                busiest = max(busiest, percent)
+
+        self.times.append(counters["time"])
+        self.series["runqueue_delay"].append(runqueue_delay)
+        self.series["context_switches"].append(context_switches)
+        self.series["cpu_pressure"].append(cpu_pressure)
+        self.series["cpu_busy_max"].append(busiest)
+        return True
+
+    def sample(self):
+        return self.add_counters(self.read_counters())
+
+    def close(self):
+        for proc_file in self.files.values():
+            proc_file.close()
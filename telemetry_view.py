@@ -0,0 +1,111 @@
+# telemetry_view.py
+
+from PySide6.QtCore import QPointF, Qt, QTimer
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QComboBox, QHBoxLayout, QLabel, QVBoxLayout, QWidget
+
+from telemetry import TelemetrySampler
+
+# (label, value when stopped)
+SAMPLE_RATES = [("1 s", 1000), ("0.5 s", 500), ("2 s", 2000), ("Off", 0)]
+
+SERIES_LABELS = {
+    "runqueue_delay": ("Run-queue delay", "ms/s per CPU"),
+    "context_switches": ("Context switches", "/s"),
+    "cpu_pressure": ("CPU pressure", "%"),
+    "cpu_busy_max": ("Busiest CPU", "% busy"),
+}
+
+
+class Sparkline(QWidget):
+    """Draws one ring buffer as a line. Repainted only when the panel reports a new sample."""
+
+    def __init__(self, ring, color, parent=None):
+        super().__init__(parent)
+        self.ring = ring
+        self.pen = QPen(QColor(color), 1.5)
+        self.setMinimumSize(120, 24)
+
+    def paintEvent(self, event):
+        values = self.ring.values()
+        if len(values) < 2:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.pen)
+
+        width = self.width() - 1
+        height = self.height() - 2
+        top = max(values) or 1.0
+        step = width / (self.ring.capacity - 1)
+        offset = width - step * (len(values) - 1)
+        points = QPolygonF([
+            QPointF(offset + index * step, 1 + height - (value / top) * height)
+            for index, value in enumerate(values)
+        ])
+        painter.drawPolyline(points)
+        painter.end()
+
+
+class TelemetryPanel(QWidget):
+    """Live run-queue delay, context-switch rate, CPU pressure and busiest-CPU load, sampled from procfs."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sampler = TelemetrySampler()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.take_sample)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        self.value_labels = {}
+        self.sparklines = {}
+        colors = {"runqueue_delay": "#c0392b", "context_switches": "#2980b9", "cpu_pressure": "#8e44ad",
+                  "cpu_busy_max": "#27ae60"}
+        for name in TelemetrySampler.SERIES:
+            row = QHBoxLayout()
+            label = QLabel(f"<small>{SERIES_LABELS[name][0]}</small>")
+            label.setMinimumWidth(110)
+            row.addWidget(label)
+            sparkline = Sparkline(self.sampler.series[name], colors[name])
+            row.addWidget(sparkline, 1)
+            value_label = QLabel("<small>-</small>")
+            value_label.setMinimumWidth(90)
+            value_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            row.addWidget(value_label)
+            layout.addLayout(row)
+            self.sparklines[name] = sparkline
+            self.value_labels[name] = value_label
+
+        rate_row = QHBoxLayout()
+        rate_row.addWidget(QLabel("<small>Sample every</small>"))
+        self.rate_combo = QComboBox()
+        for label, _interval in SAMPLE_RATES:
+            self.rate_combo.addItem(label)
+        self.rate_combo.currentIndexChanged.connect(self.set_rate)
+        rate_row.addWidget(self.rate_combo)
+        rate_row.addStretch()
+        layout.addLayout(rate_row)
+
+        self.set_rate(0)
+
+    def set_rate(self, index):
+        interval = SAMPLE_RATES[index][1]
+        if interval:
+            self.timer.start(interval)
+        else:
+            self.timer.stop()
+
+    def take_sample(self):
+        if not self.sampler.sample():
+            return
+        for name, (_label, unit) in SERIES_LABELS.items():
+            value = self.sampler.series[name].latest()
+            self.value_labels[name].setText(f"<small>{value:,.1f} {unit}</small>")
+            self.sparklines[name].update()
+
+    def shutdown(self):
+        self.timer.stop()
+        self.sampler.close()
@@ -0,0 +1,101 @@
+# conftest.py
+#
+# The modules live flat at the repository root; make them importable from the tests.
+# Run from the repository root:  python -m pytest -q
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+# References given to None/True/False when the installed PySide6 leaks them (see _offset_emit_leak)
+PINNED_REFERENCES = 1 << 24
+
+
+def _offset_emit_leak():
+    """
+    PySide6 6.12.0's Signal.emit() returns True without taking a reference to it, so every emit
+    made from Python drops one reference to True (Python slots called from C++ do the same to
+    their return value). A session emits thousands of times; once that exceeds an object's real
+    reference count, the interpreter deallocates True or None and aborts (exit 134) no matter how
+    tidily Qt was torn down. When the leak shows up here, hold references that are never released.
+    """
+    import ctypes
+
+    from PySide6.QtCore import QObject, Signal
+
+    class Probe(QObject):
+        fired = Signal()
+
+    probe = Probe()
+    before = sys.getrefcount(True)
+    for _ in range(8):
+        probe.fired.emit()
+    if sys.getrefcount(True) < before and sys.implementation.name == "cpython":
+        for obj in (None, True, False):
+            # ob_refcnt is the first field of every CPython object
+            ctypes.c_ssize_t.from_address(id(obj)).value += PINNED_REFERENCES
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """
+    One offscreen QApplication for every GUI test. At the end of the session the remaining
+    windows are closed (which shuts down their runners' thread pools) and deleted, and the
+    application is destroyed while the interpreter is still fully alive.
+    """
+    pytest.importorskip("PySide6")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    import shiboken6
+    from PySide6.QtCore import QCoreApplication, QEvent, QThreadPool
+    from PySide6.QtWidgets import QApplication
+
+    _offset_emit_leak()
+    app = QApplication.instance()
+    created = app is None
+    if created:
+        app = QApplication([])
+    yield app
+
+    for widget in app.topLevelWidgets():
+        widget.close()
+        widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    if created:
+        shiboken6.delete(app)
+
+
+@pytest.fixture
+def main_window(qapp, tmp_path, monkeypatch):
+    """
+    A real SchedulerSelector on the scxctl backend, with its cache and profiles under tmp_path,
+    returned once its startup jobs (connect, list) have finished.
+    """
+    import time
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setenv("SCX_BACKEND", "scxctl")
+    monkeypatch.setenv("SCXCTL_METRICS", "1")
+    from scxctl_configurator import SchedulerSelector
+
+    window = SchedulerSelector()
+    deadline = time.monotonic() + 10
+    while not window.is_interactive and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    assert window.is_interactive
+    yield window
+    from PySide6.QtCore import QCoreApplication, QEvent
+
+    window.close()
+    window.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
@@ -0,0 +1,58 @@
+# sysfs_trees.py
+#
+# Builds fixture sysfs cpu trees (a hybrid SMT desktop and a two-CCX server) under a temporary
+# directory, for test_topology.py and benchmarks/bench_topology.py.
+
+import os
+
+
+def write(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="ascii") as f:
+        f.write(f"{value}\n")
+
+
+def build_tree(root, cpus):
+    """cpus: list of dicts with core, siblings, llc (cpu list), max_khz and optional capacity."""
+    write(os.path.join(root, "online"), f"0-{len(cpus) - 1}")
+    for cpu, spec in enumerate(cpus):
+        cpu_dir = os.path.join(root, f"cpu{cpu}")
+        write(os.path.join(cpu_dir, "topology", "core_id"), spec["core"])
+        write(os.path.join(cpu_dir, "topology", "physical_package_id"), 0)
+        write(os.path.join(cpu_dir, "topology", "cluster_id"), spec["core"])
+        write(os.path.join(cpu_dir, "topology", "thread_siblings_list"), spec["siblings"])
+        write(os.path.join(cpu_dir, "cpufreq", "cpuinfo_max_freq"), spec["max_khz"])
+        write(os.path.join(cpu_dir, "cpufreq", "cpuinfo_min_freq"), 800000)
+        if "capacity" in spec:
+            write(os.path.join(cpu_dir, "cpu_capacity"), spec["capacity"])
+        for index, (level, kind, shared) in enumerate([(1, "Data", str(cpu)), (1, "Instruction", str(cpu)),
+                                                        (2, "Unified", spec["siblings"]), (3, "Unified", spec["llc"])]):
+            index_dir = os.path.join(cpu_dir, "cache", f"index{index}")
+            write(os.path.join(index_dir, "level"), level)
+            write(os.path.join(index_dir, "type"), kind)
+            write(os.path.join(index_dir, "shared_cpu_list"), shared)
+
+
+def hybrid_desktop():
+    """8 SMT performance cores (CPUs 0-15) and 8 efficiency cores (16-23), one LLC."""
+    cpus = []
+    for core in range(8):
+        for _ in range(2):
+            cpus.append({"core": core, "siblings": f"{core * 2}-{core * 2 + 1}", "llc": "0-23", "max_khz": 5000000})
+    for core in range(8):
+        cpus.append({"core": 8 + core, "siblings": str(16 + core), "llc": "0-23", "max_khz": 3800000})
+    return cpus
+
+
+def two_ccx_server(cores_per_ccx=64):
+    """Two LLC domains of SMT cores, all equally fast."""
+    cpus = []
+    total = cores_per_ccx * 2
+    for core in range(total):
+        llc = f"0-{cores_per_ccx - 1},{total}-{total + cores_per_ccx - 1}" if core < cores_per_ccx else \
+            f"{cores_per_ccx}-{total - 1},{total + cores_per_ccx}-{2 * total - 1}"
+        cpus.append({"core": core, "siblings": f"{core},{core + total}", "llc": llc, "max_khz": 3000000,
+                     "capacity": 1024})
+    for core in range(total):
+        cpus.append(dict(cpus[core]))
+    return cpus
@@ -0,0 +1,250 @@
+# test_autotune.py
+#
+# Incremental process and cgroup watching on fake /proc and cgroup trees, PSI parsing, the switch
+# rate limits and re-applying after an outside switch.
+
+import struct
+
+import pytest
+
+from autotune import (PROC_EVENT_EXEC, PROC_EVENT_FORK, AutoTuner, CgroupWatcher, ProcConnector, ProcessWatcher,
+                      Rule, read_pressure)
+from scx_process import CommandResult
+
+
+def write_process(proc_root, pid, comm, starttime=1000):
+    pid_dir = proc_root / str(pid)
+    pid_dir.mkdir(exist_ok=True)
+    # pid (comm) state ppid ... with starttime as field 22
+    fields = ["S", "1"] + ["0"] * 17 + [str(starttime)] + ["0"] * 10
+    (pid_dir / "stat").write_text(f"{pid} ({comm}) {' '.join(fields)}\n")
+
+
+def counting_reads(watcher):
+    reads = []
+    read_stat = watcher.read_stat
+
+    def counted(pid):
+        reads.append(pid)
+        return read_stat(pid)
+
+    watcher.read_stat = counted
+    return reads
+
+
+def test_only_new_and_watched_pids_are_read(tmp_path):
+    for pid, comm in ((100, "bash"), (200, "steam"), (300, "kworker/0:1 (x)")):
+        write_process(tmp_path, pid, comm)
+    (tmp_path / "self").mkdir()
+    watcher = ProcessWatcher({"steam", "gamescope"}, proc_root=str(tmp_path), resync_scans=10)
+    reads = counting_reads(watcher)
+    assert watcher.scan() == {"steam"}
+    assert sorted(reads) == [100, 200, 300]
+    assert watcher.processes[300] == (1000, "kworker/0:1 (x)")
+
+    reads.clear()
+    write_process(tmp_path, 400, "gamescope")
+    assert watcher.scan() == {"steam", "gamescope"}
+    assert sorted(reads) == [200, 400]
+
+
+def test_watched_process_renamed_or_reused(tmp_path):
+    write_process(tmp_path, 200, "steam")
+    watcher = ProcessWatcher({"steam"}, proc_root=str(tmp_path))
+    assert watcher.scan() == {"steam"}
+    # The PID went away and came back as another process
+    write_process(tmp_path, 200, "steam", starttime=5000)
+    assert watcher.scan() == {"steam"}
+    assert watcher.processes[200] == (5000, "steam")
+    # steam exec'd something unwatched
+    write_process(tmp_path, 200, "steamwebhelper", starttime=5000)
+    assert watcher.scan() == frozenset()
+
+
+def test_exec_into_a_watched_name_is_caught_by_the_resync(tmp_path):
+    write_process(tmp_path, 100, "bash")
+    watcher = ProcessWatcher({"gamescope"}, proc_root=str(tmp_path), resync_scans=3)
+    assert watcher.scan() == frozenset()
+    write_process(tmp_path, 100, "gamescope")
+    assert watcher.scan() == frozenset()
+    assert watcher.scan() == frozenset()
+    assert watcher.scan() == {"gamescope"}
+
+
+def test_watcher_without_proc(tmp_path):
+    assert ProcessWatcher({"steam"}, proc_root=str(tmp_path / "missing")).scan() == frozenset()
+    assert ProcessWatcher(set(), proc_root=str(tmp_path)).scan() == frozenset()
+
+
+class FakeConnector:
+    def __init__(self):
+        self.queue = []
+
+    def read_events(self):
+        events, self.queue = self.queue, []
+        return events
+
+    def close(self):
+        pass
+
+
+def test_connector_events_drive_the_watcher(tmp_path):
+    write_process(tmp_path, 100, "bash")
+    connector = FakeConnector()
+    watcher = ProcessWatcher({"gamescope", "steam"}, proc_root=str(tmp_path), connector=connector)
+    reads = counting_reads(watcher)
+    assert watcher.scan() == frozenset()
+
+    # The shell forks and the child execs gamescope; only the exec'd PID is read
+    reads.clear()
+    write_process(tmp_path, 101, "gamescope")
+    connector.queue = [("fork", 101, 100), ("exec", 101, None)]
+    assert watcher.scan() == {"gamescope"}
+    assert reads == [101]
+
+    connector.queue = [("comm", 100, "steam"), ("exit", 101, None)]
+    assert watcher.scan() == {"steam"}
+    assert reads == [101]
+
+    # Lost events: everything is listed again
+    import shutil
+
+    shutil.rmtree(tmp_path / "101")
+    connector.queue = None
+    assert watcher.scan() == frozenset()
+    assert watcher.processes[100] == (1000, "bash")
+
+
+def test_connector_messages_are_decoded():
+    def message(what, *pids):
+        event = struct.pack("=IIQ", what, 0, 0) + struct.pack(f"={len(pids)}i", *pids) + bytes(16)
+        cn_msg = struct.pack("=IIIIHH", 1, 1, 0, 0, len(event), 0) + event
+        return struct.pack("=IHHII", 16 + len(cn_msg), 3, 0, 0, 0) + cn_msg
+
+    decode = ProcConnector._decode
+    assert decode(message(PROC_EVENT_FORK, 10, 10, 11, 11), 36) == ("fork", 11, 10)
+    # A new thread, not a new process
+    assert decode(message(PROC_EVENT_FORK, 10, 10, 12, 11), 36) is None
+    assert decode(message(PROC_EVENT_EXEC, 11, 11), 36) == ("exec", 11, None)
+
+
+def test_cgroup_watcher(tmp_path):
+    scope = tmp_path / "system.slice" / "docker-4f2a.scope"
+    scope.mkdir(parents=True)
+    (scope / "cgroup.events").write_text("populated 1\nfrozen 0\n")
+    empty = tmp_path / "system.slice" / "backup.service"
+    empty.mkdir()
+    (empty / "cgroup.events").write_text("populated 0\nfrozen 0\n")
+    watcher = CgroupWatcher({"system.slice/docker-*.scope", "system.slice/backup.service", "missing.slice"},
+                            root=str(tmp_path))
+    assert watcher.scan() == {"system.slice/docker-*.scope"}
+
+    rule = Rule({"name": "containers", "when": {"cgroup_any": ["system.slice/docker-*.scope"]},
+                 "scheduler": "bpfland"})
+    assert rule.condition({"processes": frozenset(), "cgroups": watcher.scan(), "load": 0.0, "pressure": 0.0})
+    assert not rule.condition({"processes": frozenset(), "cgroups": frozenset(), "load": 0.0, "pressure": 0.0})
+
+
+def test_read_pressure(tmp_path):
+    path = tmp_path / "cpu"
+    path.write_text("some avg10=12.50 avg60=3.10 avg300=0.80 total=123456789\n"
+                    "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    assert read_pressure(str(path)) == 12.5
+    assert read_pressure(str(tmp_path / "missing")) == 0.0
+
+
+class CountingBackend:
+    name = "fake"
+
+    def __init__(self, enable_seq_path=None):
+        self.calls = []
+        self.running = None
+        self.enable_seq_path = enable_seq_path
+
+    def get_status(self, timeout=None, cancel_event=None):
+        result = CommandResult(["get"], returncode=0)
+        result.scheduler = self.running
+        return result
+
+    def _apply(self, verb, scheduler, args):
+        self.calls.append((verb, scheduler))
+        self.running = scheduler
+        if self.enable_seq_path is not None:
+            self.enable_seq_path.write_text(str(int(self.enable_seq_path.read_text()) + 1))
+        return CommandResult([verb], returncode=0)
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("start", scheduler, args)
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("switch", scheduler, args)
+
+
+def make_tuner(max_switches_per_hour, clock, enable_seq_path=None, min_dwell_s=0):
+    rules = [Rule({"name": "gaming", "when": {"process_any": ["steam"]}, "scheduler": "flash", "mode": "Gaming"}),
+             Rule({"name": "default", "scheduler": "bpfland"})]
+    backend = CountingBackend(enable_seq_path)
+    tuner = AutoTuner(rules, backend, min_dwell_s=min_dwell_s, max_switches_per_hour=max_switches_per_hour,
+                      clock=lambda: clock[0], enable_seq_path=str(enable_seq_path or "/nonexistent/enable_seq"))
+    return tuner, backend
+
+
+def observations(count):
+    for index in range(count):
+        yield {"processes": frozenset({"steam"} if index % 2 else ()), "load": 0.0, "pressure": 0.0}
+
+
+@pytest.mark.parametrize("limit, expected", [(0, 0), (1, 1), (3, 3), (10, 6)])
+def test_switches_per_hour_cap(limit, expected):
+    clock = [0.0]
+    tuner, backend = make_tuner(limit, clock)
+    for observation in observations(6):
+        clock[0] += 60
+        tuner.tick(observation)
+    assert len(backend.calls) == expected
+
+
+def test_cap_frees_up_after_an_hour():
+    clock = [0.0]
+    tuner, backend = make_tuner(1, clock)
+    tuner.tick({"processes": frozenset(), "load": 0.0, "pressure": 0.0})
+    clock[0] += 1800
+    assert tuner.tick({"processes": frozenset({"steam"}), "load": 0.0, "pressure": 0.0}) is None
+    clock[0] += 1801
+    assert tuner.tick({"processes": frozenset({"steam"}), "load": 0.0, "pressure": 0.0}).name == "gaming"
+    assert [scheduler for _verb, scheduler in backend.calls] == ["bpfland", "flash"]
+
+
+IDLE = {"processes": frozenset(), "load": 0.0, "pressure": 0.0}
+
+
+def test_outside_switch_is_undone_without_sysfs():
+    clock = [0.0]
+    tuner, backend = make_tuner(6, clock, min_dwell_s=60)
+    assert tuner.tick(IDLE).name == "default"
+    clock[0] += 10
+    assert tuner.tick(IDLE) is None
+
+    # Someone switched to lavd by hand; the dwell time still applies
+    backend.running = "lavd"
+    assert tuner.tick(IDLE) is None
+    clock[0] += 60
+    assert tuner.tick(IDLE).name == "default"
+    assert backend.calls[-1] == ("switch", "bpfland")
+
+
+def test_outside_restart_is_noticed_through_enable_seq(tmp_path):
+    seq = tmp_path / "enable_seq"
+    seq.write_text("7")
+    clock = [0.0]
+    tuner, backend = make_tuner(6, clock, enable_seq_path=seq)
+    assert tuner.tick(IDLE).name == "default"
+    assert tuner.applied_seq == 8
+    clock[0] += 60
+    assert tuner.tick(IDLE) is None
+
+    # Same scheduler, restarted with other arguments: the name alone would not tell
+    seq.write_text("9")
+    clock[0] += 60
+    assert tuner.tick(IDLE).name == "default"
+    assert len(backend.calls) == 2 and tuner.applied_seq == 10
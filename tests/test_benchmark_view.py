@@ -0,0 +1,81 @@
+# test_benchmark_view.py
+#
+# The benchmark results dialog shows the newest saved run each time it opens, and the main window
+# keeps one instance, retargeted to the selected scheduler.
+
+import pytest
+
+from sched_benchmark import save_results
+from scx_process import CommandResult
+
+RUN = {"scheduler": "flash", "mode": None, "args": [], "ok": True,
+       "wakeup": {"p50_us": 1.0, "p99_us": 2.0, "p999_us": 3.0},
+       "pipe": {"p99_us": 4.0, "ops_per_s": 5.0}, "cpu": {"ops_per_s": 6.0}}
+
+
+class QueueingRunner:
+    """Collects submitted jobs instead of running them."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, name, job, callback):
+        self.jobs.append((name, callback))
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+
+@pytest.fixture
+def dialog(qapp):
+    from benchmark_view import BenchmarkResultsDialog
+
+    dialog = BenchmarkResultsDialog(QueueingRunner(), "flash")
+    yield dialog
+    dialog.close()
+
+
+def test_reopening_shows_the_newest_run(dialog):
+    dialog.show()
+    assert dialog.table.rowCount() == 0
+    dialog.hide()
+    save_results([RUN, dict(RUN, mode="Server")])
+    dialog.show()
+    assert dialog.table.rowCount() == 2
+
+
+def test_running_benchmark_survives_reopening(dialog):
+    dialog.show()
+    dialog.run_benchmark()
+    dialog.hide()
+    dialog.show()
+    assert dialog.summary_label.text().startswith("Benchmark running")
+    name, callback = dialog.runner.jobs[-1]
+    assert name == "sched_benchmark"
+    callback(CommandResult(["sched_benchmark.py"], returncode=0))
+    assert not dialog.running and dialog.run_button.isEnabled()
+
+
+def test_set_scheduler(dialog):
+    assert dialog.run_button.text() == "Benchmark flash Modes"
+    dialog.set_scheduler(None)
+    assert dialog.run_button.text() == "Benchmark All Modes"
+
+
+def test_main_window_reuses_the_dialog(main_window):
+    status_updates = []
+    main_window.update_status = lambda: status_updates.append(1)
+    main_window.set_scheduler_list(["flash", "lavd"])
+    main_window.show_benchmark_results()
+    first = main_window.benchmark_dialog
+    assert first.runner is main_window.runner
+    first.close()
+    main_window.scheduler_combo.setCurrentIndex(1)
+    main_window.show_benchmark_results()
+    assert main_window.benchmark_dialog is first
+    assert first.run_button.text() == "Benchmark lavd Modes"
+    first.close()
+    # finished is connected once, not once per opening
+    assert len(status_updates) == 2
@@ -0,0 +1,175 @@
+# test_command_runner.py
+#
+# CommandRunner runs jobs one at a time in submission order, cancels and times out the commands it
+# runs, and reports each busy period once. Keyed coalescing: while the single worker is busy,
+# repeated requests for the same key collapse to the latest intent and identical ones share one run.
+
+import os
+import threading
+import time
+
+import pytest
+
+from scx_process import CommandResult
+
+
+@pytest.fixture
+def runner(qapp):
+    from command_runner import CommandRunner
+
+    runner = CommandRunner()
+    yield runner
+    runner.shutdown()
+
+
+def wait_idle(qapp, runner, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while runner.is_busy() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.001)
+    assert not runner.is_busy()
+
+
+def blocker(runner):
+    """Occupies the worker until the returned event is set."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def block(cancel_event):
+        started.set()
+        release.wait(5)
+        return CommandResult(["block"], returncode=0)
+
+    runner.submit("block", block)
+    assert started.wait(5)
+    return release
+
+
+def recording(calls, name):
+    def func(cancel_event):
+        calls.append(name)
+        return CommandResult([name], returncode=0)
+
+    return func
+
+
+def test_jobs_run_one_at_a_time_in_submit_order(qapp, runner):
+    calls, active, overlaps = [], [], []
+
+    def job(name):
+        def func(cancel_event):
+            active.append(name)
+            overlaps.append(len(active))
+            time.sleep(0.01)
+            calls.append(name)
+            active.remove(name)
+            return CommandResult([name], returncode=0)
+
+        return func
+
+    names = [f"job{index}" for index in range(8)]
+    for name in names:
+        runner.submit(name, job(name))
+    wait_idle(qapp, runner)
+    assert calls == names
+    assert max(overlaps) == 1
+
+
+def test_cancelling_a_running_job_kills_its_process(qapp, runner, tmp_path):
+    pid_file = tmp_path / "pid"
+    results = []
+    job_id = runner.submit_command(["sh", "-c", f"echo $$ > {pid_file}; exec sleep 30"], results.append)
+    deadline = time.monotonic() + 5
+    while not (pid_file.exists() and pid_file.read_text().strip()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pid = int(pid_file.read_text())
+
+    runner.cancel(job_id)
+    wait_idle(qapp, runner)
+    assert results[0].cancelled
+    assert results[0].duration < 5
+    # Killed and reaped by run_command
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_run_command_times_out():
+    from scx_process import run_command
+
+    start = time.monotonic()
+    result = run_command(["sleep", "30"], timeout=0.3)
+    assert result.timed_out and not result.ok
+    assert result.error_text() == "Command timed out."
+    assert time.monotonic() - start < 5
+
+
+def test_busy_changed_once_per_busy_period(qapp, runner):
+    states = []
+    runner.busy_changed.connect(states.append)
+    for _ in range(2):
+        release = blocker(runner)
+        runner.submit("a", recording([], "a"))
+        release.set()
+        wait_idle(qapp, runner)
+    assert states == [True, False, True, False]
+
+
+def test_dropping_the_only_queued_job_keeps_the_busy_period(qapp, runner):
+    states, calls = [], []
+    runner.busy_changed.connect(states.append)
+    # Occupy the worker outside the runner's bookkeeping, so the keyed job below is the only one
+    # the runner knows about and is still queued when it gets superseded
+    release, started = threading.Event(), threading.Event()
+    runner.pool.start(lambda: (started.set(), release.wait(5)))
+    assert started.wait(5)
+    runner.submit("flash", recording(calls, "flash"), key="apply", signature="flash")
+    runner.submit("lavd", recording(calls, "lavd"), key="apply", signature="lavd")
+    release.set()
+    wait_idle(qapp, runner)
+    assert calls == ["lavd"] and runner.dropped_count == 1
+    assert states == [True, False]
+
+
+def test_only_the_latest_intent_runs(qapp, runner):
+    calls, results = [], []
+    release = blocker(runner)
+    for name in ("flash", "lavd", "bpfland"):
+        runner.submit(name, recording(calls, name), results.append, key="apply", signature=name)
+    release.set()
+    wait_idle(qapp, runner)
+    assert calls == ["bpfland"]
+    assert [result.command for result in results] == [["bpfland"]]
+    assert runner.dropped_count == 2
+
+
+def test_identical_requests_share_one_run(qapp, runner):
+    calls, results = [], []
+    release = blocker(runner)
+    for _ in range(5):
+        runner.submit("stop", recording(calls, "stop"), results.append, key="apply", signature="stop")
+    release.set()
+    wait_idle(qapp, runner)
+    assert calls == ["stop"]
+    assert len(results) == 5 and runner.coalesced_count == 4
+
+
+def test_other_keys_and_unkeyed_jobs_all_run(qapp, runner):
+    calls = []
+    release = blocker(runner)
+    runner.submit("a", recording(calls, "a"), key="apply", signature="a")
+    runner.submit("refresh", recording(calls, "refresh"), key="status", signature="get")
+    runner.submit("plain", recording(calls, "plain"))
+    runner.submit("plain", recording(calls, "plain"))
+    release.set()
+    wait_idle(qapp, runner)
+    assert calls == ["a", "refresh", "plain", "plain"]
+
+
+def test_cancelled_job_reports_cancelled(qapp, runner):
+    results = []
+    release = blocker(runner)
+    job_id = runner.submit("switch", recording([], "switch"), results.append)
+    runner.cancel(job_id)
+    release.set()
+    wait_idle(qapp, runner)
+    assert results[0].cancelled
@@ -0,0 +1,77 @@
+# test_configurator_status.py
+#
+# The status indicator and running_scheduler show the scheduler's short name, whether the
+# monitor read the versioned ops name from sysfs or a plain name from the backend.
+
+from types import SimpleNamespace
+
+import pytest
+
+from scx_backend import NO_SCHEDULER_TEXT
+from status_monitor import SchedulerState
+
+scxctl_configurator = pytest.importorskip("scxctl_configurator")
+SchedulerSelector = scxctl_configurator.SchedulerSelector
+
+
+@pytest.mark.parametrize("state, text", [
+    (SchedulerState("bpfland_1.0.14_g6c7a7e5_x86_64_unknown_linux_gnu", source="sysfs"), "Scheduler Status: BPFLAND"),
+    (SchedulerState("lavd", source="scxctl"), "Scheduler Status: LAVD"),
+    (SchedulerState(None, source="sysfs"), "Scheduler Status: DISABLED"),
+    (SchedulerState(error="sched_ext is not available."), "ERROR: sched_ext is not available."),
+])
+def test_format_status(state, text):
+    assert SchedulerSelector.format_status(None, state) == text
+
+
+@pytest.mark.parametrize("status_text, name", [
+    ("rusty_1.0.12_x86_64", "rusty"),
+    ("running flash in gaming mode", "flash"),
+    (NO_SCHEDULER_TEXT, None),
+    ("", None),
+])
+def test_running_scheduler(status_text, name):
+    assert SchedulerSelector.running_scheduler(SimpleNamespace(current_status_text=status_text)) == name
+
+
+def test_import_defers_optional_modules():
+    import subprocess
+    import sys
+
+    deferred = ["flag_schema", "telemetry_view", "profiles", "scheduler_log", "scheduler_cache"]
+    code = ("import sys, scxctl_configurator; "
+            f"print(','.join(name for name in {deferred!r} if name in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=scxctl_configurator.__file__.rsplit("/", 1)[0],
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == ""
+
+
+def test_failed_connect_shows_no_backend_state(qapp, monkeypatch, tmp_path):
+    import time
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+
+    def create_backend():
+        raise RuntimeError("scxctl not found")
+
+    monkeypatch.setattr(scxctl_configurator, "create_backend", create_backend)
+    window = SchedulerSelector()
+    try:
+        deadline = time.monotonic() + 5
+        while not window.is_interactive and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.001)
+        assert window.is_interactive
+        assert window.backend is None and window.status_monitor is None
+        assert window.status_indicator.text().startswith("ERROR: No backend:")
+        assert "scxctl not found" in window.status_indicator.text()
+        for button in (window.select_button, window.disable_button, window.apply_profile_button,
+                       window.benchmark_button):
+            assert not button.isEnabled()
+    finally:
+        from PySide6.QtCore import QCoreApplication, QEvent
+
+        window.close()
+        window.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
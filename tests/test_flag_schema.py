@@ -0,0 +1,92 @@
+# test_flag_schema.py
+#
+# Argument validation against the compiled scheduler_data flag tables: clustered short flags,
+# attached values, exclusive groups, strict and lenient schemas, and every shipped mode.
+
+import pytest
+
+from flag_schema import compile_flags, validate_args
+from scheduler_data import SCHEDULER_OPTIONS
+from scx_core import mode_flags
+
+
+def bpfland(strict=False):
+    return compile_flags(SCHEDULER_OPTIONS["bpfland"]["Flags"], strict=strict)
+
+
+@pytest.mark.parametrize("args", [
+    "-pk",
+    "-kp -s 5000",
+    "-ks5000",
+    "-ks=5000",
+    "-s5000 -S500",
+    "-vv",
+])
+def test_clustered_short_flags(args):
+    assert bpfland(strict=True).validate(args.split()) == []
+
+
+@pytest.mark.parametrize("args, error", [
+    ("-ks", "-s expects a value"),
+    ("-ksfast", "-s expects an integer, got 'fast'"),
+    ("-pkx", "Unknown flag -pkx"),
+    ("-s-5", "-s must be >= 0, got -5"),
+])
+def test_clustered_short_flag_errors(args, error):
+    assert bpfland(strict=True).validate(args.split()) == [error]
+
+
+@pytest.mark.parametrize("args", [
+    "--slice-us=5000",
+    "--slice-us 5000",
+    "-s 5000",
+    "-s5000",
+    "--primary-domain=0-3,8",
+    "-m 0xff",
+    "-m powersave",
+])
+def test_attached_and_separate_values(args):
+    assert validate_args("bpfland", args) == []
+
+
+@pytest.mark.parametrize("args, error", [
+    ("--slice-us=", "-s expects an integer, got ''"),
+    ("--primary-domain=cpu3", "-m expects auto, performance, powersave, all, turbo, a CPU list or a hex mask, "
+                              "got 'cpu3'"),
+    ("--verbose=yes", "-v does not take a value"),
+    ("-s", "-s expects a value"),
+    ("5000", "Unexpected value '5000'"),
+])
+def test_value_errors(args, error):
+    assert validate_args("bpfland", args) == [error]
+
+
+def test_exclusive_flags_are_reported_once():
+    assert validate_args("lavd", "--performance --powersave") == [
+        "--performance cannot be combined with --powersave"]
+    errors = validate_args("lavd", "--autopilot --performance --powersave")
+    assert len(errors) == 2
+    assert errors[0] == "--autopilot cannot be combined with --performance, --powersave"
+    # Repeating a flag is not a conflict with itself
+    assert validate_args("lavd", ["--performance", "--performance"]) == []
+
+
+def test_strict_and_lenient_unknown_flags():
+    assert bpfland(strict=True).validate(["--new-flag", "3", "-p"]) == ["Unknown flag --new-flag", "Unexpected value '3'"]
+    # Lenient schemas let unknown flags (and the value after them) through
+    assert bpfland(strict=False).validate(["--new-flag", "3", "-p"]) == []
+    assert bpfland(strict=False).validate(["--new-flag", "-s", "x"]) == ["-s expects an integer, got 'x'"]
+    # Schedulers without a table accept anything
+    assert validate_args("rusty", "--whatever 1") == []
+
+
+@pytest.mark.parametrize("scheduler, mode", [
+    (scheduler, mode) for scheduler, options in SCHEDULER_OPTIONS.items() for mode in options.get("Modes", {})
+])
+def test_every_shipped_mode_validates(scheduler, mode):
+    flags = mode_flags(scheduler, mode)
+    assert flags
+    assert validate_args(scheduler, flags) == []
+    table = SCHEDULER_OPTIONS[scheduler].get("Flags")
+    if table:
+        assert compile_flags(table, strict=True).validate(flags.split()) == []
@@ -0,0 +1,71 @@
+# test_fleet.py
+#
+# Fleet rollout against the in-process FakeTransport: start-or-switch per host, retries,
+# the concurrency bound and inventory parsing.
+
+import asyncio
+
+from fleet import FakeTransport, apply_host, fleet_apply, load_inventory
+
+
+def apply_all(hosts, transport, **kwargs):
+    async def collect():
+        return [result async for result in fleet_apply(hosts, "flash", ["-m", "all"], transport, **kwargs)]
+
+    return {result.host: result for result in asyncio.run(collect())}
+
+
+def test_start_on_idle_hosts_and_switch_on_busy_ones():
+    transport = FakeTransport(latency=0, running={"busy": "lavd"})
+    results = apply_all(["idle", "busy"], transport, backoff=0)
+    assert results["idle"].action == "start" and results["busy"].action == "switch"
+    assert all(result.ok and result.attempts == 1 for result in results.values())
+    assert transport.running == {"idle": "flash", "busy": "flash"}
+    assert ("busy", ["scxctl", "switch", "--sched", "flash", "--args=-m,all"]) in transport.calls
+
+
+def test_unreachable_host_is_retried_then_reported():
+    transport = FakeTransport(latency=0, fail_times={"flaky": 2, "down": 99})
+    results = apply_all(["flaky", "down", "fine"], transport, retries=2, backoff=0)
+    assert results["flaky"].ok and results["flaky"].attempts == 3
+    assert not results["down"].ok and results["down"].attempts == 3
+    assert results["down"].action == "get"
+    assert "Connection refused" in results["down"].error
+    assert results["fine"].ok and "down" not in transport.running
+
+
+def test_backoff_grows_between_attempts():
+    delays = []
+
+    async def sleep(seconds):
+        delays.append(seconds)
+
+    transport = FakeTransport(latency=0, fail_times={"flaky": 3})
+    result = asyncio.run(apply_host(transport, "flaky", "flash", [], retries=3, backoff=1.0, sleep=sleep))
+    assert result.ok and result.attempts == 4
+    # Jittered into [0.5, 1.0] of 1, 2 and 4 seconds
+    assert [0.5 <= delay / base <= 1.0 for delay, base in zip(delays, (1, 2, 4))] == [True] * 3
+
+
+def test_concurrency_bound():
+    class CountingTransport(FakeTransport):
+        in_flight = peak = 0
+
+        async def run(self, host, command, timeout=None):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            try:
+                return await super().run(host, command, timeout)
+            finally:
+                self.in_flight -= 1
+
+    transport = CountingTransport(latency=0.001)
+    results = apply_all([f"node{index}" for index in range(40)], transport, concurrency=8)
+    assert len(results) == 40 and all(result.ok for result in results.values())
+    assert transport.peak == 8
+
+
+def test_load_inventory(tmp_path):
+    path = tmp_path / "hosts.txt"
+    path.write_text("# rack 1\nnode1\n  admin@node2  # spare\n\nnode1\n")
+    assert load_inventory(str(path)) == ["node1", "admin@node2"]
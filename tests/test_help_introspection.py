@@ -0,0 +1,111 @@
+# test_help_introspection.py
+#
+# Flag tables generated from the scx_<name> --help fixtures in fixtures/help, the strict schemas
+# compiled from them, and the per-binary cache.
+
+import copy
+import os
+
+import pytest
+
+from flag_schema import compile_flags
+from help_introspection import introspect_schedulers, merge_into_options, parse_clap_help
+from scheduler_data import SCHEDULER_OPTIONS
+
+HELP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "help")
+
+
+def read_help(name):
+    with open(os.path.join(HELP_DIR, f"scx_{name}.txt"), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def schemas():
+    return {name: compile_flags(parse_clap_help(read_help(name)), strict=True) for name in ("bpfland", "lavd", "rusty")}
+
+
+def spec_fields(spec):
+    return spec.name, spec.long, spec.kind
+
+
+def test_bpfland_flags(schemas):
+    lookup = schemas["bpfland"].lookup
+    assert spec_fields(lookup["-s"]) == ("-s", "--slice-us", "int")
+    assert lookup["--slice-us"] is lookup["-s"]
+    assert spec_fields(lookup["-m"]) == ("-m", "--primary-domain", "domain")
+    assert spec_fields(lookup["-k"]) == ("-k", "--local-kthreads", "bool")
+    assert spec_fields(lookup["--disable-smt"]) == ("--disable-smt", None, "bool")
+    assert lookup["-p"].description == "Enable per-CPU tasks prioritization."
+    # Help and version are never passed through scx_loader; hidden flags are not listed
+    for flag in ("-h", "--help", "-V", "--version", "-c"):
+        assert flag not in lookup
+
+
+def test_lavd_flags_are_long_only(schemas):
+    lookup = schemas["lavd"].lookup
+    assert all(name.startswith("--") for name in lookup)
+    assert spec_fields(lookup["--performance"]) == ("--performance", None, "bool")
+    assert spec_fields(lookup["--slice-max-us"]) == ("--slice-max-us", None, "int")
+    assert spec_fields(lookup["--cpu-pref-order"]) == ("--cpu-pref-order", None, "str")
+    assert lookup["--log-level"].kind == "str"
+
+
+def test_rusty_flags(schemas):
+    lookup = schemas["rusty"].lookup
+    assert spec_fields(lookup["-i"]) == ("-i", "--interval", "float")
+    assert spec_fields(lookup["-C"]) == ("-C", "--cpumasks", "str")
+    assert spec_fields(lookup["-p"]) == ("-p", "--partial", "bool")
+    assert spec_fields(lookup["--perf"]) == ("--perf", None, "int")
+
+
+@pytest.mark.parametrize("args", [
+    "-pk", "-p -k", "-kps 5000", "-pks5000", "-s5000", "-s=5000", "-m 0xff", "--slice-us=5000 -nw",
+])
+def test_bpfland_accepts(schemas, args):
+    assert schemas["bpfland"].validate(args.split()) == []
+
+
+@pytest.mark.parametrize("args, error", [
+    ("-px", "Unknown flag -px"),
+    ("--bogus", "Unknown flag --bogus"),
+    ("-ps", "-s expects a value"),
+    ("-psfast", "-s expects an integer, got 'fast'"),
+    ("-m 0-3,8", None),
+])
+def test_bpfland_rejects(schemas, args, error):
+    errors = schemas["bpfland"].validate(args.split())
+    assert errors == ([error] if error else [])
+
+
+def test_rusty_combined_bools_and_repeated_verbose(schemas):
+    assert schemas["rusty"].validate(["-pk", "-vv", "-i", "0.5"]) == []
+    assert schemas["rusty"].validate(["-pi", "fast"]) == ["-i expects a number, got 'fast'"]
+
+
+def test_merge_keeps_hand_written_entries():
+    options = copy.deepcopy(SCHEDULER_OPTIONS)
+    generated = {name: parse_clap_help(read_help(name)) for name in ("bpfland", "rusty")}
+    merge_into_options(options, generated)
+    assert options["bpfland"]["Flags"]["-m"] == SCHEDULER_OPTIONS["bpfland"]["Flags"]["-m"]
+    assert options["bpfland"]["StrictFlags"] and options["rusty"]["StrictFlags"]
+    assert "-p" in options["rusty"]["Flags"]
+
+
+def test_introspection_runs_each_binary_once(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "runs"
+    for name in ("bpfland", "rusty"):
+        script = bin_dir / f"scx_{name}"
+        script.write_text(f"#!/bin/sh\necho {name} >> '{log}'\ncat '{HELP_DIR}/scx_{name}.txt'\n")
+        script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    cache = str(tmp_path / "help_schema.json")
+
+    first = introspect_schedulers(["bpfland", "rusty", "lavd"], cache_path=cache)
+    second = introspect_schedulers(["bpfland", "rusty", "lavd"], cache_path=cache)
+
+    assert sorted(first) == ["bpfland", "rusty"]
+    assert first == second
+    assert sorted(log.read_text().split()) == ["bpfland", "rusty"]
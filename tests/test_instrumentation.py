@@ -0,0 +1,145 @@
+# test_instrumentation.py
+#
+# The metrics Registry (bucket placement, outcome counts, last error), its Prometheus text and
+# InstrumentedBackend's wrapping of a backend's operations.
+
+import json
+
+import pytest
+
+from instrumentation import BUCKETS, InstrumentedBackend, OperationStats, Registry, instrument
+from scx_process import CommandResult
+
+
+def ok():
+    return CommandResult(["get"], returncode=0)
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+
+    def _call(self, verb, result=None):
+        self.calls.append(verb)
+        return result or ok()
+
+    def list_schedulers(self, timeout=None, cancel_event=None):
+        return self._call("list")
+
+    def get_status(self, timeout=None, cancel_event=None):
+        return self._call("get")
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._call("start", CommandResult(["start"], returncode=1, stderr="Error: BPF load failed\n"))
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        raise OSError("bus closed")
+
+    def stop(self, timeout=None, cancel_event=None):
+        return self._call("stop", CommandResult(["stop"], timed_out=True))
+
+    def scxctl_command(self, verb):
+        return ["scxctl", verb]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("seconds, index", [
+    (0.001, 0),
+    (BUCKETS[0], 0),                 # bounds are inclusive, like Prometheus 'le'
+    (0.006, 1),
+    (BUCKETS[-1], len(BUCKETS) - 1),
+    (60.0, len(BUCKETS)),            # past the last bound: +Inf
+])
+def test_histogram_bucket(seconds, index):
+    stats = OperationStats()
+    stats.record(seconds, "ok")
+    assert stats.buckets.index(1) == index and sum(stats.buckets) == 1
+
+
+def test_quantiles_are_bucket_upper_bounds():
+    stats = OperationStats()
+    assert stats.quantile(0.5) is None
+    for seconds in (0.001, 0.002, 0.003, 0.2, 60.0):
+        stats.record(seconds, "ok")
+    assert stats.quantile(0.5) == BUCKETS[0]
+    assert stats.quantile(0.8) == 0.25
+    assert stats.quantile(1.0) == float("inf")
+
+
+def test_outcomes_and_last_error():
+    registry = Registry()
+    registry.record("fake", "start", 0.01, ok())
+    registry.record("fake", "start", 0.02, CommandResult(["start"], returncode=1, stderr="Error: no such scheduler\n"))
+    registry.record("fake", "start", 0.03, CommandResult(["start"], timed_out=True))
+    registry.record("fake", "start", 0.04, CommandResult(["start"], cancelled=True))
+    registry.record("fake", "get", 0.001, exception=ValueError("bad reply"))
+
+    start = registry.snapshot()[("fake", "start")]
+    assert start["count"] == 4
+    assert start["sum_s"] == pytest.approx(0.1)
+    assert start["outcomes"] == {"ok": 1, "failed": 1, "timed_out": 1, "cancelled": 1}
+    # A later success does not clear the last error
+    assert start["last_error"] == "Command cancelled."
+    get = registry.snapshot()[("fake", "get")]
+    assert get["outcomes"]["failed"] == 1 and get["last_error"] == "ValueError: bad reply"
+
+
+def test_prometheus_text():
+    registry = Registry()
+    registry.record("loader", "switch", 0.03, ok())
+    registry.record("loader", "switch", 0.3, CommandResult(["switch"], returncode=1))
+    lines = registry.prometheus_text().splitlines()
+
+    labels = 'backend="loader",operation="switch"'
+    assert "# TYPE scxctl_backend_call_seconds histogram" in lines
+    # Buckets are cumulative and end with +Inf
+    assert f'scxctl_backend_call_seconds_bucket{{{labels},le="0.025"}} 0' in lines
+    assert f'scxctl_backend_call_seconds_bucket{{{labels},le="0.05"}} 1' in lines
+    assert f'scxctl_backend_call_seconds_bucket{{{labels},le="0.5"}} 2' in lines
+    assert f'scxctl_backend_call_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+    assert f"scxctl_backend_call_seconds_count{{{labels}}} 2" in lines
+    assert f'scxctl_backend_calls_total{{{labels},outcome="ok"}} 1' in lines
+    assert f'scxctl_backend_calls_total{{{labels},outcome="failed"}} 1' in lines
+    assert f'scxctl_backend_calls_total{{{labels},outcome="timed_out"}} 0' in lines
+
+
+def test_instrumented_backend_records_each_operation(tmp_path):
+    registry = Registry()
+    backend = FakeBackend()
+    dump = tmp_path / "metrics.json"
+    wrapped = InstrumentedBackend(backend, registry, dump_path=str(dump))
+
+    assert wrapped.get_status(timeout=5).ok
+    assert not wrapped.start("bpfland", [], timeout=5).ok
+    assert wrapped.stop().timed_out
+    with pytest.raises(OSError):
+        wrapped.switch("flash", [])
+    # Anything that is not an operation is passed straight through
+    assert wrapped.scxctl_command("list") == ["scxctl", "list"]
+    assert backend.calls == ["get", "start", "stop"]
+
+    snapshot = registry.snapshot()
+    assert set(snapshot) == {("fake", "get"), ("fake", "start"), ("fake", "stop"), ("fake", "switch")}
+    assert snapshot[("fake", "start")]["last_error"] == "Error: BPF load failed"
+    assert snapshot[("fake", "stop")]["outcomes"]["timed_out"] == 1
+    assert snapshot[("fake", "switch")]["last_error"] == "OSError: bus closed"
+
+    wrapped.close()
+    assert backend.closed
+    operations = json.loads(dump.read_text())["operations"]
+    assert [(entry["backend"], entry["operation"]) for entry in operations] == sorted(snapshot)
+
+
+def test_instrument_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setenv("SCXCTL_METRICS", "0")
+    backend = FakeBackend()
+    assert instrument(backend, default=True) is backend
+    monkeypatch.setenv("SCXCTL_METRICS", "1")
+    monkeypatch.delenv("SCXCTL_METRICS_PORT", raising=False)
+    monkeypatch.delenv("SCXCTL_METRICS_FILE", raising=False)
+    assert isinstance(instrument(backend), InstrumentedBackend)
@@ -0,0 +1,39 @@
+# test_option_panels.py
+#
+# Each scheduler keeps its own options panel; a debounced mode change only ever autofills the
+# panel it was made on, even when the scheduler selection moves on before the debouncer fires.
+
+from scheduler_data import SCHEDULER_OPTIONS
+
+
+def select(window, scheduler):
+    window.scheduler_combo.setCurrentText(scheduler)
+    window.options_update.flush()
+
+
+def test_pending_mode_change_does_not_autofill_the_next_panel(main_window):
+    main_window.set_scheduler_list(["bpfland", "lavd"])
+    select(main_window, "lavd")
+    lavd = main_window.option_panels["lavd"]
+    lavd.args_textbox.setText("--slice-max-us 3000")
+    select(main_window, "bpfland")
+    bpfland = main_window.option_panels["bpfland"]
+
+    # Pick a mode and switch scheduler before the description debouncer fires
+    bpfland.mode_combo.setCurrentIndex(1)
+    assert main_window.description_update.timer.isActive()
+    select(main_window, "lavd")
+    main_window.description_update.flush()
+
+    assert lavd.args_textbox.text() == "--slice-max-us 3000"
+    assert bpfland.args_textbox.text() == SCHEDULER_OPTIONS["bpfland"]["Modes"]["Low Latency"]["Flags"]
+    assert main_window.args_textbox is lavd.args_textbox
+
+
+def test_switching_back_keeps_in_progress_args(main_window):
+    main_window.set_scheduler_list(["bpfland", "lavd"])
+    select(main_window, "bpfland")
+    main_window.args_textbox.setText("-s 5000")
+    select(main_window, "lavd")
+    select(main_window, "bpfland")
+    assert main_window.args_textbox.text() == "-s 5000"
@@ -0,0 +1,83 @@
+# test_profiles.py
+#
+# Diff-based profile apply against a backend whose scheduler attaches a little after the call
+# returns, with enable_seq kept in a temporary file.
+
+import threading
+
+from profiles import apply_profile, load_applied
+from scx_process import CommandResult
+
+ATTACH_DELAY = 0.3
+
+
+class LateAttachBackend:
+    """Switching returns at once; enable_seq only moves ATTACH_DELAY seconds later."""
+
+    def __init__(self, enable_seq_path, running="bpfland", enable_seq=5):
+        self.enable_seq_path = enable_seq_path
+        self.running = running
+        self.enable_seq = enable_seq
+        self.calls = []
+        self.timers = []
+        self._write_seq()
+
+    def _write_seq(self):
+        with open(self.enable_seq_path, "w", encoding="utf-8") as f:
+            f.write(f"{self.enable_seq}\n")
+
+    def _attach(self, scheduler):
+        self.running = scheduler
+        self.enable_seq += 1
+        self._write_seq()
+
+    def get_status(self, timeout=None, cancel_event=None):
+        result = CommandResult(["get"], returncode=0)
+        result.scheduler = self.running
+        return result
+
+    def _apply(self, verb, scheduler, args):
+        self.calls.append((verb, scheduler, list(args)))
+        timer = threading.Timer(ATTACH_DELAY, self._attach, (scheduler,))
+        self.timers.append(timer)
+        timer.start()
+        return CommandResult([verb, scheduler], returncode=0)
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("start", scheduler, args)
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("switch", scheduler, args)
+
+
+def test_reapplying_the_same_profile_is_a_noop(tmp_path):
+    seq_path = str(tmp_path / "enable_seq")
+    applied = str(tmp_path / "applied.json")
+    backend = LateAttachBackend(seq_path)
+    profile = {"scheduler": "bpfland", "args": ["-s", "2000"]}
+
+    first = apply_profile(backend, profile, applied_file=applied, enable_seq_path=seq_path)
+    assert first.ok and first.action_verb == "switch"
+    # Recorded against the instance that attached, not the one it replaced
+    assert load_applied(applied)["enable_seq"] == 6
+
+    second = apply_profile(backend, profile, applied_file=applied, enable_seq_path=seq_path)
+    assert second.ok and second.action_verb == "noop"
+    assert backend.calls == [("switch", "bpfland", ["-s", "2000"])]
+
+
+def test_changed_args_or_restart_elsewhere_reapply(tmp_path):
+    seq_path = str(tmp_path / "enable_seq")
+    applied = str(tmp_path / "applied.json")
+    backend = LateAttachBackend(seq_path, running=None)
+    profile = {"scheduler": "flash", "args": ["-m", "all"]}
+
+    assert apply_profile(backend, profile, applied_file=applied, enable_seq_path=seq_path).action_verb == "start"
+
+    changed = dict(profile, args=["-m", "performance"])
+    assert apply_profile(backend, changed, applied_file=applied, enable_seq_path=seq_path).action_verb == "switch"
+
+    # Someone else restarted the same scheduler: the record no longer describes what runs
+    backend._attach("flash")
+    assert apply_profile(backend, changed, applied_file=applied, enable_seq_path=seq_path).action_verb == "switch"
+    assert [verb for verb, _scheduler, _args in backend.calls] == ["start", "switch", "switch"]
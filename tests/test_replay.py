@@ -0,0 +1,101 @@
+# test_replay.py
+#
+# Recording from several threads at once, and replaying a fixture through the fake scxctl both
+# in-process and as the executable ScxctlBackend runs.
+
+import json
+import os
+import sys
+import threading
+
+from replay import RecordingBackend, Replayer, load_fixture
+from scx_backend import ScxctlBackend
+from scx_process import CommandResult
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASIC = os.path.join(ROOT, "fixtures", "scxctl_basic.json")
+
+
+class StubBackend:
+    name = "stub"
+
+    def __init__(self):
+        self.closed = False
+
+    def get_status(self, timeout=None, cancel_event=None):
+        return CommandResult(["get"], returncode=0, stdout="no scx scheduler running\n")
+
+    def list_schedulers(self, timeout=None, cancel_event=None):
+        return CommandResult(["list"], returncode=0, stdout='supported schedulers: ["flash"]\n')
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return CommandResult(["start"], returncode=0)
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        return CommandResult(["switch"], returncode=0)
+
+    def stop(self, timeout=None, cancel_event=None):
+        return CommandResult(["stop"], returncode=1, stderr="not running")
+
+    def close(self):
+        self.closed = True
+
+
+def test_concurrent_calls_are_all_recorded(tmp_path):
+    path = tmp_path / "session.json"
+    recorder = RecordingBackend(StubBackend(), str(path))
+
+    def poll():
+        for _ in range(200):
+            recorder.get_status()
+
+    threads = [threading.Thread(target=poll) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    recorder.switch("flash", ["-m", "all"])
+    recorder.stop()
+    for thread in threads:
+        thread.join()
+    # Nothing is written until the session ends
+    assert not path.exists()
+
+    recorder.close()
+    assert recorder.backend.closed
+    interactions = load_fixture(str(path))["interactions"]
+    assert len(interactions) == 802
+    assert [entry["argv"] for entry in interactions if entry["argv"] != ["get"]] == [
+        ["switch", "--sched", "flash", "--args=-m,all"], ["stop"]]
+    stop = next(entry for entry in interactions if entry["argv"] == ["stop"])
+    assert (stop["returncode"], stop["stderr"]) == (1, "not running")
+
+
+def test_reads_follow_the_replayed_state_changes(tmp_path):
+    replayer = Replayer(load_fixture(BASIC), str(tmp_path / "state"))
+    assert replayer.respond(["get"])["stdout"] == "no scx scheduler running\n"
+    assert replayer.respond(["get"])["stdout"] == "no scx scheduler running\n"
+    assert replayer.respond(["start", "--sched", "bpfland"])["returncode"] == 0
+    assert replayer.respond(["get"])["stdout"] == "running bpfland in Auto mode\n"
+    # Unrecorded arguments fall back to the same verb
+    assert replayer.respond(["switch", "--sched", "lavd"])["argv"][0] == "switch"
+    assert replayer.respond(["get"])["stdout"] == "running flash in Auto mode\n"
+    assert replayer.respond(["dump"]) is None
+
+    with open(tmp_path / "state", encoding="utf-8") as f:
+        assert json.load(f)["calls"][:3] == ["get", "get", "start --sched bpfland"]
+
+
+def test_replay_as_scxctl(tmp_path, monkeypatch):
+    scxctl = tmp_path / "scxctl"
+    scxctl.write_text(f"#!/bin/sh\nexec {sys.executable} {os.path.join(ROOT, 'replay.py')} \"$@\"\n")
+    scxctl.chmod(0o755)
+    monkeypatch.setenv("SCXCTL_REPLAY_FIXTURE", BASIC)
+    monkeypatch.setenv("SCXCTL_REPLAY_STATE", str(tmp_path / "state"))
+    monkeypatch.setenv("SCXCTL_REPLAY_FAIL", "stop")
+    backend = ScxctlBackend(str(scxctl))
+
+    assert backend.list_schedulers().schedulers[:3] == ["bpfland", "cosmos", "flash"]
+    assert backend.get_status().scheduler is None
+    assert backend.start("bpfland", []).ok
+    assert backend.get_status().scheduler == "bpfland"
+    result = backend.stop()
+    assert not result.ok and "injected failure" in result.stderr
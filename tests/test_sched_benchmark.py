@@ -0,0 +1,119 @@
+# test_sched_benchmark.py
+#
+# Benchmark orchestration against a fake backend with stub workloads: the scheduler running
+# beforehand is restored whatever happens, and every run gets its own results file.
+
+import pytest
+
+import sched_benchmark
+from sched_benchmark import (
+    format_entry, latest_results_path, load_results, run_benchmarks, save_results, summarize_latency
+)
+from scx_process import CommandResult
+
+STUB_RESULTS = {"wakeup": {"p50_us": 1.0, "p99_us": 2.0, "p999_us": 3.0}}
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self, running=None, status_ok=True):
+        self.running = running
+        self.status_ok = status_ok
+        self.calls = []
+
+    def get_status(self, timeout=None, cancel_event=None):
+        result = CommandResult(["get"], returncode=0 if self.status_ok else 1)
+        if not self.status_ok:
+            result.stderr = "loader unreachable"
+        result.scheduler = self.running
+        return result
+
+    def _set(self, verb, scheduler, args):
+        self.calls.append((verb, scheduler, list(args)))
+        self.running = scheduler
+        return CommandResult([verb], returncode=0)
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._set("start", scheduler, args)
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._set("switch", scheduler, args)
+
+    def stop(self, timeout=None, cancel_event=None):
+        return self._set("stop", None, [])
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(sched_benchmark.time, "sleep", lambda seconds: None)
+
+
+def run(backend, workloads=lambda duration, threads: dict(STUB_RESULTS), baseline=False):
+    messages = []
+    results = run_benchmarks(backend, [("flash", None), ("bpfland", None)], duration=0, settle=0, threads=1,
+                             baseline=baseline, workloads=workloads, progress=messages.append)
+    return results, messages
+
+
+def test_previous_scheduler_is_restored():
+    backend = FakeBackend(running="lavd")
+    results, messages = run(backend)
+    assert [entry["ok"] for entry in results] == [True, True]
+    assert backend.calls[-1] == ("switch", "lavd", [])
+    assert backend.running == "lavd"
+    assert messages[-1] == "restoring lavd"
+
+
+def test_idle_system_is_left_idle():
+    backend = FakeBackend(running=None)
+    _results, _messages = run(backend, baseline=True)
+    assert [verb for verb, _scheduler, _args in backend.calls] == ["stop", "start", "switch", "stop"]
+    assert backend.running is None
+
+
+def test_restored_when_a_workload_fails():
+    backend = FakeBackend(running="lavd")
+
+    def workloads(duration, threads):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        run(backend, workloads)
+    assert backend.running == "lavd"
+
+
+def test_unknown_previous_state_is_not_guessed():
+    backend = FakeBackend(running="lavd", status_ok=False)
+    _results, messages = run(backend)
+    assert backend.calls[-1][1] == "bpfland"
+    assert messages[-1].startswith("not restoring")
+
+
+def test_each_run_gets_its_own_file(monkeypatch):
+    clock = iter([1000.0, 1000.5, 2000.0])
+    monkeypatch.setattr(sched_benchmark.time, "time", lambda: next(clock))
+    paths = [save_results([{"scheduler": name}]) for name in ("first", "second", "third")]
+    assert len(set(paths)) == 3
+    assert latest_results_path() == paths[-1]
+    assert load_results()["results"] == [{"scheduler": "third"}]
+    assert load_results(paths[0])["results"] == [{"scheduler": "first"}]
+
+
+def test_no_results_yet():
+    assert latest_results_path() is None
+    assert load_results() is None
+
+
+def test_short_run_prints_missing_percentiles_as_dashes():
+    entry = {"scheduler": "flash", "mode": None, "ok": True, "wakeup": summarize_latency([]),
+             "pipe": dict(summarize_latency([]), ops_per_s=0.0), "cpu": {"ops_per_s": 1234.0}}
+    line = format_entry(entry)
+    assert "wakeup p50/p99/p99.9 -/-/- us" in line
+    assert "pipe p99 - us 0/s" in line and "cpu 1.23e+03 ops/s" in line
+
+
+def test_failed_run_line():
+    line = format_entry({"scheduler": "lavd", "mode": "Gaming", "ok": False, "error": "start failed"})
+    assert line.startswith("lavd       Gaming") and line.endswith("FAILED: start failed")
@@ -0,0 +1,115 @@
+# test_scheduler_cache.py
+#
+# The scheduler list cache: hits, invalidation when scxctl or scx_loader changes, bounds on
+# corrupt or oversized files, and the atomic JSON write shared by every cache in the app.
+
+import json
+import os
+
+import pytest
+
+from scheduler_cache import (MAX_CACHE_BYTES, binary_fingerprint, load_cached_schedulers, save_schedulers,
+                             write_json_atomic)
+
+NAMES = ["bpfland", "flash", "lavd"]
+
+
+def write_binary(bin_dir, name, version):
+    path = bin_dir / name
+    # Each --version run leaves a mark, so tests can tell when the cache forked
+    path.write_text(f"#!/bin/sh\necho run >> {bin_dir}/{name}.runs\necho '{name} {version}'\n")
+    path.chmod(0o755)
+    return path
+
+
+def version_runs(bin_dir):
+    return sum(len(runs.read_text().splitlines()) for runs in bin_dir.glob("*.runs"))
+
+
+@pytest.fixture
+def bin_dir(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    write_binary(bin_dir, "scxctl", "1.0.14")
+    write_binary(bin_dir, "scx_loader", "1.0.14")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    return bin_dir
+
+
+def test_fingerprint_has_the_versions(bin_dir):
+    fingerprint = binary_fingerprint()
+    assert fingerprint["scx_loader"][0] == str(bin_dir / "scx_loader")
+    assert fingerprint["scx_loader"][3] == "scx_loader 1.0.14"
+    assert fingerprint["scxctl"][3] == "scxctl 1.0.14"
+
+
+def test_cache_hit_without_forking(bin_dir, tmp_path):
+    path = str(tmp_path / "schedulers.json")
+    assert save_schedulers(NAMES, path)
+    assert version_runs(bin_dir) == 2
+
+    assert load_cached_schedulers(path) == NAMES
+    # Saving again with unchanged binaries reuses the stored versions
+    assert save_schedulers(NAMES + ["rusty"], path)
+    assert load_cached_schedulers(path) == NAMES + ["rusty"]
+    assert version_runs(bin_dir) == 2
+
+
+def test_changed_binary_invalidates(bin_dir, tmp_path):
+    path = str(tmp_path / "schedulers.json")
+    save_schedulers(NAMES, path)
+    write_binary(bin_dir, "scx_loader", "1.0.15-upgraded")
+    assert load_cached_schedulers(path) is None
+
+    assert save_schedulers(NAMES, path)
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f)["fingerprint"]["scx_loader"][3] == "scx_loader 1.0.15-upgraded"
+    assert load_cached_schedulers(path) == NAMES
+
+
+def test_previous_format_is_ignored(bin_dir, tmp_path):
+    path = tmp_path / "schedulers.json"
+    fingerprint = {name: entry[:3] for name, entry in binary_fingerprint().items()}
+    path.write_text(json.dumps({"format": 1, "fingerprint": fingerprint, "schedulers": NAMES}))
+    assert load_cached_schedulers(str(path)) is None
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    "[]",
+    json.dumps({"format": 2, "fingerprint": "x", "schedulers": NAMES}),
+    " " * (MAX_CACHE_BYTES + 1) + "{}",
+])
+def test_corrupt_or_oversized_files_are_ignored(bin_dir, tmp_path, content):
+    path = tmp_path / "schedulers.json"
+    path.write_text(content)
+    assert load_cached_schedulers(str(path)) is None
+    # And are simply replaced on the next save
+    assert save_schedulers(NAMES, str(path))
+    assert load_cached_schedulers(str(path)) == NAMES
+
+
+def test_out_of_bounds_lists_are_not_cached(bin_dir, tmp_path):
+    path = str(tmp_path / "schedulers.json")
+    assert not save_schedulers([], path)
+    assert not save_schedulers(["x" * 65], path)
+    assert not save_schedulers([f"sched{index}" for index in range(129)], path)
+    assert not os.path.exists(path)
+
+
+def test_atomic_write_keeps_the_old_file_on_failure(tmp_path):
+    path = tmp_path / "data.json"
+    assert write_json_atomic(str(path), {"a": 1}) is None
+    assert path.read_text() == '{"a":1}'
+
+    # Fails halfway through serialising: the old content stays and no temporary file is left
+    error = write_json_atomic(str(path), {"a": 2, "b": object()})
+    assert error and "not JSON serializable" in error
+    assert json.loads(path.read_text()) == {"a": 1}
+    assert os.listdir(tmp_path) == ["data.json"]
+
+    assert write_json_atomic(str(tmp_path / "new" / "dir" / "x.json"), [1], indent=2) is None
+    assert json.loads((tmp_path / "new" / "dir" / "x.json").read_text()) == [1]
+    blocked = tmp_path / "file"
+    blocked.write_text("")
+    assert write_json_atomic(str(blocked / "x.json"), [1]) is not None
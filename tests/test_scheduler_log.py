@@ -0,0 +1,203 @@
+# test_scheduler_log.py
+#
+# The log pane's ring buffer and its incremental filter index, the follower reading a live
+# source, and the list model turning buffer changes into row inserts and removals.
+
+import sys
+import time
+
+import pytest
+
+from scheduler_log import MAX_LINE_LENGTH, LogBuffer, LogFollower
+
+
+def rows(buffer):
+    return [buffer.row(index) for index in range(buffer.rows())]
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_ring_evicts_the_oldest_lines():
+    buffer = LogBuffer(capacity=3)
+    buffer.extend(f"line {index}" for index in range(5))
+    assert len(buffer) == 3
+    assert rows(buffer) == ["line 2", "line 3", "line 4"]
+    assert buffer.row(3) is None and buffer.row(-1) is None
+    assert buffer.counters() == (0, 5, 2)
+
+
+def test_long_lines_are_cut():
+    buffer = LogBuffer(capacity=2)
+    buffer.append("x" * (MAX_LINE_LENGTH + 50))
+    assert len(buffer.row(0)) == MAX_LINE_LENGTH and buffer.row(0).endswith("…")
+
+
+def test_filter_narrows_from_previous_matches_and_widens_from_all_lines():
+    buffer = LogBuffer(capacity=10)
+    buffer.extend(["dispatch cpu0", "DISPATCH cpu1", "enqueue cpu0", "dispatch cpu2"])
+
+    buffer.set_filter("dispatch")
+    assert rows(buffer) == ["dispatch cpu0", "DISPATCH cpu1", "dispatch cpu2"]
+
+    # Narrowing rescans only the previous matches
+    buffer.lines[2] = "dispatch cpu0 (not a candidate any more)"
+    buffer.set_filter("dispatch cpu")
+    assert rows(buffer) == ["dispatch cpu0", "DISPATCH cpu1", "dispatch cpu2"]
+    buffer.set_filter("dispatch cpu0")
+    assert rows(buffer) == ["dispatch cpu0"]
+
+    # Widening scans every line again
+    buffer.set_filter("cpu0")
+    assert rows(buffer) == ["dispatch cpu0", "dispatch cpu0 (not a candidate any more)"]
+    buffer.set_filter("")
+    assert buffer.rows() == 4
+
+    # New lines are tested as they arrive
+    buffer.set_filter("cpu2")
+    buffer.extend(["enqueue cpu2", "enqueue cpu3"])
+    assert rows(buffer) == ["dispatch cpu2", "enqueue cpu2"]
+
+
+def test_eviction_while_filtered():
+    buffer = LogBuffer(capacity=4)
+    buffer.set_filter("keep")
+    buffer.extend(["keep 0", "drop 1", "keep 2", "drop 3"])
+    generation = buffer.filter_generation
+    assert buffer.counters() == (generation, 2, 0)
+
+    buffer.extend(["keep 4", "drop 5"])
+    # "keep 0" and "drop 1" fell out; only the former was in the index
+    assert rows(buffer) == ["keep 2", "keep 4"]
+    assert buffer.counters() == (generation, 3, 1)
+
+    buffer.extend(["keep 6", "keep 7", "keep 8", "keep 9"])
+    assert rows(buffer) == ["keep 6", "keep 7", "keep 8", "keep 9"]
+    _generation, added, evicted = buffer.counters()
+    assert added - evicted == buffer.rows() == 4
+
+
+def test_clear_resets_rows_and_counters():
+    buffer = LogBuffer(capacity=4)
+    buffer.extend(["a", "b", "c"])
+    generation = buffer.filter_generation
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.rows() == 0
+    assert buffer.filter_generation == generation + 1
+    buffer.append("d")
+    assert rows(buffer) == ["d"]
+
+    buffer.set_filter("e")
+    buffer.extend(["e1", "f", "e2"])
+    buffer.clear()
+    assert buffer.rows() == 0 and buffer.counters()[1:] == (0, 0)
+
+
+def test_follower_reads_a_growing_file(tmp_path):
+    path = tmp_path / "scheduler.log"
+    path.write_text("first\n")
+    buffer = LogBuffer(capacity=100)
+    follower = LogFollower(["tail", "-n", "+1", "-s", "0.1", "-f", str(path)], buffer)
+    follower.start()
+    try:
+        assert wait_until(lambda: rows(buffer) == ["first"])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("second\r\nthird\n")
+        assert wait_until(lambda: rows(buffer) == ["first", "second", "third"])
+    finally:
+        follower.stop()
+    assert not follower.running
+    # A requested stop is not reported as an exit
+    assert rows(buffer)[-1] == "third"
+
+
+def test_follower_reports_exit_and_missing_commands():
+    buffer = LogBuffer(capacity=10)
+    follower = LogFollower([sys.executable, "-c", "import sys; print('done'); sys.stdout.write('tail'); sys.exit(3)"],
+                           buffer)
+    follower.start()
+    assert wait_until(lambda: not follower.running)
+    assert rows(buffer) == ["done", "tail", f"[{sys.executable} exited with code 3.]"]
+
+    follower = LogFollower(["scx_does_not_exist", "--monitor", "1"], buffer)
+    follower.start()
+    assert wait_until(lambda: not follower.running)
+    assert buffer.row(buffer.rows() - 1) == "[scx_does_not_exist command not found.]"
+
+
+@pytest.fixture
+def model(qapp):
+    from log_view import LogListModel
+
+    buffer = LogBuffer(capacity=5)
+    model = LogListModel(buffer)
+    changes = []
+    model.rowsInserted.connect(lambda parent, first, last: changes.append(("insert", first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: changes.append(("remove", first, last)))
+    model.modelReset.connect(lambda: changes.append(("reset",)))
+    model.sync()
+    changes.clear()
+    yield buffer, model, changes
+    model.deleteLater()
+
+
+def model_rows(model):
+    return [model.data(model.index(row)) for row in range(model.rowCount())]
+
+
+def test_model_inserts_and_removes_incrementally(model):
+    buffer, model, changes = model
+    buffer.extend(["a", "b", "c"])
+    assert model.sync()
+    assert changes == [("insert", 0, 2)]
+    assert model_rows(model) == ["a", "b", "c"]
+
+    changes.clear()
+    buffer.extend(["d", "e", "f", "g"])
+    assert model.sync()
+    # Two lines fell out of the ring at the top, four arrived at the bottom
+    assert changes == [("remove", 0, 1), ("insert", 1, 4)]
+    assert model_rows(model) == ["c", "d", "e", "f", "g"]
+
+    changes.clear()
+    assert not model.sync()
+    assert changes == []
+
+
+def test_model_resets_on_filter_clear_and_overrun(model):
+    buffer, model, changes = model
+    buffer.extend(["a1", "b1", "a2"])
+    model.sync()
+    changes.clear()
+
+    buffer.set_filter("a")
+    model.sync()
+    assert changes == [("reset",)] and model_rows(model) == ["a1", "a2"]
+
+    # Rows added while filtered are inserted, not reset
+    changes.clear()
+    buffer.append("a3")
+    model.sync()
+    assert changes == [("insert", 2, 2)]
+
+    changes.clear()
+    buffer.clear()
+    model.sync()
+    assert changes == [("reset",)] and model.rowCount() == 0
+
+    # More lines than the buffer holds arrived between syncs
+    buffer.set_filter("")
+    model.sync()
+    buffer.extend(f"line {index}" for index in range(3))
+    model.sync()
+    changes.clear()
+    buffer.extend(f"burst {index}" for index in range(12))
+    model.sync()
+    assert changes == [("reset",)]
+    assert model_rows(model) == [f"burst {index}" for index in range(7, 12)]
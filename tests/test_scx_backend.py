@@ -0,0 +1,183 @@
+# test_scx_backend.py
+#
+# LoaderBackend against a stand-in org.scx.Loader on a private session bus, and the fallback to
+# scxctl when the loader cannot be reached.
+
+import os
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+jeepney = pytest.importorskip("jeepney")
+
+from jeepney import HeaderFields, MessageType, new_error, new_method_return
+from jeepney.bus_messages import message_bus
+from jeepney.io.blocking import open_dbus_connection
+
+import scx_backend
+from scx_backend import LOADER_BUS_NAME, LoaderBackend, ScxctlBackend, create_backend
+
+
+class FakeLoader:
+    """Answers the scx_loader calls the backend makes; serves one bus connection on a thread."""
+
+    def __init__(self, supported=("scx_bpfland", "scx_flash", "scx_lavd")):
+        self.supported = list(supported)
+        self.current = "unknown"
+        self.mode = 0
+        self.calls = []
+        self.fail = set()
+        self.connection = open_dbus_connection(bus="SESSION")
+        self.connection.send_and_get_reply(message_bus.RequestName(LOADER_BUS_NAME))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _reply(self, message):
+        fields = message.header.fields
+        member = fields.get(HeaderFields.member)
+        self.calls.append((member, message.body))
+        if member in self.fail:
+            return new_error(message, "org.scx.Loader.Error", "s", (f"{member} refused",))
+        if member == "Get":
+            _interface, name = message.body
+            values = {
+                "CurrentScheduler": ("s", self.current),
+                "SchedulerMode": ("u", self.mode),
+                "SupportedSchedulers": ("as", self.supported),
+            }
+            return new_method_return(message, "v", (values[name],))
+        if member in ("StartScheduler", "SwitchScheduler", "StartSchedulerWithArgs", "SwitchSchedulerWithArgs"):
+            self.current = message.body[0]
+            self.mode = message.body[1] if member.endswith("Scheduler") else 0
+            return new_method_return(message)
+        if member == "StopScheduler":
+            self.current = "unknown"
+            return new_method_return(message)
+        return new_error(message, "org.freedesktop.DBus.Error.UnknownMethod", "s", (member,))
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                message = self.connection.receive(timeout=0.1)
+            except TimeoutError:
+                continue
+            except OSError:
+                return
+            if message.header.message_type == MessageType.method_call:
+                self.connection.send(self._reply(message))
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.connection.close()
+
+
+@pytest.fixture
+def session_bus(monkeypatch):
+    """A private dbus-daemon; DBUS_SESSION_BUS_ADDRESS points at it for the test."""
+    daemon = shutil.which("dbus-daemon")
+    if daemon is None:
+        pytest.skip("dbus-daemon is not installed")
+    proc = subprocess.Popen([daemon, "--session", "--nofork", "--print-address=1"],
+                            stdout=subprocess.PIPE, text=True)
+    address = proc.stdout.readline().strip()
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", address)
+    monkeypatch.setenv("SCX_LOADER_BUS", "SESSION")
+    monkeypatch.delenv("SCX_BACKEND", raising=False)
+    monkeypatch.delenv("SCXCTL_RECORD", raising=False)
+    yield address
+    proc.terminate()
+    proc.wait()
+
+
+@pytest.fixture
+def loader(session_bus):
+    fake = FakeLoader()
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def backend(loader):
+    backend = LoaderBackend.connect()
+    yield backend
+    backend.close()
+
+
+def test_get_status_idle_and_running(backend, loader):
+    result = backend.get_status()
+    assert result.ok and result.scheduler is None
+    assert result.stdout == scx_backend.NO_SCHEDULER_TEXT
+
+    loader.current, loader.mode = "scx_bpfland", 1
+    result = backend.get_status()
+    assert result.ok
+    assert result.scheduler == "bpfland"
+    assert result.stdout == "running bpfland in Gaming mode"
+
+
+def test_list_schedulers_uses_short_names(backend):
+    result = backend.list_schedulers()
+    assert result.ok
+    assert result.schedulers == ["bpfland", "flash", "lavd"]
+
+
+def test_start_switch_stop(backend, loader):
+    assert backend.start("bpfland", []).ok
+    assert loader.calls[-1] == ("StartScheduler", ("scx_bpfland", 0))
+
+    assert backend.switch("flash", ["-m", "all"]).ok
+    assert loader.calls[-1] == ("SwitchSchedulerWithArgs", ("scx_flash", ["-m", "all"]))
+    assert backend.get_status().scheduler == "flash"
+
+    assert backend.stop().ok
+    assert loader.calls[-1] == ("StopScheduler", ())
+    assert backend.get_status().scheduler is None
+
+
+def test_loader_error_is_reported_not_raised(backend, loader):
+    loader.fail.add("SwitchScheduler")
+    result = backend.switch("lavd", [])
+    assert not result.ok
+    assert result.returncode == 1
+    assert result.error_text() == "SwitchScheduler refused"
+
+
+def test_create_backend_prefers_the_loader(loader):
+    backend = create_backend()
+    try:
+        assert isinstance(backend, LoaderBackend)
+    finally:
+        backend.close()
+
+
+def test_create_backend_falls_back_without_the_loader(session_bus):
+    # The bus is up but nobody owns org.scx.Loader
+    assert isinstance(create_backend(), ScxctlBackend)
+
+
+def test_create_backend_falls_back_without_a_bus(monkeypatch, tmp_path):
+    monkeypatch.setenv("SCX_LOADER_BUS", "SESSION")
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", f"unix:path={tmp_path}/no-such-bus")
+    monkeypatch.delenv("SCX_BACKEND", raising=False)
+    monkeypatch.delenv("SCXCTL_RECORD", raising=False)
+    assert isinstance(create_backend(), ScxctlBackend)
+
+
+def test_scx_backend_env_forces_scxctl(loader, monkeypatch):
+    monkeypatch.setenv("SCX_BACKEND", "scxctl")
+    assert isinstance(create_backend(), ScxctlBackend)
+
+
+def test_scxctl_backend_reports_short_name(tmp_path):
+    fake = tmp_path / "scxctl"
+    fake.write_text("#!/bin/sh\necho 'running lavd in auto mode'\n")
+    fake.chmod(0o755)
+    result = ScxctlBackend(str(fake)).get_status()
+    assert result.ok
+    assert result.scheduler == "lavd"
+    assert result.stdout.strip() == "running lavd in auto mode"
+    assert os.path.basename(result.command[0]) == "scxctl"
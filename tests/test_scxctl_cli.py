@@ -0,0 +1,85 @@
+# test_scxctl_cli.py
+#
+# The headless CLI's reports for successful, failed and dry-run calls against a fake backend.
+
+from scx_process import CommandResult
+from scxctl_cli import build_parser, run
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self, running=None, status_error=None, fail=()):
+        self.running = running
+        self.status_error = status_error
+        self.fail = set(fail)
+        self.calls = []
+
+    def get_status(self, timeout=None, cancel_event=None):
+        if self.status_error:
+            return CommandResult(["get"], returncode=1, stderr=self.status_error)
+        result = CommandResult(["get"], returncode=0, stdout=f"running {self.running}" if self.running else "")
+        result.scheduler = self.running
+        return result
+
+    def _call(self, verb, scheduler, args):
+        self.calls.append(verb)
+        if verb in self.fail:
+            return CommandResult([verb], returncode=1, stderr=f"{verb} refused")
+        self.running = scheduler
+        return CommandResult([verb], returncode=0)
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._call("start", scheduler, args)
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._call("switch", scheduler, args)
+
+    def stop(self, timeout=None, cancel_event=None):
+        return self._call("stop", None, [])
+
+
+def cli(backend, *argv):
+    return run(build_parser().parse_args(list(argv)), backend)
+
+
+def test_switch_success_and_failure():
+    report = cli(FakeBackend(running="bpfland"), "--sched", "flash")
+    assert report["ok"] and report["action"] == "switch"
+    assert report["message"] == "Scheduler successfully switched to: flash"
+
+    report = cli(FakeBackend(running="bpfland", fail={"switch"}), "--sched", "flash")
+    assert not report["ok"]
+    assert report["error"] == "switch refused"
+    assert "successfully" not in report["message"]
+
+
+def test_stop_failure_is_not_reported_as_success():
+    report = cli(FakeBackend(running="lavd", fail={"stop"}), "--stop")
+    assert not report["ok"]
+    assert report["message"] == "ERROR: stop refused"
+
+
+def test_dry_run_reports_the_planned_action_without_calling():
+    backend = FakeBackend(running=None)
+    report = cli(backend, "--sched", "flash", "--mode", "Server", "--dry-run")
+    assert report["ok"] and report["action"] == "start" and report["running"] is None
+    assert backend.calls == []
+
+
+def test_dry_run_reports_an_unreadable_state():
+    backend = FakeBackend(status_error="loader unreachable")
+    report = cli(backend, "--sched", "flash", "--dry-run")
+    assert not report["ok"]
+    assert report["action"] is None
+    assert report["error"] == "Could not read the current scheduler state: loader unreachable"
+    assert backend.calls == []
+
+    report = cli(backend, "--stop", "--dry-run")
+    assert not report["ok"] and "loader unreachable" in report["error"]
+
+
+def test_stop_dry_run_when_idle():
+    report = cli(FakeBackend(running=None), "--stop", "--dry-run")
+    assert report["ok"]
+    assert report["message"] == "No scheduler is running; nothing to stop."
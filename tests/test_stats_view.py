@@ -0,0 +1,47 @@
+# test_stats_view.py
+#
+# The backend statistics dialog only refreshes while it is shown, and the main window reuses it.
+
+import pytest
+
+
+@pytest.fixture
+def dialog(qapp):
+    from stats_view import BackendStatsDialog
+
+    dialog = BackendStatsDialog(True)
+    yield dialog
+    dialog.close()
+
+
+def test_timer_runs_only_while_shown(qapp, dialog):
+    assert not dialog.timer.isActive()
+    dialog.show()
+    qapp.processEvents()
+    assert dialog.timer.isActive()
+    dialog.hide()
+    qapp.processEvents()
+    assert not dialog.timer.isActive()
+    dialog.show()
+    assert dialog.timer.isActive()
+
+
+def test_disabled_instrumentation_has_no_timer(qapp):
+    from stats_view import BackendStatsDialog
+
+    dialog = BackendStatsDialog(False)
+    dialog.show()
+    dialog.hide()
+    assert dialog.timer is None
+    assert "off" in dialog.summary_label.text()
+
+
+def test_main_window_reuses_the_dialog(main_window):
+    main_window.show_backend_stats()
+    first = main_window.stats_dialog
+    first.close()
+    main_window.show_backend_stats()
+    assert main_window.stats_dialog is first and first.isVisible()
+    assert first.timer.isActive()
+    first.close()
+    assert not first.timer.isActive()
@@ -0,0 +1,113 @@
+# test_status_monitor.py
+#
+# StatusMonitor on a temporary sysfs root: the poll interval backs off from MIN_INTERVAL to
+# MAX_INTERVAL while nothing changes, drops back on a change or poke(), and listeners only hear
+# about changes.
+
+import threading
+
+import pytest
+
+from scx_process import CommandResult
+from status_monitor import MAX_INTERVAL, MIN_INTERVAL, SchedulerState, StatusMonitor, read_sysfs_state
+
+
+def set_state(root, state, ops=None):
+    (root / "root").mkdir(parents=True, exist_ok=True)
+    (root / "state").write_text(f"{state}\n")
+    if ops is not None:
+        (root / "root" / "ops").write_text(f"{ops}\n")
+
+
+@pytest.fixture
+def sysfs(tmp_path):
+    set_state(tmp_path, "disabled")
+    return tmp_path
+
+
+@pytest.fixture
+def changes():
+    return []
+
+
+@pytest.fixture
+def monitor(sysfs, changes):
+    return StatusMonitor(changes.append, sysfs_root=str(sysfs))
+
+
+def test_read_sysfs_state(sysfs):
+    assert read_sysfs_state(str(sysfs)) == SchedulerState(None)
+    set_state(sysfs, "enabled", "bpfland_1.0.14_x86_64")
+    assert read_sysfs_state(str(sysfs)).name == "bpfland_1.0.14_x86_64"
+    set_state(sysfs, "enabling")
+    assert read_sysfs_state(str(sysfs)).name == "enabling"
+    assert read_sysfs_state(str(sysfs / "missing")) is None
+
+
+def test_backs_off_to_max_while_unchanged(monitor, changes):
+    intervals = [monitor.check() for _ in range(7)]
+    assert intervals == [MIN_INTERVAL, 1.0, 2.0, 4.0, MAX_INTERVAL, MAX_INTERVAL, MAX_INTERVAL]
+    assert changes == [SchedulerState(None)]
+
+
+def test_change_resets_to_min_and_is_reported_once(monitor, changes, sysfs):
+    for _ in range(5):
+        monitor.check()
+    assert monitor.interval == MAX_INTERVAL
+
+    set_state(sysfs, "enabled", "lavd_1.0.6_x86_64")
+    assert monitor.check() == MIN_INTERVAL
+    assert monitor.check() == 2 * MIN_INTERVAL
+    assert [state.name for state in changes] == [None, "lavd_1.0.6_x86_64"]
+
+
+def test_same_name_from_another_source_is_not_a_change(monitor, changes):
+    monitor.check()
+    monitor.last_state = SchedulerState(None, source="scxctl")
+    monitor.check()
+    assert len(changes) == 1
+
+
+def test_poke_resets_the_interval(monitor):
+    for _ in range(5):
+        monitor.check()
+    monitor.poke()
+    assert monitor.interval == MIN_INTERVAL
+
+
+def test_falls_back_to_the_backend(tmp_path):
+    class Backend:
+        name = "scxctl"
+
+        def get_status(self, timeout):
+            result = CommandResult(["get"], returncode=0)
+            result.scheduler = "flash"
+            return result
+
+    changes = []
+    StatusMonitor(changes.append, Backend(), sysfs_root=str(tmp_path / "missing")).check()
+    assert changes == [SchedulerState("flash")] and changes[0].source == "scxctl"
+    StatusMonitor(changes.append, sysfs_root=str(tmp_path / "missing")).check()
+    assert changes[1].error == "sched_ext is not available."
+
+
+def test_thread_reports_changes_until_stopped(sysfs):
+    changed = threading.Event()
+    changes = []
+
+    def on_change(state):
+        changes.append(state)
+        changed.set()
+
+    monitor = StatusMonitor(on_change, sysfs_root=str(sysfs), min_interval=0.01, max_interval=0.05)
+    monitor.start()
+    try:
+        assert changed.wait(5)
+        changed.clear()
+        set_state(sysfs, "enabled", "rusty_1.0.12_x86_64")
+        monitor.poke()
+        assert changed.wait(5)
+    finally:
+        monitor.stop()
+    assert [state.name for state in changes] == [None, "rusty_1.0.12_x86_64"]
+    assert monitor._thread is None
@@ -0,0 +1,98 @@
+# test_telemetry.py
+#
+# The procfs parsers and the sampler's rates, on snapshots recorded from a real machine
+# (fixtures/proc) plus a synthetic schedstat, since that machine had none.
+
+import os
+
+import pytest
+
+from telemetry import TelemetrySampler, parse_pressure, parse_schedstat, parse_stat
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "proc")
+
+SCHEDSTAT = b"""version 15
+timestamp 4295149541
+cpu0 0 0 0 0 0 0 1000000 2000000 30
+domain0 00000003 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0
+cpu1 0 0 0 0 0 0 5000000 4000000 70
+"""
+
+
+def snapshot(name, *parts):
+    with open(os.path.join(FIXTURES, name, *parts), "rb") as f:
+        return f.read()
+
+
+STAT_2CPU = b"""cpu  300 0 100 1600 0 0 0 0 0 0
+cpu0 200 0 50 750 0 0 0 0 0 0
+cpu1 100 0 50 850 0 0 0 0 0 0
+intr 0
+ctxt 1000
+"""
+
+
+def test_parse_stat():
+    # cpu0 54453 0 11730 650709 1184 0 37 9754: idle and iowait are not busy
+    assert parse_stat(snapshot("vm-1cpu-0", "stat")) == (2951585, [(75974, 727867)])
+    assert parse_stat(snapshot("vm-1cpu-1", "stat")) == (2953471, [(75980, 727968)])
+    assert parse_stat(STAT_2CPU) == (1000, [(250, 1000), (150, 1000)])
+    assert parse_stat(b"cpu  1 2 3 4\n") == (0, [])
+
+
+def test_parse_pressure():
+    data = snapshot("vm-1cpu-0", "pressure", "cpu")
+    assert parse_pressure(data) == 175009726
+    assert parse_pressure(data, "avg10") == 2.16
+    assert parse_pressure(b"") == 0
+
+
+def test_parse_schedstat():
+    assert parse_schedstat(SCHEDSTAT) == (6000000, 100, 2)
+    assert parse_schedstat(b"version 15\n") == (0, 0, 0)
+
+
+def test_sampler_on_recorded_snapshots():
+    counters = []
+    for name in ("vm-1cpu-0", "vm-1cpu-1"):
+        sampler = TelemetrySampler(proc_root=os.path.join(FIXTURES, name))
+        counters.append(sampler.read_counters())
+        sampler.close()
+    # That kernel has no schedstat; the other sources still work
+    assert counters[0]["schedstat"] is None
+    assert counters[0]["ctxt"] == 2951585
+
+    counters[0]["time"], counters[1]["time"] = 100.0, 102.0
+    sampler = TelemetrySampler(capacity=4, proc_root=os.path.join(FIXTURES, "vm-1cpu-0"))
+    assert len(sampler.cpu_busy) == 1
+    assert not sampler.add_counters(counters[0])
+    assert sampler.add_counters(counters[1])
+    assert sampler.series["context_switches"].latest() == (2953471 - 2951585) / 2
+    assert sampler.series["cpu_pressure"].latest() == pytest.approx((175046438 - 175009726) / 1e6 / 2 * 100)
+    assert sampler.series["runqueue_delay"].latest() == 0.0
+    # 6 of 101 jiffies busy
+    assert sampler.cpu_busy[0].latest() == pytest.approx(600 / 101)
+    assert sampler.series["cpu_busy_max"].latest() == sampler.cpu_busy[0].latest()
+    sampler.close()
+
+
+def test_per_cpu_busy(tmp_path):
+    (tmp_path / "stat").write_bytes(STAT_2CPU)
+    sampler = TelemetrySampler(capacity=4, proc_root=str(tmp_path))
+    assert len(sampler.cpu_busy) == 2
+    sampler.add_counters({"time": 0.0, "schedstat": None, "ctxt": 1000, "cpus": [(250, 1000), (150, 1000)],
+                          "pressure": None})
+    # cpu0 fully busy, cpu1 a quarter; a hotplugged cpu2 has no ring and is ignored
+    sampler.add_counters({"time": 1.0, "schedstat": None, "ctxt": 1100,
+                          "cpus": [(350, 1100), (175, 1100), (50, 100)], "pressure": None})
+    assert [ring.latest() for ring in sampler.cpu_busy] == [100.0, 25.0]
+    assert sampler.series["cpu_busy_max"].latest() == 100.0
+    sampler.close()
+
+
+def test_runqueue_delay_is_per_cpu_per_second():
+    sampler = TelemetrySampler(capacity=4, proc_root=os.path.join(FIXTURES, "missing"))
+    sampler.add_counters({"time": 0.0, "schedstat": (0, 0, 2), "ctxt": None, "cpus": None, "pressure": None})
+    sampler.add_counters({"time": 0.5, "schedstat": (6000000, 100, 2), "ctxt": None, "cpus": None,
+                          "pressure": None})
+    assert sampler.series["runqueue_delay"].latest() == pytest.approx(6.0)
@@ -0,0 +1,64 @@
+# test_topology.py
+#
+# Topology parsing and the hints derived from it, on the fixture trees from sysfs_trees.py.
+
+import pytest
+
+from flag_schema import validate_args
+from tests.sysfs_trees import build_tree, hybrid_desktop, two_ccx_server
+from topology import (
+    format_cpu_list, format_cpu_mask, mode_hint, parse_cpu_list, parse_cpu_mask, read_topology, suggest_masks
+)
+
+
+@pytest.fixture
+def desktop(tmp_path):
+    build_tree(str(tmp_path), hybrid_desktop())
+    return read_topology(str(tmp_path))
+
+
+@pytest.fixture
+def server(tmp_path):
+    build_tree(str(tmp_path), two_ccx_server(cores_per_ccx=4))
+    return read_topology(str(tmp_path))
+
+
+def test_cpu_list_round_trip():
+    assert parse_cpu_list("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+    assert format_cpu_list([11, 0, 1, 2, 3, 8, 10]) == "0-3,8,10-11"
+
+
+def test_cpu_mask_round_trip():
+    assert format_cpu_mask([0, 1, 2, 3, 8]) == "0x10f"
+    assert parse_cpu_mask("0x10f") == [0, 1, 2, 3, 8]
+    assert parse_cpu_mask(format_cpu_mask(range(64, 128))) == list(range(64, 128))
+
+
+def test_hybrid_desktop(desktop):
+    assert len(desktop) == 24
+    assert desktop.hybrid and desktop.smt
+    assert format_cpu_list(desktop.performance_cpus) == "0-15"
+    assert format_cpu_list(desktop.efficiency_cpus) == "16-23"
+    assert mode_hint("bpfland", "Power Save", desktop)[0] == 1
+
+
+def test_server_llc_masks(server):
+    assert not server.hybrid
+    assert len(server.llc_groups()) == 2
+    assert mode_hint("flash", "Power Save", server)[0] == -1
+    masks = dict(suggest_masks("flash", server))
+    # LLC 0 holds cores 0-3 and their siblings 8-11
+    assert masks["LLC 0"] == ["-m", "0xf0f"]
+    assert masks["LLC 1"] == ["-m", "0xf0f0"]
+
+
+def test_suggested_masks_survive_scxctl_and_the_schema(desktop):
+    for _label, args in suggest_masks("bpfland", desktop):
+        # scxctl joins --args with commas; a mask must not contain one
+        assert "," not in args[1]
+        assert validate_args("bpfland", " ".join(args)) == []
+
+
+def test_no_suggestions_without_a_domain_flag_or_topology(desktop, tmp_path):
+    assert suggest_masks("no-such-scheduler", desktop) == []
+    assert suggest_masks("bpfland", read_topology(str(tmp_path / "missing"))) == []
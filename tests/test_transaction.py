@@ -0,0 +1,269 @@
+# test_transaction.py
+#
+# SwitchTransaction against a fake sched_ext sysfs tree whose ops attach some time after the
+# backend call returns, the way scx_loader behaves.
+
+import os
+
+from scx_process import CommandResult
+from status_monitor import SchedulerState, read_enable_seq, read_sysfs_state
+from transaction import COMMITTED, FAILED, ROLLED_BACK, HealthProbe, SwitchTransaction, scheduler_from_ops
+
+
+class FakeSysfs:
+    """A /sys/kernel/sched_ext lookalike with state, root/ops and enable_seq."""
+
+    def __init__(self, root, ops=None, enable_seq=1):
+        self.root = str(root)
+        os.makedirs(os.path.join(self.root, "root"), exist_ok=True)
+        self.set(ops, enable_seq)
+
+    def _write(self, name, value):
+        with open(os.path.join(self.root, name), "w", encoding="utf-8") as f:
+            f.write(f"{value}\n")
+
+    def set(self, ops=None, enable_seq=None, state=None):
+        self._write("state", state or ("enabled" if ops else "disabled"))
+        if ops:
+            self._write("root/ops", ops)
+        if enable_seq is not None:
+            self._write("enable_seq", enable_seq)
+
+    def enable_seq(self):
+        return read_enable_seq(os.path.join(self.root, "enable_seq"))
+
+
+class FakeClock:
+    """Stands in for time.sleep; runs scheduled sysfs changes once enough polls have passed."""
+
+    def __init__(self):
+        self.ticks = 0
+        self.events = []
+
+    def at(self, tick, action):
+        self.events.append((tick, action))
+
+    def sleep(self, _seconds):
+        self.ticks += 1
+        for tick, action in self.events:
+            if tick == self.ticks:
+                action()
+
+
+class FakeBackend:
+    """Start/switch/stop return immediately; the sysfs side is driven by the FakeClock."""
+
+    name = "fake"
+
+    def __init__(self, sysfs, on_apply=None):
+        self.sysfs = sysfs
+        self.on_apply = on_apply or (lambda verb, scheduler, args: None)
+        self.calls = []
+
+    def get_status(self, timeout=None, cancel_event=None):
+        result = CommandResult(["get"], returncode=0)
+        state = read_sysfs_state(self.sysfs.root)
+        result.scheduler = scheduler_from_ops(state.name) if state else None
+        return result
+
+    def _apply(self, verb, scheduler, args):
+        self.calls.append((verb, scheduler, list(args)))
+        if verb == "stop" and read_sysfs_state(self.sysfs.root).name is None:
+            return CommandResult([verb], returncode=1, stderr="no scheduler running")
+        self.on_apply(verb, scheduler, args)
+        return CommandResult([verb, scheduler or ""], returncode=0)
+
+    def start(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("start", scheduler, args)
+
+    def switch(self, scheduler, args, timeout=None, cancel_event=None):
+        return self._apply("switch", scheduler, args)
+
+    def stop(self, timeout=None, cancel_event=None):
+        return self._apply("stop", None, ())
+
+
+def make_transaction(sysfs, clock, backend, settle_s=2.0, latency_threshold_us=None, latency_us=0.0,
+                     read_state=None):
+    probe = HealthProbe(
+        backend,
+        observe_s=0.5,
+        settle_s=settle_s,
+        latency_threshold_us=latency_threshold_us,
+        read_state=read_state or (lambda: read_sysfs_state(sysfs.root)),
+        read_enable_seq=sysfs.enable_seq,
+        measure_latency=lambda: latency_us,
+        sleep=clock.sleep,
+    )
+    return SwitchTransaction(backend, probe)
+
+
+def attach_after(clock, sysfs, ticks=1):
+    """on_apply that attaches the requested scheduler a few polls later, as the loader does."""
+
+    def on_apply(verb, scheduler, args):
+        if scheduler is None:
+            sysfs.set(state="disabled")
+            return
+        enable_seq = sysfs.enable_seq() + 1
+        clock.at(clock.ticks + ticks, lambda: sysfs.set(ops=f"{scheduler}_1.0.0_x86_64", enable_seq=enable_seq))
+
+    return on_apply
+
+
+def test_late_attach_is_committed(tmp_path):
+    sysfs = FakeSysfs(tmp_path, ops="bpfland_1.0.14_x86_64", enable_seq=5)
+    clock = FakeClock()
+
+    def on_apply(verb, scheduler, args):
+        # Old ops stay visible, then the loader tears them down, then the new ones attach
+        clock.at(clock.ticks + 2, lambda: sysfs.set(state="disabling", ops="bpfland_1.0.14_x86_64"))
+        clock.at(clock.ticks + 3, lambda: sysfs.set(state="disabled"))
+        clock.at(clock.ticks + 5, lambda: sysfs.set(state="enabling", ops="flash_1.2.0_x86_64"))
+        clock.at(clock.ticks + 8, lambda: sysfs.set(ops="flash_1.2.0_x86_64", enable_seq=6))
+
+    backend = FakeBackend(sysfs, on_apply)
+    result = make_transaction(sysfs, clock, backend).run("flash", ["-m", "all"])
+
+    assert result.ok, result.error_text()
+    assert result.state == COMMITTED
+    assert backend.calls == [("switch", "flash", ["-m", "all"])]
+    assert clock.ticks >= 8
+
+
+def test_same_scheduler_waits_for_a_new_instance(tmp_path):
+    sysfs = FakeSysfs(tmp_path, ops="bpfland_1.0.14_x86_64", enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs, lambda *args: clock.at(clock.ticks + 4, lambda: sysfs.set(
+        ops="bpfland_1.0.14_x86_64", enable_seq=6)))
+
+    result = make_transaction(sysfs, clock, backend).run("bpfland", ["-s", "2000"])
+
+    assert result.state == COMMITTED
+    # The observe window only started once enable_seq moved
+    assert clock.ticks >= 4 + 5
+
+
+def test_never_attaching_rolls_back(tmp_path):
+    sysfs = FakeSysfs(tmp_path, ops="bpfland_1.0.14_x86_64", enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs, lambda verb, scheduler, args: sysfs.set(state="disabled"))
+
+    result = make_transaction(sysfs, clock, backend, settle_s=1.0).run("flash", [])
+
+    assert not result.ok
+    assert result.state == ROLLED_BACK
+    assert "did not attach within 1 s" in result.error_text()
+    # sched_ext is disabled by now, so bpfland has to be started, not switched to
+    assert backend.calls[-1] == ("start", "bpfland", [])
+
+
+def test_ejected_after_attach_rolls_back(tmp_path):
+    sysfs = FakeSysfs(tmp_path, ops="bpfland_1.0.14_x86_64", enable_seq=5)
+    clock = FakeClock()
+
+    def on_apply(verb, scheduler, args):
+        if scheduler == "flash":
+            clock.at(clock.ticks + 1, lambda: sysfs.set(ops="flash_1.2.0_x86_64", enable_seq=6))
+            clock.at(clock.ticks + 3, lambda: sysfs.set(state="disabled"))
+
+    backend = FakeBackend(sysfs, on_apply)
+    result = make_transaction(sysfs, clock, backend).run("flash", [])
+
+    assert result.state == ROLLED_BACK
+    assert "disabled after the switch" in result.error_text()
+    assert backend.calls[-1] == ("start", "bpfland", [])
+
+
+def test_slow_wakeups_roll_back_to_the_previous_scheduler(tmp_path):
+    sysfs = FakeSysfs(tmp_path, ops="bpfland_1.0.14_x86_64", enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs)
+    backend.on_apply = attach_after(clock, sysfs)
+    transaction = make_transaction(sysfs, clock, backend, latency_threshold_us=5000, latency_us=12000)
+
+    result = transaction.run("flash", ["-m", "all"])
+
+    assert result.state == ROLLED_BACK
+    assert result.error_text() == ("Health check failed (wakeup latency p99 12000 us exceeds 5000 us); "
+                                   "restored bpfland.")
+    assert backend.calls == [("switch", "flash", ["-m", "all"]), ("switch", "bpfland", [])]
+
+
+def test_fast_wakeups_commit(tmp_path):
+    sysfs = FakeSysfs(tmp_path, ops="bpfland_1.0.14_x86_64", enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs)
+    backend.on_apply = attach_after(clock, sysfs)
+    result = make_transaction(sysfs, clock, backend, latency_threshold_us=5000, latency_us=800).run("flash", [])
+    assert result.state == COMMITTED
+
+
+def test_rollback_from_idle_stops_the_new_scheduler(tmp_path):
+    sysfs = FakeSysfs(tmp_path, enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs)
+    backend.on_apply = attach_after(clock, sysfs)
+
+    result = make_transaction(sysfs, clock, backend, latency_threshold_us=5000, latency_us=12000).run("flash", [])
+
+    assert result.state == ROLLED_BACK
+    assert result.error_text().endswith("; stopped sched_ext.")
+    assert backend.calls == [("start", "flash", []), ("stop", None, [])]
+
+
+def test_rollback_to_idle_when_already_idle(tmp_path):
+    # Nothing ran before, and the new scheduler never came up: idle is already the old state
+    sysfs = FakeSysfs(tmp_path, enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs)
+
+    result = make_transaction(sysfs, clock, backend, settle_s=1.0).run("flash", [])
+
+    assert result.state == ROLLED_BACK
+    assert result.error_text().endswith("; sched_ext is stopped.")
+    assert backend.calls == [("start", "flash", [])]
+
+
+def test_unknown_previous_state_is_not_rolled_back(tmp_path):
+    sysfs = FakeSysfs(tmp_path, ops="bpfland_1.0.14_x86_64", enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs)
+    reads = []
+
+    def read_state():
+        reads.append(None)
+        if len(reads) == 1:
+            return SchedulerState(error="permission denied", source="sysfs")
+        return read_sysfs_state(sysfs.root)
+
+    result = make_transaction(sysfs, clock, backend, settle_s=1.0, read_state=read_state).run("flash", [])
+
+    assert result.state == FAILED
+    assert "not rolling back" in result.error_text() and "permission denied" in result.error_text()
+    assert backend.calls == [("switch", "flash", [])]
+
+
+def test_names_are_compared_exactly(tmp_path):
+    # 'lavd' is a substring of 'lavd2'; a substring check took one for the other
+    sysfs = FakeSysfs(tmp_path, ops="lavd_1.0.0_x86_64", enable_seq=5)
+    clock = FakeClock()
+    backend = FakeBackend(sysfs, lambda verb, scheduler, args: clock.at(
+        clock.ticks + 1, lambda: sysfs.set(ops="lavd2_0.1.0_x86_64", enable_seq=6)))
+
+    result = make_transaction(sysfs, clock, backend, settle_s=1.0).run("lavd", [])
+
+    assert result.state == ROLLED_BACK
+    assert "lavd did not attach" in result.error_text() and "lavd2 is loaded" in result.error_text()
+
+
+def test_wakeup_p99_uses_the_benchmark_probe(monkeypatch):
+    import sched_benchmark
+    import transaction
+
+    samples = [float(us) for us in range(1, 201)]
+    monkeypatch.setattr(transaction, "wakeup_samples", lambda duration: list(reversed(samples)))
+    # Nearest rank: ceil(0.99 * 200) = 198th smallest
+    assert transaction.sample_wakeup_p99() == sched_benchmark.percentile(samples, 0.99) == 198.0
+    monkeypatch.setattr(transaction, "wakeup_samples", lambda duration: [])
+    assert transaction.sample_wakeup_p99() == 0.0
@@ -0,0 +1,315 @@
+# topology.py
+#
+# CPU topology from /sys/devices/system/cpu, read once per session into flat arrays, and the
+# hardware-dependent hints derived from it: which modes apply to this machine and which CPU masks
+# are worth passing to schedulers that take a primary domain. GUI-free.
+#
+# read_topology() takes the sysfs root, so it can be pointed at a fixture tree:
+#
+#   python topology.py --root /path/to/fixture/sys/devices/system/cpu --sched bpfland
+
+import os
+from array import array
+
+from scheduler_data import SCHEDULER_OPTIONS
+
+SYSFS_CPU_ROOT = "/sys/devices/system/cpu"
+
+# Kernel default capacity of the fastest CPU
+FULL_CAPACITY = 1024
+
+# A CPU counts as an efficiency core below this fraction of the fastest CPU's capacity/frequency.
+EFFICIENCY_RATIO = 0.8
+
+# Mode flags whose effect depends on the hardware, and what each needs.
+_POWERSAVE_FLAGS = {("-m", "powersave"), ("--primary-domain", "powersave"), ("--powersave", None),
+                    ("--sched-mode", "efficiency")}
+_PERFORMANCE_FLAGS = {("-m", "performance"), ("--primary-domain", "performance"),
+                      ("--sched-mode", "performance")}
+_PHYSICAL_CORE_FLAGS = {("--performance", None)}
+_LOCALITY_FLAGS = {("-a", None)}
+
+
+def parse_cpu_list(text):
+    """'0-3,8,10-11' -> [0, 1, 2, 3, 8, 10, 11]."""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def format_cpu_list(cpus):
+    """[0, 1, 2, 3, 8] -> '0-3,8'."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+
+def format_cpu_mask(cpus):
+    """[0, 1, 2, 3, 8] -> '0x10f'. scxctl joins --args with commas, so masks go out as hex, not lists."""
+    mask = 0
+    for cpu in cpus:
+        mask |= 1 << cpu
+    return hex(mask)
+
+
+def parse_cpu_mask(text):
+    """'0x10f' -> [0, 1, 2, 3, 8]."""
+    mask = int(text, 16)
+    return [cpu for cpu in range(mask.bit_length()) if mask >> cpu & 1]
+
+
+def _read(path, default=None):
+    try:
+        with open(path, encoding="ascii") as f:
+            return f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return default
+
+
+def _read_int(path, default=-1):
+    value = _read(path)
+    try:
+        return int(value) if value is not None else default
+    except ValueError:
+        return default
+
+
+def _llc_id(cpu_dir):
+    """First CPU sharing the highest-level data/unified cache, or -1 when unknown."""
+    cache_dir = os.path.join(cpu_dir, "cache")
+    try:
+        entries = os.listdir(cache_dir)
+    except OSError:
+        return -1
+    best_level, llc = -1, -1
+    for entry in entries:
+        if not entry.startswith("index"):
+            continue
+        index_dir = os.path.join(cache_dir, entry)
+        if _read(os.path.join(index_dir, "type")) == "Instruction":
+            continue
+        level = _read_int(os.path.join(index_dir, "level"))
+        shared = _read(os.path.join(index_dir, "shared_cpu_list"))
+        if level > best_level and shared:
+            best_level, llc = level, parse_cpu_list(shared)[0]
+    return llc
+
+
+class Topology:
+    """
+    One entry per online CPU, stored column-wise in arrays; index i describes CPU cpus[i].
+    Missing sysfs attributes read as -1 (capacity defaults to FULL_CAPACITY).
+    """
+
+    FIELDS = ("cpus", "capacity", "package", "core", "cluster", "llc", "smt_rank", "max_khz", "min_khz")
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, array('i'))
+        self._speeds = None
+
+    def __len__(self):
+        return len(self.cpus)
+
+    def _select(self, predicate):
+        return [self.cpus[i] for i in range(len(self.cpus)) if predicate(i)]
+
+    def speeds(self):
+        """
+        Relative speed of each CPU in 0..1: capacity when the kernel reports differences,
+        else the maximum frequency. Computed once.
+        """
+        if self._speeds is None:
+            if len(self.cpus) and min(self.capacity) != max(self.capacity):
+                top = max(self.capacity)
+                self._speeds = array('d', (value / top for value in self.capacity))
+            elif len(self.cpus) and min(self.max_khz) > 0:
+                top = max(self.max_khz)
+                self._speeds = array('d', (value / top for value in self.max_khz))
+            else:
+                self._speeds = array('d', [1.0] * len(self.cpus))
+        return self._speeds
+
+    @property
+    def hybrid(self):
+        return any(speed < EFFICIENCY_RATIO for speed in self.speeds())
+
+    @property
+    def performance_cpus(self):
+        speeds = self.speeds()
+        return self._select(lambda i: speeds[i] >= EFFICIENCY_RATIO)
+
+    @property
+    def efficiency_cpus(self):
+        speeds = self.speeds()
+        return self._select(lambda i: speeds[i] < EFFICIENCY_RATIO)
+
+    @property
+    def smt(self):
+        return any(rank > 0 for rank in self.smt_rank)
+
+    @property
+    def physical_cpus(self):
+        """One CPU per physical core (the first SMT sibling)."""
+        return self._select(lambda i: self.smt_rank[i] == 0)
+
+    def llc_groups(self):
+        """{llc id: [cpus]} in CPU order; a single group when caches are not reported."""
+        groups = {}
+        for i, cpu in enumerate(self.cpus):
+            groups.setdefault(self.llc[i], []).append(cpu)
+        return groups
+
+    def summary(self):
+        parts = [f"{len(self.cpus)} CPUs"]
+        if self.hybrid:
+            parts.append(f"{len(self.performance_cpus)} performance + {len(self.efficiency_cpus)} efficiency")
+        if self.smt:
+            parts.append(f"SMT, {len(self.physical_cpus)} physical cores")
+        llcs = len(self.llc_groups())
+        if llcs > 1:
+            parts.append(f"{llcs} LLC domains")
+        return ", ".join(parts)
+
+
+def read_topology(root=SYSFS_CPU_ROOT):
+    """Reads every online CPU under root. Returns an empty Topology when root is unreadable."""
+    topology = Topology()
+    online = _read(os.path.join(root, "online"))
+    if online:
+        cpus = parse_cpu_list(online)
+    else:
+        try:
+            cpus = sorted(int(name[3:]) for name in os.listdir(root) if name.startswith("cpu") and name[3:].isdigit())
+        except OSError:
+            return topology
+
+    for cpu in cpus:
+        cpu_dir = os.path.join(root, f"cpu{cpu}")
+        topo_dir = os.path.join(cpu_dir, "topology")
+        siblings = _read(os.path.join(topo_dir, "thread_siblings_list"))
+        sibling_cpus = parse_cpu_list(siblings) if siblings else [cpu]
+
+        topology.cpus.append(cpu)
+        topology.capacity.append(_read_int(os.path.join(cpu_dir, "cpu_capacity"), FULL_CAPACITY))
+        topology.package.append(_read_int(os.path.join(topo_dir, "physical_package_id")))
+        topology.core.append(_read_int(os.path.join(topo_dir, "core_id")))
+        topology.cluster.append(_read_int(os.path.join(topo_dir, "cluster_id")))
+        topology.llc.append(_llc_id(cpu_dir))
+        topology.smt_rank.append(sibling_cpus.index(cpu) if cpu in sibling_cpus else 0)
+        topology.max_khz.append(_read_int(os.path.join(cpu_dir, "cpufreq", "cpuinfo_max_freq")))
+        topology.min_khz.append(_read_int(os.path.join(cpu_dir, "cpufreq", "cpuinfo_min_freq")))
+    return topology
+
+
+_cached = None
+
+
+def get_topology():
+    """The host topology, read on first use and kept for the rest of the session."""
+    global _cached
+    if _cached is None:
+        _cached = read_topology()
+    return _cached
+
+
+# --- MODE HINTS ---
+
+def _flag_pairs(flags):
+    """'-m powersave -d' -> {('-m', 'powersave'), ('-d', None), ('-m', None)}."""
+    tokens = flags.split()
+    pairs = set()
+    for index, token in enumerate(tokens):
+        pairs.add((token, None))
+        if index + 1 < len(tokens):
+            pairs.add((token, tokens[index + 1]))
+    return pairs
+
+
+def mode_hint(scheduler, mode_name, topology):
+    """
+    Returns (score, note) for one mode on this machine: score 1 when the hardware the mode targets
+    is present, -1 when it is missing (the mode then behaves much like the default), 0 when the mode
+    does not depend on the topology. note is None for score 0.
+    """
+    flags = SCHEDULER_OPTIONS.get(scheduler, {}).get("Modes", {}).get(mode_name, {}).get("Flags", "")
+    pairs = _flag_pairs(flags)
+    if not len(topology):
+        return 0, None
+
+    if pairs & _POWERSAVE_FLAGS:
+        if topology.hybrid:
+            return 1, f"{len(topology.efficiency_cpus)} efficiency cores found ({format_cpu_list(topology.efficiency_cpus)})."
+        return -1, "No efficiency cores on this machine; all CPUs are equally fast."
+    if pairs & _PERFORMANCE_FLAGS:
+        if topology.hybrid:
+            return 1, f"Prefers the {len(topology.performance_cpus)} performance cores ({format_cpu_list(topology.performance_cpus)})."
+        return 0, None
+    if pairs & _PHYSICAL_CORE_FLAGS:
+        if topology.smt:
+            return 1, f"SMT detected: {len(topology.physical_cpus)} physical cores behind {len(topology)} CPUs."
+        return -1, "No SMT on this machine; every CPU is already a physical core."
+    if pairs & _LOCALITY_FLAGS:
+        llcs = len(topology.llc_groups())
+        if llcs > 1:
+            return 1, f"{llcs} last-level cache domains; cache locality matters here."
+        return -1, "All CPUs share one last-level cache; little locality to gain."
+    return 0, None
+
+
+def rank_modes(scheduler, topology):
+    """Mode names with the ones that fit this machine first; ties keep the scheduler_data order."""
+    modes = list(SCHEDULER_OPTIONS.get(scheduler, {}).get("Modes", {}))
+    return sorted(modes, key=lambda mode: -mode_hint(scheduler, mode, topology)[0])
+
+
+def domain_flag(scheduler):
+    """The scheduler's flag that takes a CPU list (Type 'domain'), or None."""
+    for name, spec in SCHEDULER_OPTIONS.get(scheduler, {}).get("Flags", {}).items():
+        if spec.get("Type") == "domain":
+            return name
+    return None
+
+
+def suggest_masks(scheduler, topology):
+    """[(label, [flag, hex mask])] worth trying as the primary domain on this machine."""
+    flag = domain_flag(scheduler)
+    if flag is None or len(topology) < 2:
+        return []
+    suggestions = []
+    if topology.hybrid:
+        suggestions.append(("Performance cores", [flag, format_cpu_mask(topology.performance_cpus)]))
+        suggestions.append(("Efficiency cores", [flag, format_cpu_mask(topology.efficiency_cpus)]))
+    if topology.smt:
+        suggestions.append(("One thread per core", [flag, format_cpu_mask(topology.physical_cpus)]))
+    groups = topology.llc_groups()
+    if len(groups) > 1:
+        for index, cpus in enumerate(groups.values()):
+            suggestions.append((f"LLC {index}", [flag, format_cpu_mask(cpus)]))
+    return suggestions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show the CPU topology model and the hints derived from it.")
+    parser.add_argument("--root", default=SYSFS_CPU_ROOT, help="sysfs cpu directory (or a fixture copy)")
+    parser.add_argument("--sched", action="append", help="scheduler to show hints for (repeatable)")
+    options = parser.parse_args()
+
+    model = read_topology(options.root)
+    print(model.summary())
+    for scheduler in options.sched or list(SCHEDULER_OPTIONS):
+        for mode in rank_modes(scheduler, model):
+            score, note = mode_hint(scheduler, mode, model)
+            print(f"{scheduler:10} {mode:22} {score:+d} {note or ''}")
+        for label, args in suggest_masks(scheduler, model):
+            print(f"{scheduler:10} mask: {label}: {' '.join(args)} (CPUs {format_cpu_list(parse_cpu_mask(args[1]))})")
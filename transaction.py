@@ -0,0 +1,228 @@
+# transaction.py
+#
+# Transactional scheduler switch: remember what was running, apply, probe the result and
+# roll back automatically if the new scheduler is unhealthy. GUI-free.
+
+import time
+
+from sched_benchmark import percentile, wakeup_samples
+from scx_core import apply_scheduler
+from scx_process import DEFAULT_TIMEOUT, CommandResult
+from status_monitor import ATTACH_TIMEOUT, read_enable_seq, read_sysfs_state
+
+# Transaction states, in the order a successful run goes through them.
+IDLE = "idle"
+APPLYING = "applying"
+PROBING = "probing"
+COMMITTED = "committed"
+ROLLING_BACK = "rolling back"
+ROLLED_BACK = "rolled back"
+FAILED = "failed"
+
+# Probe defaults
+SETTLE_S = ATTACH_TIMEOUT
+OBSERVE_S = 2.0
+POLL_INTERVAL = 0.1
+LATENCY_SAMPLE_S = 0.5
+LATENCY_THRESHOLD_US = 5000.0
+
+
+# sysfs sched_ext states between "disabled" and "enabled"
+TRANSITIONAL_STATES = ("enabling", "disabling")
+
+
+def scheduler_from_ops(ops):
+    """sysfs ops names carry a version suffix, e.g. 'bpfland_1.0.14_g...' -> 'bpfland'."""
+    return ops.split("_", 1)[0] if ops else ops
+
+
+def sample_wakeup_p99(duration=LATENCY_SAMPLE_S):
+    """p99 oversleep (us) of 1 ms sleeps over duration seconds, measured like the benchmark's."""
+    p99 = percentile(sorted(wakeup_samples(duration)), 0.99)
+    return 0.0 if p99 is None else p99
+
+
+class HealthProbe:
+    """
+    Post-switch checks, all within a bounded time:
+      1. within settle_s, the requested scheduler attaches: the loaded ops name it and, when the
+         caller passed the enable_seq read before applying, the kernel's enable counter moved on
+         (scx_loader returns before the BPF ops attach, so the old ops, "enabling" or a short
+         "disabled" gap are still pending at first),
+      2. for observe_s after that, sched_ext stays enabled with those ops (catches the kernel
+         watchdog ejecting it shortly after load),
+      3. a wakeup-latency sample stays under latency_threshold_us (skipped when None).
+    read_state, read_enable_seq, measure_latency and sleep are injectable for tests.
+    """
+
+    def __init__(self, backend=None, observe_s=OBSERVE_S, latency_threshold_us=LATENCY_THRESHOLD_US,
+                 read_state=read_sysfs_state, measure_latency=sample_wakeup_p99, sleep=time.sleep,
+                 settle_s=SETTLE_S, read_enable_seq=read_enable_seq):
+        self.backend = backend
+        self.observe_s = observe_s
+        self.settle_s = settle_s
+        self.latency_threshold_us = latency_threshold_us
+        self.read_state = read_state
+        self.read_enable_seq = read_enable_seq
+        self.measure_latency = measure_latency
+        self.sleep = sleep
+
+    def current_scheduler(self):
+        """Name of the running scheduler, or None if idle. Raises RuntimeError when unknown."""
+        state = self.read_state()
+        if state is not None:
+            if state.error:
+                raise RuntimeError(state.error)
+            return scheduler_from_ops(state.name)
+        if self.backend is None:
+            raise RuntimeError("no way to read the scheduler state")
+        result = self.backend.get_status(DEFAULT_TIMEOUT)
+        if not result.ok:
+            raise RuntimeError(result.error_text())
+        return scheduler_from_ops(result.scheduler)
+
+    def wait_attached(self, scheduler, enable_seq=None, cancel_event=None):
+        """Returns None once scheduler has attached, otherwise the reason it did not."""
+        loaded = "nothing"
+        for _ in range(max(1, int(self.settle_s / POLL_INTERVAL))):
+            if cancel_event is not None and cancel_event.is_set():
+                return "health check cancelled"
+            state = self.read_state()
+            if state is not None and state.name in TRANSITIONAL_STATES:
+                loaded = state.name
+            else:
+                try:
+                    running = self.current_scheduler()
+                except RuntimeError as e:
+                    return f"could not read scheduler state: {e}"
+                loaded = running or "nothing"
+                if running == scheduler:
+                    current_seq = self.read_enable_seq() if enable_seq is not None else None
+                    if current_seq is None or current_seq != enable_seq:
+                        return None
+                    loaded = f"the previous {running} instance"
+            self.sleep(POLL_INTERVAL)
+        return f"{scheduler} did not attach within {self.settle_s:.0f} s ({loaded} is loaded)"
+
+    def check(self, scheduler, cancel_event=None, enable_seq=None):
+        """
+        Returns None when healthy, otherwise the reason it is not.
+        enable_seq is the counter read before applying; None skips that part of the attach check.
+        """
+        reason = self.wait_attached(scheduler, enable_seq, cancel_event)
+        if reason is not None:
+            return reason
+
+        polls = max(1, int(self.observe_s / POLL_INTERVAL))
+        for _ in range(polls):
+            if cancel_event is not None and cancel_event.is_set():
+                return "health check cancelled"
+            try:
+                running = self.current_scheduler()
+            except RuntimeError as e:
+                return f"could not read scheduler state: {e}"
+            if running is None:
+                return "sched_ext was disabled after the switch"
+            if running != scheduler:
+                return f"expected {scheduler} but {running} is loaded"
+            self.sleep(POLL_INTERVAL)
+
+        if self.latency_threshold_us is not None:
+            p99 = self.measure_latency()
+            if p99 > self.latency_threshold_us:
+                return f"wakeup latency p99 {p99:.0f} us exceeds {self.latency_threshold_us:.0f} us"
+        return None
+
+
+class SwitchTransaction:
+    """
+    Applies a scheduler and keeps it only if the HealthProbe passes; otherwise restores the
+    previous scheduler and args (or stops sched_ext if nothing was running before). When the state
+    before the switch could not be read there is nothing safe to restore, so it does not roll back.
+    last_applied remembers the args we used, since neither scxctl nor the loader reports them.
+    """
+
+    def __init__(self, backend, probe=None, log=None):
+        self.backend = backend
+        self.probe = probe or HealthProbe(backend)
+        self.log = log or (lambda message: None)
+        self.state = IDLE
+        self.last_applied = None
+        self.history = []
+
+    def _set_state(self, state):
+        self.state = state
+        self.history.append(state)
+        self.log(f"transaction {state}")
+
+    def previous(self):
+        """(scheduler, args) to restore, or None when sched_ext is idle. Raises RuntimeError when unknown."""
+        running = self.probe.current_scheduler()
+        if running is None:
+            return None
+        if self.last_applied and self.last_applied[0] == running:
+            return self.last_applied
+        return (running, [])
+
+    def rollback(self, previous, timeout):
+        """Returns (CommandResult, what was restored); the result is None when there was nothing to do."""
+        if previous is not None:
+            # The failed scheduler may have been ejected already, so start or switch as the state requires
+            return apply_scheduler(self.backend, previous[0], previous[1], timeout), f"restored {previous[0]}"
+        try:
+            running = self.probe.current_scheduler()
+        except RuntimeError:
+            running = "unknown"
+        if running is None:
+            # 'stop' exits non-zero when nothing is running; idle is where we want to be
+            return None, "sched_ext is stopped"
+        return self.backend.stop(timeout), "stopped sched_ext"
+
+    def run(self, scheduler, args, timeout=DEFAULT_TIMEOUT, cancel_event=None):
+        """
+        Returns a CommandResult: ok when the new scheduler was committed.
+        result.state is the final transaction state and result.action_verb the verb used.
+        """
+        self.history = []
+        try:
+            previous = self.previous()
+            unknown = None
+        except RuntimeError as e:
+            previous, unknown = None, str(e)
+        enable_seq = self.probe.read_enable_seq()
+
+        self._set_state(APPLYING)
+        result = apply_scheduler(self.backend, scheduler, args, timeout, cancel_event)
+        if not result.ok:
+            self._set_state(FAILED)
+            result.state = self.state
+            return result
+
+        self._set_state(PROBING)
+        reason = self.probe.check(scheduler, cancel_event, enable_seq)
+        if reason is None:
+            self.last_applied = (scheduler, list(args))
+            self._set_state(COMMITTED)
+            result.state = self.state
+            return result
+
+        outcome = CommandResult(result.command, returncode=1, duration=result.duration)
+        outcome.action_verb = result.action_verb
+        if unknown is not None:
+            self._set_state(FAILED)
+            outcome.error = (f"Health check failed ({reason}); not rolling back because the scheduler state "
+                             f"before the switch is unknown ({unknown}).")
+            outcome.state = self.state
+            return outcome
+
+        self._set_state(ROLLING_BACK)
+        revert, restored = self.rollback(previous, timeout)
+        if revert is None or revert.ok:
+            self.last_applied = previous
+            self._set_state(ROLLED_BACK)
+            outcome.error = f"Health check failed ({reason}); {restored}."
+        else:
+            self._set_state(FAILED)
+            outcome.error = f"Health check failed ({reason}) and rollback failed: {revert.error_text()}"
+        outcome.state = self.state
+        return outcome